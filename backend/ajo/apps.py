@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AjoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ajo'
+
+    def ready(self):
+        from . import signals
@@ -0,0 +1,110 @@
+"""
+Read-through cache for on-chain savings group state.
+
+Group state is stored under its object id and version; a short-lived
+pointer maps each object id to the latest version we have read. Versioned
+entries never change, so only the pointer has to be invalidated:
+
+- on the pointer TTL (SUI_STATE_CACHE_TTL_SECONDS), for writes made by others
+- when a transaction submitted by SavingsGroupSDK mutates the object
+- when the event indexer sees an event for the group
+
+Invalidation also records the minimum version the object is known to have
+reached, so a slow read that started before our write cannot put the old
+state back.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ajo.sui_tools import SavingsGroupInfo, SavingsGroupSDK, normalize_address
+
+
+class GroupStateCache:
+    """Caches SavingsGroupInfo by object id and version, and SUI balances by address."""
+
+    def __init__(self, cache=None, ttl=None, version_ttl=None):
+        self.cache = cache or caches[settings.SUI_STATE_CACHE_ALIAS]
+        self.ttl = settings.SUI_STATE_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.version_ttl = settings.SUI_STATE_CACHE_VERSION_TTL_SECONDS if version_ttl is None else version_ttl
+
+    @staticmethod
+    def _pointer_key(object_id):
+        return f'sui:object:{normalize_address(object_id)}'
+
+    @staticmethod
+    def _floor_key(object_id):
+        return f'sui:object:{normalize_address(object_id)}:floor'
+
+    @staticmethod
+    def _state_key(object_id, version):
+        return f'sui:object:{normalize_address(object_id)}:v{version}'
+
+    @staticmethod
+    def _balance_key(address):
+        return f'sui:balance:{normalize_address(address)}'
+
+    def get(self, object_id) -> Optional[SavingsGroupInfo]:
+        return self.get_many([object_id]).get(object_id)
+
+    def get_many(self, object_ids: Iterable[str]) -> Dict[str, SavingsGroupInfo]:
+        """Cached state for each object id with a live pointer (misses are omitted)."""
+        object_ids = list(object_ids)
+        pointers = self.cache.get_many([self._pointer_key(i) for i in object_ids])
+        state_keys = {
+            self._state_key(object_id, pointers[self._pointer_key(object_id)]): object_id
+            for object_id in object_ids
+            if self._pointer_key(object_id) in pointers
+        }
+        if not state_keys:
+            return {}
+        states = self.cache.get_many(list(state_keys))
+        return {state_keys[key]: info for key, info in states.items()}
+
+    def set_many(self, infos: List[SavingsGroupInfo]):
+        """Store freshly read state, skipping anything older than a recorded invalidation."""
+        floors = self.cache.get_many([self._floor_key(info.object_id) for info in infos])
+        fresh = [
+            info for info in infos
+            if info.version >= floors.get(self._floor_key(info.object_id), 0)
+        ]
+        if not fresh:
+            return
+        self.cache.set_many(
+            {self._state_key(info.object_id, info.version): info for info in fresh},
+            self.version_ttl
+        )
+        self.cache.set_many(
+            {self._pointer_key(info.object_id): info.version for info in fresh},
+            self.ttl
+        )
+
+    def invalidate(self, versions: Dict[str, int]):
+        """
+        Forget the latest state of objects that changed.
+
+        Args:
+            versions: object id -> version the object is known to have reached (0 if unknown)
+        """
+        self.cache.delete_many([self._pointer_key(object_id) for object_id in versions])
+        floors = {self._floor_key(object_id): version for object_id, version in versions.items() if version}
+        if floors:
+            self.cache.set_many(floors, self.version_ttl)
+
+    def get_balance(self, address) -> Optional[int]:
+        return self.cache.get(self._balance_key(address))
+
+    def set_balance(self, address, balance):
+        self.cache.set(self._balance_key(address), balance, self.ttl)
+
+    def invalidate_balances(self, addresses: Iterable[str]):
+        self.cache.delete_many([self._balance_key(address) for address in addresses])
+
+
+def get_sdk(**kwargs) -> SavingsGroupSDK:
+    """SavingsGroupSDK for the configured package, reading through the shared state cache."""
+    kwargs.setdefault('package_id', settings.SUI_PACKAGE_ID)
+    kwargs.setdefault('state_cache', GroupStateCache())
+    return SavingsGroupSDK(**kwargs)
@@ -0,0 +1,451 @@
+"""
+Chain submission pipeline
+
+Transactions are submitted by ajo.tasks.submit_chain_transaction, which is
+routed to its own Celery queue (SUI_CHAIN_QUEUE) so chain writes never hold
+up email and other tasks, and throughput grows with the number of chain
+workers.
+
+- Each worker process keeps one event loop running in a background thread.
+  Tasks hand their coroutine to it instead of calling asyncio.run, so the
+  pooled async client, gas coin leases and dry-run estimates survive from
+  one task to the next.
+- A signer's transactions run one at a time across every worker, guarded by
+  a lock in the shared cache. A task that cannot get the lock is retried
+  instead of blocking its worker.
+- The task rate limit (SUI_CHAIN_RATE_LIMIT) is enforced by Celery per
+  worker node (one `celery worker` instance, whatever its concurrency), not
+  across the cluster: the chain-wide rate is the limit times the number of
+  chain workers.
+- Every submission carries an idempotency key, stored on its
+  ChainTransaction row. The first task to claim a key owns it until the
+  outcome is recorded; duplicates and later enqueues of the same key get
+  the recorded outcome back instead of submitting again.
+- A transaction is signed first and its bytes and digest are saved on the
+  row before it is sent. Once a row has a signed transaction the operation
+  is never built again: a retry or redelivery looks the digest up on chain
+  and sends the same signed bytes again only if it is not there. Operations
+  that send several transactions cannot be settled from one digest and are
+  marked unknown instead.
+"""
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import enum
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError
+from django.utils import timezone
+
+from ajo.models import ChainTransaction
+from ajo.sui_tools import (
+    SavingsGroupError, SavingsGroupSDK, SignedTransaction, TransactionError, before_execute, normalize_address
+)
+from ajo.transactions import apply_response
+
+logger = logging.getLogger(__name__)
+
+
+# SavingsGroupSDK methods that may be submitted, by the name of their signer argument
+OPERATIONS = {
+    'create_savings_group': 'signer_alias',
+    'contribute': 'signer_alias',
+    'contribute_many': 'signer_alias',
+    'propose_payout': 'signer_alias',
+    'sign_payout': 'signer_alias',
+    'execute_payout': 'signer_alias',
+    'process_payout': 'admin_alias',
+    'start_new_cycle': 'signer_alias',
+}
+
+
+# Operations that send exactly one transaction, so a recorded digest settles them
+SINGLE_TRANSACTION = set(OPERATIONS) - {'contribute_many', 'process_payout'}
+
+
+class SignerBusy(Exception):
+    """Another worker is submitting for the same signer"""
+
+
+class WorkerLoop:
+    """An event loop that lives as long as the worker process, in a daemon thread"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_forever, name='sui-chain-loop', daemon=True
+            )
+            self._thread.start()
+            logger.info("Started chain submission event loop")
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop without waiting"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the loop and wait for its result"""
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 5):
+        """Close the loop's pooled client and stop the thread"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+
+        from ajo.sui_pool import get_client_pool
+        try:
+            asyncio.run_coroutine_threadsafe(get_client_pool().aclose(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Failed to close chain loop client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+
+
+_worker_loop = WorkerLoop()
+_sdk: Optional[SavingsGroupSDK] = None
+_sdk_lock = threading.Lock()
+
+
+def get_worker_loop() -> WorkerLoop:
+    return _worker_loop
+
+
+def get_chain_sdk() -> SavingsGroupSDK:
+    """The worker's SDK, holding the signer keystore (SUI_KEYSTORE_PATH)"""
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                from ajo.chain_cache import get_sdk
+                _sdk = get_sdk(
+                    use_async=True,
+                    keystore_path=settings.SUI_KEYSTORE_PATH or None,
+                )
+    return _sdk
+
+
+def shutdown():
+    """Stop the worker loop and drop the SDK. Called from worker shutdown hooks."""
+    global _sdk
+    _worker_loop.stop()
+    _sdk = None
+
+
+def _cache():
+    return caches[settings.SUI_STATE_CACHE_ALIAS]
+
+
+class SignerLock:
+    """Serializes a signer's transactions across worker processes"""
+
+    def __init__(self, signer_alias: str, wait: float = 0, ttl: Optional[float] = None, cache=None):
+        self.key = f'sui:signer-lock:{signer_alias}'
+        self.wait = wait
+        self.ttl = settings.SUI_CHAIN_SIGNER_LOCK_SECONDS if ttl is None else ttl
+        self.cache = cache or _cache()
+        self.token = uuid.uuid4().hex
+
+    async def __aenter__(self):
+        deadline = time.monotonic() + self.wait
+        while not self.cache.add(self.key, self.token, self.ttl):
+            if time.monotonic() >= deadline:
+                raise SignerBusy(self.key)
+            await asyncio.sleep(0.05)
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+
+
+class SigningGate:
+    """
+    Passes each signed transaction of an operation to the submitting thread
+    and holds it until the thread has recorded it.
+
+    The operation runs on the worker loop, where the ORM cannot be used; the
+    task thread saves the signed bytes and digest, then lets it be sent.
+    """
+
+    def __init__(self):
+        self._signed = queue.Queue()
+        self.signed = 0
+
+    async def __call__(self, signed: SignedTransaction):
+        recorded = concurrent.futures.Future()
+        self._signed.put((signed, recorded))
+        await asyncio.wrap_future(recorded)
+
+    def run(self, coro, record):
+        """Run coro on the worker loop, calling record(signed) here before each send"""
+        future = get_worker_loop().submit(coro)
+        future.add_done_callback(lambda _: self._signed.put(None))
+        while True:
+            item = self._signed.get()
+            if item is None:
+                return future.result()
+            signed, recorded = item
+            try:
+                record(signed)
+            except BaseException as e:
+                recorded.set_exception(e)
+            else:
+                self.signed += 1
+                recorded.set_result(None)
+
+
+class IdempotencyStore:
+    """Submission state by idempotency key, kept on ChainTransaction rows"""
+
+    def get(self, idempotency_key: str) -> Optional[ChainTransaction]:
+        return ChainTransaction.objects.filter(idempotency_key=idempotency_key).first()
+
+    def claim(
+        self,
+        idempotency_key: str,
+        task_id: str,
+        operation: str,
+        signer_alias: str,
+        group_address: str = ''
+    ) -> Tuple[ChainTransaction, bool]:
+        """
+        Claim a key for a task.
+
+        Returns:
+            (row, owned) where owned is True if the key was newly claimed or
+            was claimed by an earlier attempt of the same task. An owned row
+            with a signed transaction (row.signed_tx) may already be on
+            chain; it must be settled by its digest (see settle), never
+            submitted again.
+        """
+        defaults = {
+            'task_id': task_id,
+            'operation': operation,
+            'signer_alias': signer_alias,
+            'group_address': normalize_address(group_address) if group_address else '',
+            'status': ChainTransaction.Status.SUBMITTING,
+        }
+        try:
+            tx, created = ChainTransaction.objects.get_or_create(
+                idempotency_key=idempotency_key, defaults=defaults
+            )
+        except IntegrityError:
+            tx, created = self.get(idempotency_key), False
+        owned = created or (tx.status == ChainTransaction.Status.SUBMITTING and tx.task_id == task_id)
+        return tx, owned
+
+    def record_signed(self, tx: ChainTransaction, signed: SignedTransaction):
+        """Save a signed transaction before it is sent"""
+        tx.digest = signed.digest
+        tx.signed_tx = signed.as_dict()
+        tx.save(update_fields=['digest', 'signed_tx', 'updated_at'])
+
+    def record(self, tx: ChainTransaction, status: str, error: str = ''):
+        tx.status = status
+        tx.error = error
+        tx.save(update_fields=['status', 'error', 'updated_at'])
+
+    def record_result(self, tx: ChainTransaction, sdk: SavingsGroupSDK, result):
+        """Store the outcome of a successful SDK call"""
+        tx.result = summarize_result(tx.operation, result)
+        try:
+            tx.sender = normalize_address(sdk.get_address(tx.signer_alias))
+        except SavingsGroupError:
+            pass
+        if tx.operation == 'create_savings_group' and tx.result.get('group_id'):
+            tx.group_address = normalize_address(tx.result['group_id'])
+
+        response = getattr(result, 'result_data', None)
+        if getattr(response, 'effects', None):
+            tx.digest = response.digest
+            apply_response(tx, response)
+        else:
+            # Several transactions (contribute_many, process_payout)
+            tx.digest = tx.result.get('digest')
+            tx.status = ChainTransaction.Status.SUCCESS
+            tx.confirmed_at = timezone.now()
+            tx.latency_ms = int((tx.confirmed_at - tx.submitted_at).total_seconds() * 1000)
+        tx.save()
+
+
+def _jsonable(value):
+    if dataclasses.is_dataclass(value):
+        return _jsonable(dataclasses.asdict(value))
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def summarize_result(operation: str, result) -> Dict[str, Any]:
+    """JSON-safe summary of an SDK call, stored as the task result"""
+    if operation == 'contribute_many':
+        return {'contributions': _jsonable(result)}
+    if operation == 'process_payout':
+        return _jsonable(result)
+    summary = {'digest': getattr(getattr(result, 'result_data', None), 'digest', None)}
+    if operation == 'create_savings_group':
+        summary['group_id'] = SavingsGroupSDK.created_group_id(result)
+    return summary
+
+
+async def run_operation(
+    sdk: SavingsGroupSDK,
+    operation: str,
+    signer_alias: str,
+    kwargs: Dict[str, Any],
+    on_signed=None
+):
+    """Call an SDK write method while holding the signer lock"""
+    async with SignerLock(signer_alias, wait=settings.SUI_CHAIN_SIGNER_WAIT_SECONDS):
+        # Runs as its own task on the worker loop, so the hook is not shared
+        before_execute.set(on_signed)
+        return await getattr(sdk, operation)(**{OPERATIONS[operation]: signer_alias, **kwargs})
+
+
+def settle(task, tx: ChainTransaction, sdk: SavingsGroupSDK, store: IdempotencyStore) -> Dict[str, Any]:
+    """Record the outcome of a row whose transaction was signed by an earlier attempt"""
+    if tx.operation not in SINGLE_TRANSACTION:
+        store.record(tx, ChainTransaction.Status.UNKNOWN, 'Interrupted after signing')
+        logger.error(f"Chain submission {tx.idempotency_key} ({tx.operation}) was interrupted after signing")
+        return tx.as_result()
+
+    try:
+        result = get_worker_loop().run(sdk.settle_signed(SignedTransaction.from_dict(tx.signed_tx)))
+    except TransactionError as e:
+        if task.request.retries >= task.max_retries:
+            store.record(tx, ChainTransaction.Status.UNKNOWN, str(e))
+            logger.error(f"Chain submission {tx.idempotency_key} ({tx.digest}) could not be settled: {e}")
+            return tx.as_result()
+        raise task.retry(exc=e, countdown=2 ** task.request.retries)
+    except SavingsGroupError as e:
+        store.record(tx, ChainTransaction.Status.FAILURE, str(e))
+        return tx.as_result()
+    except Exception as e:
+        store.record(tx, ChainTransaction.Status.UNKNOWN, str(e))
+        raise
+
+    store.record_result(tx, sdk, result)
+    return tx.as_result()
+
+
+def submit(
+    task,
+    operation: str,
+    signer_alias: str,
+    kwargs: Dict[str, Any],
+    idempotency_key: str,
+    sdk: Optional[SavingsGroupSDK] = None,
+    store: Optional[IdempotencyStore] = None
+) -> Dict[str, Any]:
+    """
+    Body of submit_chain_transaction: run one operation at most once per key.
+
+    A busy signer and transport failures retry the task under the same key;
+    once the transaction is signed, retries settle it by digest. Contract
+    aborts are final. Anything else may have reached the chain, so the key is
+    marked unknown and never resubmitted automatically.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unsupported chain operation: {operation}")
+
+    store = store or IdempotencyStore()
+    tx, owned = store.claim(
+        idempotency_key, task.request.id, operation, signer_alias, kwargs.get('group_id', '')
+    )
+    if not owned:
+        logger.info(f"Chain submission {idempotency_key} already {tx.status}, not resubmitting")
+        return tx.as_result()
+
+    sdk = sdk or get_chain_sdk()
+    if tx.signed_tx:
+        # A retry or redelivery after signing; the transaction may have landed
+        return settle(task, tx, sdk, store)
+
+    gate = SigningGate()
+    try:
+        result = gate.run(
+            run_operation(sdk, operation, signer_alias, kwargs, gate),
+            lambda signed: store.record_signed(tx, signed),
+        )
+    except SignerBusy as e:
+        raise task.retry(exc=e, countdown=settings.SUI_CHAIN_SIGNER_RETRY_SECONDS, max_retries=None)
+    except TransactionError as e:
+        if gate.signed:
+            # The node may have executed it before the error (e.g. a read
+            # timeout); a retry settles it by digest
+            if operation in SINGLE_TRANSACTION and task.request.retries < task.max_retries:
+                raise task.retry(exc=e, countdown=2 ** task.request.retries)
+            store.record(tx, ChainTransaction.Status.UNKNOWN, str(e))
+            logger.error(f"Chain submission {idempotency_key} ({operation}) failed after sending: {e}")
+            return tx.as_result()
+        if task.request.retries >= task.max_retries:
+            store.record(tx, ChainTransaction.Status.FAILURE, str(e))
+        raise task.retry(exc=e, countdown=2 ** task.request.retries)
+    except (SavingsGroupError, ValueError) as e:
+        store.record(tx, ChainTransaction.Status.FAILURE, str(e))
+        logger.warning(f"Chain submission {idempotency_key} ({operation}) rejected: {e}")
+        return tx.as_result()
+    except Exception as e:
+        store.record(tx, ChainTransaction.Status.UNKNOWN, str(e))
+        logger.error(f"Chain submission {idempotency_key} ({operation}) interrupted: {e}")
+        raise
+
+    store.record_result(tx, sdk, result)
+    return tx.as_result()
+
+
+def enqueue_chain_transaction(
+    operation: str,
+    signer_alias: str,
+    idempotency_key: Optional[str] = None,
+    **kwargs
+):
+    """
+    Queue a SavingsGroupSDK write for the chain workers.
+
+    Args:
+        operation: SDK method name (see OPERATIONS)
+        signer_alias: Keystore alias that signs the transaction
+        idempotency_key: Key that identifies this submission across retries
+            and re-enqueues (a random key if None)
+        **kwargs: Arguments for the SDK method (JSON-serializable)
+
+    Returns:
+        Celery AsyncResult of the submission task
+    """
+    from ajo.tasks import submit_chain_transaction
+
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unsupported chain operation: {operation}")
+    return submit_chain_transaction.delay(
+        operation, signer_alias, kwargs, idempotency_key or uuid.uuid4().hex
+    )
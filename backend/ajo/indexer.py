@@ -0,0 +1,131 @@
+"""
+Checkpointed indexer for events emitted by the codeforge Move module.
+
+Events are paged oldest-first from the fullnode, starting after the cursor
+stored in ChainEventCursor. A page and the rosters of groups it mentions
+are fetched before any database transaction is opened, so no row lock is
+held across network calls. The page is then written with a single bulk
+insert and the cursor is advanced in one short transaction, which first
+re-checks that the cursor has not moved; a crash never skips events.
+Replaying a page is harmless: (tx_digest, event_seq) is unique and
+duplicates are ignored. Each page is also folded into the contribution
+ledger (see ajo/ledger.py) inside the same transaction, and cached state
+of every group it touches is dropped once it commits.
+"""
+
+from decimal import Decimal
+from logging import getLogger
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import transaction
+
+from ajo.chain_cache import GroupStateCache, get_sdk
+from ajo.ledger import apply_events, load_rosters
+from ajo.models import ChainEvent, ChainEventCursor
+from ajo.sui_tools import normalize_address
+
+logger = getLogger(__name__)
+
+
+# Field holding the address that acted in each event type
+ACTOR_FIELDS = {
+    'ContributionMade': 'contributor',
+    'PayoutProposed': 'recipient',
+    'PayoutSigned': 'signer',
+    'PayoutExecuted': 'recipient',
+}
+
+EVENT_TYPES = {name for name, _ in ChainEvent.EVENT_TYPES}
+
+
+def event_to_model(event):
+    """Convert a pysui Event into an unsaved ChainEvent, or None if it is not tracked."""
+    event_type = event.event_type.split('::')[-1]
+    if event_type not in EVENT_TYPES:
+        return None
+
+    data = event.parsed_json
+    actor_field = ACTOR_FIELDS.get(event_type)
+    cycle = data.get('cycle')
+    amount = data.get('amount')
+
+    return ChainEvent(
+        tx_digest=event.event_id['txDigest'],
+        event_seq=int(event.event_id['eventSeq']),
+        event_type=event_type,
+        group_address=normalize_address(data['group_id']),
+        sender=normalize_address(event.sender),
+        actor=normalize_address(data[actor_field]) if actor_field else '',
+        cycle=int(cycle) if cycle is not None else None,
+        amount=Decimal(amount) if amount is not None else None,
+        payload=data,
+        timestamp_ms=int(event.timestamp_ms) if event.timestamp_ms else None,
+    )
+
+
+class EventIndexer:
+    """Copies codeforge events into ChainEvent rows."""
+
+    def __init__(self, sdk=None, cursor_name='codeforge', page_size=None, state_cache=None):
+        self.state_cache = state_cache or GroupStateCache()
+        self.sdk = sdk or get_sdk(state_cache=self.state_cache)
+        self.cursor_name = cursor_name
+        self.page_size = page_size or settings.SUI_INDEXER_PAGE_SIZE
+
+    def index_page(self):
+        """
+        Index a single page of events.
+
+        Returns:
+            (number of events written or skipped as duplicates, whether more pages are available)
+        """
+        ChainEventCursor.objects.get_or_create(name=self.cursor_name)
+        start = ChainEventCursor.objects.get(name=self.cursor_name).as_event_id()
+
+        events, next_cursor, has_next = async_to_sync(self.sdk.query_events)(
+            cursor=start,
+            limit=self.page_size
+        )
+        rows = [row for row in map(event_to_model, events) if row is not None]
+        rosters = load_rosters(rows, self.sdk)
+
+        with transaction.atomic():
+            # Row lock serialises concurrent indexer runs on the same cursor
+            cursor = ChainEventCursor.objects.select_for_update().get(name=self.cursor_name)
+            if cursor.as_event_id() != start:
+                # Another run indexed this page meanwhile; go on from its cursor
+                logger.debug(f'Cursor {self.cursor_name} moved while fetching, page discarded')
+                return 0, True
+
+            ChainEvent.objects.bulk_create(rows, ignore_conflicts=True)
+            apply_events(rows, rosters)
+
+            touched = {row.group_address: 0 for row in rows}
+            if touched:
+                transaction.on_commit(lambda: self.state_cache.invalidate(touched))
+
+            if next_cursor:
+                cursor.tx_digest = next_cursor['txDigest']
+                cursor.event_seq = next_cursor['eventSeq']
+                cursor.save(update_fields=['tx_digest', 'event_seq', 'updated_at'])
+
+        logger.debug(f'Indexed {len(rows)} events (cursor={cursor.tx_digest}:{cursor.event_seq})')
+        return len(rows), has_next
+
+    def run(self, max_pages=None):
+        """
+        Index pages until the stream is exhausted or max_pages is reached.
+
+        Returns:
+            Number of events processed
+        """
+        total = 0
+        pages = 0
+        has_next = True
+        while has_next and (max_pages is None or pages < max_pages):
+            count, has_next = self.index_page()
+            total += count
+            pages += 1
+        logger.info(f'Event indexer processed {total} events in {pages} pages')
+        return total
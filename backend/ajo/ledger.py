@@ -0,0 +1,202 @@
+"""
+Contribution ledger maintained from indexed codeforge events.
+
+apply_events() folds a page of ChainEvent rows into Contribution rows and
+per-cycle CycleSummary aggregates, using rosters fetched beforehand with
+load_rosters(). Only the (group, cycle) pairs touched by
+the page are recomputed, and they are recomputed from the Contribution
+table rather than incremented, so replaying a page never double counts.
+start_new_cycle emits no event, so the summary of the cycle after a
+CycleCompleted is opened (with every participant pending) when that event
+is indexed, unless every participant has already been paid out.
+"""
+
+from decimal import Decimal
+from logging import getLogger
+
+from asgiref.sync import async_to_sync
+from django.utils import timezone
+
+from ajo.models import Contribution, CycleSummary
+from ajo.sui_tools import payout_position
+
+logger = getLogger(__name__)
+
+
+LEDGER_EVENTS = {'ContributionMade', 'PayoutProposed', 'PayoutExecuted', 'CycleCompleted'}
+
+SUMMARY_FIELDS = [
+    'start_cycle', 'contribution_amount', 'participants', 'contributors',
+    'pending_contributors', 'contributions_count', 'total_contributed',
+    'expected_total', 'next_recipient', 'next_recipient_position',
+    'payout_executed', 'payout_recipient', 'payout_amount',
+]
+
+
+def _load_rosters(group_addresses, sdk):
+    """
+    Participants, start cycle and contribution amount per group.
+
+    These never change after a group is created, so they are copied from any
+    existing summary and only fetched from the chain (in one batched call)
+    for groups seen for the first time.
+    """
+    rosters = {}
+    existing = (
+        CycleSummary.objects
+        .filter(group_address__in=group_addresses)
+        .order_by('-cycle')
+        .values_list('group_address', 'participants', 'start_cycle', 'contribution_amount')
+    )
+    for group_address, participants, start_cycle, contribution_amount in existing:
+        rosters.setdefault(group_address, (participants, start_cycle, contribution_amount))
+
+    missing = [address for address in group_addresses if address not in rosters]
+    if missing:
+        infos = async_to_sync(sdk.get_groups_info)(missing, ignore_missing=True)
+        for address, info in zip(missing, infos):
+            if info is None:
+                logger.warning(f'Group {address} not found on chain, ledger roster left empty')
+                rosters[address] = ([], 0, Decimal(0))
+                continue
+            participants = [p.address for p in sorted(info.participants, key=lambda p: p.position)]
+            rosters[address] = (participants, info.start_cycle, Decimal(info.contribution_amount))
+
+    return rosters
+
+
+def _ledger_events(events):
+    return [e for e in events if e.event_type in LEDGER_EVENTS and e.cycle is not None]
+
+
+def load_rosters(events, sdk):
+    """
+    Rosters of the groups a page of events touches, by group address.
+
+    Unseen groups are fetched from the fullnode, so callers load rosters
+    before opening the transaction that applies the page.
+    """
+    group_addresses = sorted({e.group_address for e in _ledger_events(events)})
+    if not group_addresses:
+        return {}
+    return _load_rosters(group_addresses, sdk)
+
+
+def _next_cycles(events, rosters):
+    """(group, cycle) pairs opened by the page's CycleCompleted events"""
+    completed = [e for e in events if e.event_type == 'CycleCompleted']
+    if not completed:
+        return set()
+
+    group_addresses = {e.group_address for e in completed}
+    paid = set(
+        CycleSummary.objects
+        .filter(group_address__in=group_addresses, payout_executed=True)
+        .values_list('group_address', 'cycle')
+    )
+    paid |= {(e.group_address, e.cycle) for e in events if e.event_type == 'PayoutExecuted'}
+    payouts = {}
+    for group_address, _ in paid:
+        payouts[group_address] = payouts.get(group_address, 0) + 1
+
+    return {
+        (e.group_address, e.cycle + 1) for e in completed
+        if payouts.get(e.group_address, 0) < len(rosters[e.group_address][0])
+    }
+
+
+def apply_events(events, rosters):
+    """
+    Update the ledger with a page of ChainEvent rows.
+
+    Args:
+        events: ChainEvent instances (saved or not) in chain order
+        rosters: load_rosters() of the same events
+    """
+    events = _ledger_events(events)
+    if not events:
+        return
+
+    Contribution.objects.bulk_create(
+        [
+            Contribution(
+                group_address=e.group_address,
+                cycle=e.cycle,
+                contributor=e.actor,
+                amount=e.amount,
+                tx_digest=e.tx_digest,
+                timestamp_ms=e.timestamp_ms,
+            )
+            for e in events if e.event_type == 'ContributionMade'
+        ],
+        ignore_conflicts=True
+    )
+
+    keys = {(e.group_address, e.cycle) for e in events} | _next_cycles(events, rosters)
+    group_addresses = sorted({group for group, _ in keys})
+    cycles = {cycle for _, cycle in keys}
+
+    summaries = {
+        (s.group_address, s.cycle): s
+        for s in CycleSummary.objects.filter(group_address__in=group_addresses, cycle__in=cycles)
+    }
+
+    contributions = {}
+    for group_address, cycle, contributor, amount in (
+        Contribution.objects
+        .filter(group_address__in=group_addresses, cycle__in=cycles)
+        .order_by('id')
+        .values_list('group_address', 'cycle', 'contributor', 'amount')
+    ):
+        if (group_address, cycle) in keys:
+            contributions.setdefault((group_address, cycle), []).append((contributor, amount))
+
+    payouts = {
+        (e.group_address, e.cycle): e
+        for e in events if e.event_type == 'PayoutExecuted'
+    }
+
+    rows = []
+    for key in keys:
+        group_address, cycle = key
+        participants, start_cycle, contribution_amount = rosters[group_address]
+        summary = summaries.get(key) or CycleSummary(group_address=group_address, cycle=cycle)
+
+        paid = contributions.get(key, [])
+        contributors = [contributor for contributor, _ in paid]
+        contributed = set(contributors)
+        position = payout_position(cycle, start_cycle, len(participants))
+
+        summary.start_cycle = start_cycle
+        summary.contribution_amount = contribution_amount
+        summary.participants = participants
+        summary.contributors = contributors
+        summary.pending_contributors = [p for p in participants if p not in contributed]
+        summary.contributions_count = len(paid)
+        summary.total_contributed = sum((amount for _, amount in paid), Decimal(0))
+        summary.expected_total = contribution_amount * len(participants)
+        summary.next_recipient_position = position
+        summary.next_recipient = participants[position - 1] if position and position <= len(participants) else ''
+
+        payout = payouts.get(key)
+        if payout is not None:
+            summary.payout_executed = True
+            summary.payout_recipient = payout.actor
+            summary.payout_amount = payout.amount
+
+        rows.append(summary)
+
+    now = timezone.now()
+    for summary in rows:
+        summary.updated_at = now
+
+    CycleSummary.objects.bulk_update(
+        [s for s in rows if s.pk is not None],
+        SUMMARY_FIELDS + ['updated_at']
+    )
+    CycleSummary.objects.bulk_create(
+        [s for s in rows if s.pk is None],
+        update_conflicts=True,
+        unique_fields=['group_address', 'cycle'],
+        update_fields=SUMMARY_FIELDS + ['updated_at'],
+    )
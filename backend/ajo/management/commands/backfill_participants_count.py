@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from ajo.models import SavingsGroup
+
+
+class Command(BaseCommand):
+    help = 'Recompute SavingsGroup.participants_count from the participants relation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Groups updated per UPDATE statement')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(SavingsGroup.objects.order_by('pk').values_list('pk', flat=True))
+
+        updated = 0
+        for i in range(0, len(ids), batch_size):
+            updated += SavingsGroup.objects.filter(pk__in=ids[i:i + batch_size]).refresh_participants_count()
+
+        self.stdout.write(f'Recounted participants for {updated} groups')
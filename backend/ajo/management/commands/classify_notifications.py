@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+
+from ajo.models import MyNotification
+
+
+# Legacy message text by type, for rows written before notification_type existed
+PATTERNS = [
+    (MyNotification.Type.GROUP_CREATED, 'You have successfully created the savings group '),
+    (MyNotification.Type.GROUP_INVITATION, 'You have been invited to join the savings group '),
+    (MyNotification.Type.GROUP_JOINED, 'You have successfully joined the savings group '),
+    (MyNotification.Type.MEMBER_JOINED, ' has joined the savings group '),
+]
+
+
+class Command(BaseCommand):
+    help = 'Set notification_type on notifications that were stored without one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Id range covered by each UPDATE')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        max_id = MyNotification.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        unclassified = MyNotification.objects.filter(notification_type=MyNotification.Type.OTHER)
+        known_templates = [key for key in MyNotification.Type.values if key != MyNotification.Type.OTHER]
+
+        updated = 0
+        for start in range(0, max_id, batch_size):
+            batch = unclassified.filter(id__gt=start, id__lte=start + batch_size)
+            for template in known_templates:
+                updated += batch.filter(template=template).update(notification_type=template)
+            for notification_type, text in PATTERNS:
+                updated += batch.filter(template='', message__contains=text).update(
+                    notification_type=notification_type
+                )
+
+        self.stdout.write(f'Classified {updated} notifications')
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ajo.indexer import EventIndexer
+from ajo.models import ChainEventCursor
+
+
+class Command(BaseCommand):
+    help = 'Index codeforge events from the Sui fullnode into the ajo ChainEvent table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-pages', type=int, default=None, help='Stop after this many pages per run')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--interval', type=float, default=settings.SUI_INDEXER_INTERVAL_SECONDS, help='Seconds between polls with --loop')
+        parser.add_argument('--reset', action='store_true', help='Forget the stored cursor and replay from the first event')
+
+    def handle(self, *args, **options):
+        if not settings.SUI_PACKAGE_ID:
+            raise CommandError('SUI_PACKAGE_ID is not set')
+
+        indexer = EventIndexer()
+
+        if options['reset']:
+            ChainEventCursor.objects.filter(name=indexer.cursor_name).delete()
+            self.stdout.write('Cursor reset')
+
+        while True:
+            count = indexer.run(max_pages=options['max_pages'])
+            self.stdout.write(f'Indexed {count} events')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from ajo.notifications import metrics
+
+
+class Command(BaseCommand):
+    help = 'Show notification fan-out delivery counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        snapshot = metrics.snapshot()
+        for name, value in snapshot.items():
+            self.stdout.write(f'{name}: {value}')
+        if snapshot['batches']:
+            self.stdout.write(f"avg_batch_ms: {snapshot['duration_ms'] / snapshot['batches']:.1f}")
+        if options['reset']:
+            metrics.reset()
@@ -1,4 +1,7 @@
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.contrib.postgres.fields import ArrayField
 from main.models import User
 
 # Create your models here.
@@ -11,6 +14,20 @@ class AjoUser(models.Model):
     wallet_address = models.TextField()
     
 
+
+class SavingsGroupQuerySet(models.QuerySet):
+
+    def refresh_participants_count(self):
+        """Recount participants for every group in the queryset with a single UPDATE"""
+        counts = SavingsGroup.participants.through.objects.filter(
+            savingsgroup_id=models.OuterRef('pk')
+        ).order_by().values('savingsgroup_id').annotate(
+            count=models.Count('pk')
+        ).values('count')
+        return self.update(
+            participants_count=Coalesce(models.Subquery(counts), 0)
+        )
+
     
 class SavingsGroup(models.Model):
     name = models.CharField(max_length=250)
@@ -19,15 +36,195 @@ class SavingsGroup(models.Model):
     start_cycle = models.PositiveIntegerField()
     contribution_amount = models.DecimalField(max_digits=9, decimal_places=4)
     participants = models.ManyToManyField(User, related_name='savings_groups')
+    # Maintained by the m2m_changed hooks in ajo/signals.py
+    participants_count = models.PositiveIntegerField(default=0)
     active = models.BooleanField(default = False)
     address_link = models.TextField(default = '0x000000')
     digest = models.TextField()
+
+    objects = SavingsGroupQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        # participants_count is only written by refresh_participants_count();
+        # saving a stale instance must not overwrite a concurrent recount
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'participants_count'
+            ]
+        super().save(*args, **kwargs)
     
 
 
 class MyNotification(models.Model):
-    message = models.TextField()
+    class Type(models.TextChoices):
+        GROUP_CREATED = 'group_created'
+        GROUP_INVITATION = 'group_invitation'
+        GROUP_JOINED = 'group_joined'
+        MEMBER_JOINED = 'member_joined'
+        OTHER = 'other'
+
+    # Rendered text, only stored for notifications without a template
+    message = models.TextField(blank=True, default='')
+    # Key in ajo.notification_templates and the values it is rendered with
+    template = models.CharField(max_length=50, blank=True, default='')
+    params = models.JSONField(default=dict, blank=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
-    notification_type = models.CharField(max_length=150, choices=[('group_invitation','group_invitation'),('group_joined','group_joined')]),
+    notification_type = models.CharField(max_length=32, choices=Type.choices, default=Type.OTHER)
     is_read = models.BooleanField(default=False)
-    contrib_address = models.TextField(blank = True, null = True)
\ No newline at end of file
+    contrib_address = models.TextField(blank = True, null = True)
+
+    class Meta:
+        indexes = [
+            # Inbox pages, unread filters and unread counts
+            models.Index(fields=['user', 'is_read', 'id'], name='notification_inbox_idx'),
+            # Inbox pages filtered by type
+            models.Index(fields=['user', 'notification_type', 'id'], name='notification_type_idx'),
+        ]
+
+    def render(self):
+        """The notification's text, rendered from its template when it has one"""
+        if not self.template:
+            return self.message
+        from ajo.notification_templates import render
+        return render(self.template, self.params)
+
+
+class ChainEventCursor(models.Model):
+    """Durable position of an event indexer in the chain's event stream."""
+    name = models.CharField(max_length=100, unique=True)
+    tx_digest = models.CharField(max_length=64, blank=True, default='')
+    event_seq = models.CharField(max_length=20, blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def as_event_id(self):
+        if not self.tx_digest:
+            return None
+        return {'txDigest': self.tx_digest, 'eventSeq': self.event_seq}
+
+
+class ChainEvent(models.Model):
+    """An event emitted by the codeforge Move module."""
+    EVENT_TYPES = [
+        ('GroupCreated', 'GroupCreated'),
+        ('ContributionMade', 'ContributionMade'),
+        ('PayoutProposed', 'PayoutProposed'),
+        ('PayoutSigned', 'PayoutSigned'),
+        ('PayoutExecuted', 'PayoutExecuted'),
+        ('CycleCompleted', 'CycleCompleted'),
+    ]
+
+    tx_digest = models.CharField(max_length=64)
+    event_seq = models.PositiveIntegerField()
+    event_type = models.CharField(max_length=50, choices=EVENT_TYPES)
+    group_address = models.CharField(max_length=66)
+    sender = models.CharField(max_length=66)
+    # contributor, recipient or signer, depending on the event type
+    actor = models.CharField(max_length=66, blank=True, default='')
+    cycle = models.PositiveBigIntegerField(null=True, blank=True)
+    amount = models.DecimalField(max_digits=20, decimal_places=0, null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    timestamp_ms = models.BigIntegerField(null=True, blank=True)
+    indexed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tx_digest', 'event_seq'], name='unique_chain_event'),
+        ]
+        indexes = [
+            models.Index(fields=['group_address', 'event_type', 'cycle']),
+        ]
+
+
+class Contribution(models.Model):
+    """A contribution recorded on chain, one per participant per cycle."""
+    group_address = models.CharField(max_length=66)
+    cycle = models.PositiveBigIntegerField()
+    contributor = models.CharField(max_length=66)
+    amount = models.DecimalField(max_digits=20, decimal_places=0)
+    tx_digest = models.CharField(max_length=64)
+    timestamp_ms = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group_address', 'cycle', 'contributor'], name='unique_contribution'),
+        ]
+
+
+class CycleSummary(models.Model):
+    """Precomputed state of one group cycle, maintained from indexed chain events."""
+    group_address = models.CharField(max_length=66)
+    cycle = models.PositiveBigIntegerField()
+    start_cycle = models.PositiveBigIntegerField(default=0)
+    contribution_amount = models.DecimalField(max_digits=20, decimal_places=0, default=0)
+    # Participant addresses ordered by payout position
+    participants = ArrayField(models.CharField(max_length=66), default=list, blank=True)
+    contributors = ArrayField(models.CharField(max_length=66), default=list, blank=True)
+    pending_contributors = ArrayField(models.CharField(max_length=66), default=list, blank=True)
+    contributions_count = models.PositiveIntegerField(default=0)
+    total_contributed = models.DecimalField(max_digits=20, decimal_places=0, default=0)
+    expected_total = models.DecimalField(max_digits=20, decimal_places=0, default=0)
+    next_recipient = models.CharField(max_length=66, blank=True, default='')
+    next_recipient_position = models.PositiveSmallIntegerField(null=True, blank=True)
+    payout_executed = models.BooleanField(default=False)
+    payout_recipient = models.CharField(max_length=66, blank=True, default='')
+    payout_amount = models.DecimalField(max_digits=20, decimal_places=0, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['group_address', 'cycle'], name='unique_cycle_summary'),
+        ]
+
+
+class ChainTransaction(models.Model):
+    """A transaction sent to Sui, tracked until its outcome is confirmed on chain."""
+
+    class Status(models.TextChoices):
+        SUBMITTING = 'submitting'  # Claimed by a chain worker, not executed yet
+        PENDING = 'pending'  # Digest known, waiting for the checker to find it on chain
+        SUCCESS = 'success'
+        FAILURE = 'failure'
+        DROPPED = 'dropped'  # Never found on chain
+        UNKNOWN = 'unknown'  # Submission was interrupted; it may or may not have landed
+        REJECTED = 'rejected'  # Found on chain, but not sent by its reporter or not touching its group
+
+    # Set for submissions made through the chain queue (see ajo/chain_queue.py)
+    idempotency_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+    task_id = models.CharField(max_length=255, blank=True, default='')
+    digest = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    # Bytes and signatures of a queued submission, saved before it is sent
+    signed_tx = models.JSONField(default=dict, blank=True)
+    operation = models.CharField(max_length=50)
+    signer_alias = models.CharField(max_length=100, blank=True, default='')
+    sender = models.CharField(max_length=66, blank=True, default='')
+    group_address = models.CharField(max_length=66, blank=True, default='')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    error = models.TextField(blank=True, default='')
+    effects = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    # Net gas in MIST (computation + storage - rebate)
+    gas_used = models.BigIntegerField(null=True, blank=True)
+    checkpoint = models.PositiveBigIntegerField(null=True, blank=True)
+    # Submission to finality
+    latency_ms = models.PositiveBigIntegerField(null=True, blank=True)
+    check_attempts = models.PositiveIntegerField(default=0)
+    submitted_at = models.DateTimeField(default=timezone.now)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'submitted_at']),
+            models.Index(fields=['group_address', 'submitted_at']),
+            models.Index(fields=['sender', 'submitted_at']),
+        ]
+
+    def as_result(self):
+        """Outcome returned to callers of the chain queue"""
+        return {
+            'status': self.status,
+            'digest': self.digest,
+            'error': self.error,
+            'result': self.result,
+        }
@@ -0,0 +1,166 @@
+"""
+Server-push delivery of notifications.
+
+New MyNotification rows are published to a Redis channel per user once the
+transaction that created them commits. Each ASGI worker process holds a
+single pub/sub connection, subscribes to the channels of the users
+connected to it, and hands every message to their open streams. Browsers
+receive them as Server-Sent Events from /ajo/notifications/stream/ (see
+ajo/views/stream.py) instead of polling the notification list. EventSource
+cannot send an Authorization header, so browsers open the stream with a
+short-lived, single-use ticket rather than their access token.
+"""
+
+import asyncio
+import json
+import secrets
+import weakref
+from logging import getLogger
+from typing import Dict, Iterable, Optional, Set
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = getLogger(__name__)
+
+
+def user_channel(user_id) -> str:
+    return f'{settings.NOTIFICATION_CHANNEL_PREFIX}:{user_id}'
+
+
+def _ticket_key(ticket) -> str:
+    return f'notifications:stream-ticket:{ticket}'
+
+
+def issue_stream_ticket(user) -> str:
+    """A ticket that opens one notification stream for the user"""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), user.id, settings.NOTIFICATION_STREAM_TICKET_SECONDS)
+    return ticket
+
+
+def redeem_stream_ticket(ticket) -> Optional[int]:
+    """Id of the user the ticket was issued to, or None; each ticket is accepted once"""
+    key = _ticket_key(ticket)
+    user_id = cache.get(key)
+    if user_id is None or not cache.delete(key):
+        return None
+    return user_id
+
+
+_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Process-wide client used to publish notifications"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.NOTIFICATION_REDIS_URL)
+    return _client
+
+
+def publish_notifications(notifications: Iterable, client=None):
+    """
+    Push saved notifications to their users' channels once the current
+    transaction commits (immediately outside of a transaction).
+
+    Delivery is best effort: clients that miss a message catch up from the
+    notification list or by resuming the stream with Last-Event-ID.
+    """
+    from ajo.serializers import NotificationSerializer
+
+    messages = [
+        (user_channel(notification.user_id), json.dumps(NotificationSerializer(notification).data))
+        for notification in notifications
+        if notification.pk is not None
+    ]
+    if not messages:
+        return
+
+    def send():
+        pipe = (client or get_redis()).pipeline(transaction=False)
+        for channel, message in messages:
+            pipe.publish(channel, message)
+        try:
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f'Failed to publish {len(messages)} notifications: {e}')
+
+    transaction.on_commit(send)
+
+
+class NotificationHub:
+    """Shares one pub/sub connection between every stream open in a process"""
+
+    def __init__(self, client=None, queue_size=None):
+        self.client = client or aioredis.Redis.from_url(settings.NOTIFICATION_REDIS_URL)
+        self.queue_size = queue_size or settings.NOTIFICATION_STREAM_QUEUE_SIZE
+        self.pubsub = None
+        self.listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def subscribe(self, user_id) -> asyncio.Queue:
+        """Start receiving a user's notifications on a new queue"""
+        channel = user_channel(user_id)
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        async with self._lock:
+            if self.pubsub is None:
+                self.pubsub = self.client.pubsub()
+            if channel not in self.listeners:
+                self.listeners[channel] = set()
+                await self.pubsub.subscribe(channel)
+            self.listeners[channel].add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self, user_id, queue: asyncio.Queue):
+        channel = user_channel(user_id)
+        async with self._lock:
+            queues = self.listeners.get(channel)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self.listeners[channel]
+                await self.pubsub.unsubscribe(channel)
+
+    async def _read(self):
+        while self.listeners:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except redis.RedisError as e:
+                logger.warning(f'Notification pub/sub connection failed: {e}')
+                await asyncio.sleep(1)
+                continue
+            if message is None or message['type'] != 'message':
+                continue
+
+            channel = message['channel']
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            data = message['data']
+            if isinstance(data, bytes):
+                data = data.decode()
+            for queue in list(self.listeners.get(channel, ())):
+                try:
+                    queue.put_nowait(data)
+                except asyncio.QueueFull:
+                    # A stalled client loses live messages; it resumes from Last-Event-ID
+                    logger.debug(f'Dropped notification for slow stream on {channel}')
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub() -> NotificationHub:
+    """The hub for the running event loop"""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = NotificationHub()
+    return hub
@@ -0,0 +1,52 @@
+"""
+Notification templates.
+
+A MyNotification row stores the key of one of these templates and the few
+values it needs (params) instead of the rendered sentence, so a broadcast
+to a large group writes a short key and a couple of names per member.
+Messages are rendered when notifications are read. Every member of a
+broadcast shares the same params, so renders are cached per (template,
+params) in each process.
+
+Rows written before templates existed have no template and keep their
+stored message.
+"""
+
+from functools import lru_cache
+from logging import getLogger
+from typing import Dict, Optional
+
+logger = getLogger(__name__)
+
+
+TEMPLATES: Dict[str, str] = {}
+
+
+def register(key: str, text: str):
+    """Add or replace a template. Placeholders use str.format syntax."""
+    TEMPLATES[key] = text
+    _render.cache_clear()
+
+
+def _freeze(params: Optional[dict]):
+    return tuple(sorted((params or {}).items()))
+
+
+@lru_cache(maxsize=1024)
+def _render(key: str, frozen_params) -> str:
+    return TEMPLATES[key].format(**dict(frozen_params))
+
+
+def render(key: str, params: Optional[dict] = None) -> str:
+    """Render a template, or an empty string if it is unknown or misses a param"""
+    try:
+        return _render(key, _freeze(params))
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        logger.warning(f'Cannot render notification template {key!r}: {e!r}')
+        return ''
+
+
+register('group_created', "You have successfully created the savings group '{group}'. Your contribution cycle starts soon!")
+register('group_invitation', "You have been invited to join the savings group '{group}' by {actor}. Welcome to the contribution!")
+register('group_joined', "You have successfully joined the savings group '{group}'. Welcome!")
+register('member_joined', "{actor} has joined the savings group '{group}'.")
@@ -0,0 +1,217 @@
+"""
+Notification fan-out for savings group events.
+
+Views only enqueue ajo.tasks.fan_out_group_notification once their
+transaction commits. The fan-out task walks the group's members by user id
+in chunks of NOTIFICATION_FANOUT_CHUNK_SIZE and queues one delivery task per
+chunk. Each delivery bulk-inserts its notifications in batches of
+NOTIFICATION_BULK_BATCH_SIZE, publishes them to open streams and, with
+NOTIFICATION_EMAIL_DIGESTS on, schedules at most one digest email per user
+per NOTIFICATION_DIGEST_WINDOW_SECONDS. Delivery counters are kept in the
+cache (see NotificationMetrics).
+"""
+
+import time
+from logging import getLogger
+from typing import Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from ajo.models import MyNotification, SavingsGroup
+from ajo.notification_stream import publish_notifications
+from main.models import User
+
+logger = getLogger(__name__)
+
+
+# Templates by event (see ajo/notification_templates.py): (for the actor, for every other member).
+# Template keys double as MyNotification.Type values.
+EVENT_TEMPLATES = {
+    'group_created': ('group_created', 'group_invitation'),
+    'group_joined': ('group_joined', 'member_joined'),
+}
+
+
+def display_name(user) -> str:
+    return user.get_full_name() or user.username
+
+
+class NotificationMetrics:
+    """Delivery counters shared by every worker, kept in the default cache"""
+
+    PREFIX = 'notifications:metrics'
+    COUNTERS = ['fanouts', 'batches', 'delivered', 'digests', 'duration_ms']
+
+    def __init__(self, cache_backend=None):
+        self.cache = cache_backend or cache
+
+    def _key(self, name):
+        return f'{self.PREFIX}:{name}'
+
+    def incr(self, name, amount=1):
+        key = self._key(name)
+        # add() is a no-op once the counter exists; incr() is atomic on Redis
+        self.cache.add(key, 0, None)
+        try:
+            self.cache.incr(key, amount)
+        except ValueError:
+            # Evicted between add() and incr()
+            self.cache.set(key, amount, None)
+
+    def snapshot(self) -> Dict[str, int]:
+        values = self.cache.get_many([self._key(name) for name in self.COUNTERS])
+        return {name: int(values.get(self._key(name), 0)) for name in self.COUNTERS}
+
+    def reset(self):
+        self.cache.delete_many([self._key(name) for name in self.COUNTERS])
+
+
+metrics = NotificationMetrics()
+
+
+def notify_group(event: str, savings_group: SavingsGroup, actor):
+    """Fan a group event out to its members after the current transaction commits"""
+    from ajo.tasks import fan_out_group_notification
+
+    if event not in EVENT_TEMPLATES:
+        raise ValueError(f'Unknown notification event: {event}')
+    transaction.on_commit(
+        lambda: fan_out_group_notification.delay(event, savings_group.pk, actor.pk)
+    )
+
+
+def member_id_chunks(group_id, chunk_size: Optional[int] = None) -> Iterator[List[int]]:
+    """User ids of a group's members, in ascending chunks (keyset pagination)"""
+    chunk_size = chunk_size or settings.NOTIFICATION_FANOUT_CHUNK_SIZE
+    members = SavingsGroup.participants.through.objects.filter(savingsgroup_id=group_id)
+    last_id = 0
+    while True:
+        chunk = list(
+            members.filter(user_id__gt=last_id)
+            .order_by('user_id')
+            .values_list('user_id', flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last_id = chunk[-1]
+
+
+def fan_out(event: str, group_id, actor_id, chunk_size: Optional[int] = None) -> int:
+    """
+    Queue one delivery task per chunk of group members.
+
+    Returns:
+        Number of delivery tasks queued
+    """
+    from ajo.tasks import deliver_group_notifications
+
+    group = SavingsGroup.objects.filter(pk=group_id).only('name').first()
+    actor = User.objects.filter(pk=actor_id).first()
+    if group is None or actor is None:
+        logger.info(f'Skipping {event} notifications: group {group_id} or user {actor_id} no longer exists')
+        return 0
+
+    params = {'group': group.name, 'actor': display_name(actor)}
+    chunks = 0
+    for recipient_ids in member_id_chunks(group_id, chunk_size):
+        deliver_group_notifications.delay(event, actor_id, recipient_ids, params)
+        chunks += 1
+    metrics.incr('fanouts')
+    logger.debug(f'Queued {chunks} {event} delivery chunks for group {group_id}')
+    return chunks
+
+
+def deliver(event: str, actor_id, recipient_ids: List[int], params: Dict[str, str]) -> int:
+    """
+    Create one chunk's notifications.
+
+    Returns:
+        Number of notifications created
+    """
+    started = time.monotonic()
+    actor_template, member_template = EVENT_TEMPLATES[event]
+    notifications = []
+    for user_id in recipient_ids:
+        template = actor_template if user_id == actor_id else member_template
+        notifications.append(MyNotification(
+            user_id=user_id,
+            notification_type=template,
+            template=template,
+            params=params,
+            is_read=False,
+        ))
+    batch_size = settings.NOTIFICATION_BULK_BATCH_SIZE
+    MyNotification.objects.bulk_create(notifications, batch_size=batch_size)
+    publish_notifications(notifications)
+    if settings.NOTIFICATION_EMAIL_DIGESTS:
+        schedule_digests(recipient_ids)
+
+    metrics.incr('delivered', len(notifications))
+    metrics.incr('batches', -(-len(notifications) // batch_size))
+    metrics.incr('duration_ms', int((time.monotonic() - started) * 1000))
+    return len(notifications)
+
+
+def _digest_pending_key(user_id):
+    return f'notifications:digest-pending:{user_id}'
+
+
+def _digested_key(user_id):
+    return f'notifications:digested:{user_id}'
+
+
+def schedule_digests(user_ids: List[int], window: Optional[int] = None):
+    """Queue a digest email for each user that does not already have one coming"""
+    from ajo.tasks import send_notification_digest
+
+    window = settings.NOTIFICATION_DIGEST_WINDOW_SECONDS if window is None else window
+    for user_id in user_ids:
+        if cache.add(_digest_pending_key(user_id), 1, window):
+            send_notification_digest.apply_async((user_id,), countdown=window)
+
+
+def send_digest(user_id, limit: Optional[int] = None) -> int:
+    """
+    Email a user the unread notifications they have not had a digest for.
+
+    Returns:
+        Number of notifications in the email
+    """
+    from main.tasks import celery_send_email
+
+    cache.delete(_digest_pending_key(user_id))
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return 0
+
+    limit = limit or settings.NOTIFICATION_DIGEST_LIMIT
+    last_id = cache.get(_digested_key(user_id), 0)
+    unread = MyNotification.objects.filter(user_id=user_id, is_read=False, id__gt=last_id)
+    total = unread.count()
+    notifications = list(unread.order_by('-id')[:limit])
+    if not notifications:
+        return 0
+
+    subject = f'You have {total} new notification{"s" if total != 1 else ""}'
+    celery_send_email.delay(
+        subject=subject,
+        message='\n'.join(n.render() for n in notifications),
+        from_email=settings.EMAIL_DEFAULT_SENDER,
+        recipient_list=[user.email],
+        fail_silently=False,
+        html_message=render_to_string('mail/notification-digest.html', {
+            'email': user.email,
+            'notifications': notifications,
+            'total': total,
+            'more': total - len(notifications),
+        }),
+    )
+    cache.set(_digested_key(user_id), notifications[0].id, None)
+    metrics.incr('digests')
+    return len(notifications)
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination over a user's notifications, newest first.
+
+    Pages are fetched with WHERE id < cursor ORDER BY id DESC on the
+    (user, is_read, id) index, or (user, notification_type, id) when filtered
+    by type, so the cost of a page does not depend on how deep into the inbox
+    it is.
+    """
+    ordering = '-id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
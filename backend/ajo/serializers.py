@@ -3,13 +3,27 @@ from rest_framework import serializers
 from main.models import User
 from .models import AjoUser
 from rest_framework import serializers
-from .models import SavingsGroup, MyNotification
+from .models import SavingsGroup, MyNotification, CycleSummary, ChainTransaction
 from logging import getLogger
 
 logger = getLogger(__name__)
 
 
+def get_transaction_status(group):
+    """
+    Status of the transaction that created a group on chain. Uses the
+    transaction_status annotation when the queryset has it.
+    """
+    if hasattr(group, 'transaction_status'):
+        return group.transaction_status
+    if not group.digest:
+        return None
+    return ChainTransaction.objects.filter(digest=group.digest).values_list('status', flat=True).first()
+
+
 class NotificationSerializer(serializers.ModelSerializer):
+    message = serializers.CharField(source='render', read_only=True)
+
     class Meta:
         model = MyNotification
         fields = '__all__'
@@ -59,7 +73,7 @@ class SavingsGroupSerializer(serializers.ModelSerializer):
     Serializer for SavingsGroup model with nested participant information.
     """
     participants = serializers.SerializerMethodField()  # Change to SerializerMethodField
-    participants_count = serializers.SerializerMethodField()
+    transaction_status = serializers.SerializerMethodField()
     participant_ids = serializers.ListField(
         child=serializers.IntegerField(),
         write_only=True,
@@ -80,16 +94,17 @@ class SavingsGroupSerializer(serializers.ModelSerializer):
             'participants_count',
             'participant_ids',
             'active',
+            'transaction_status',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'participants_count', 'created_at', 'updated_at']
 
     def get_participants(self, obj):
         # Get the ajo instances from the users
         ajo_users = [user.ajo for user in obj.participants.all() if hasattr(user, 'ajo')]
         return AjoUserSerializer(ajo_users, many=True, context=self.context).data
 
-    def get_participants_count(self, obj):
-        return obj.participants.count()
+    def get_transaction_status(self, obj):
+        return get_transaction_status(obj)
        
     def validate_cycle_duration_days(self, value):
         """
@@ -140,6 +155,7 @@ class SavingsGroupSerializer(serializers.ModelSerializer):
         if participant_ids:
             participants = AjoUser.objects.filter(id__in=participant_ids)
             savings_group.participants.set(participants.values_list('id', flat=True))
+            savings_group.refresh_from_db(fields=['participants_count'])
         
         return savings_group
     
@@ -157,7 +173,9 @@ class SavingsGroupSerializer(serializers.ModelSerializer):
         # Update participants if provided
         if participant_ids is not None:
             participants = AjoUser.objects.filter(id__in=participant_ids)
-            instance.participants.set(participants)
+            instance.participants.set(participants.values_list('id', flat=True))
+            # Recounted by the m2m_changed hook, not on this instance
+            instance.refresh_from_db(fields=['participants_count'])
         
         return instance
 
@@ -204,6 +222,7 @@ class SavingsGroupCreateSerializer(serializers.ModelSerializer):
         if participant_ids:
             participants = User.objects.filter(id__in=participant_ids)
             savings_group.participants.set(participants.values_list('id', flat=True))
+            savings_group.refresh_from_db(fields=['participants_count'])
         
         return savings_group
 
@@ -212,7 +231,7 @@ class SavingsGroupListSerializer(serializers.ModelSerializer):
     """
     Minimal serializer for listing savings groups with essential information only.
     """
-    participants_count = serializers.SerializerMethodField()
+    transaction_status = serializers.SerializerMethodField()
     
     class Meta:
         model = SavingsGroup
@@ -225,8 +244,103 @@ class SavingsGroupListSerializer(serializers.ModelSerializer):
             'description',
             'active',
             'address_link',
-            'digest'
+            'digest',
+            'transaction_status',
         ]
+        read_only_fields = ['participants_count']
     
-    def get_participants_count(self, obj):
-        return obj.participants.count()
\ No newline at end of file
+    def get_transaction_status(self, obj):
+        return get_transaction_status(obj)
+
+
+class CycleSummarySerializer(serializers.ModelSerializer):
+    """
+    Per-cycle contribution status read from the local ledger.
+    """
+    class Meta:
+        model = CycleSummary
+        fields = [
+            'group_address',
+            'cycle',
+            'start_cycle',
+            'contribution_amount',
+            'participants',
+            'contributors',
+            'pending_contributors',
+            'contributions_count',
+            'total_contributed',
+            'expected_total',
+            'next_recipient',
+            'next_recipient_position',
+            'payout_executed',
+            'payout_recipient',
+            'payout_amount',
+            'updated_at',
+        ]
+
+
+class ParticipantInfoSerializer(serializers.Serializer):
+    address = serializers.CharField()
+    position = serializers.IntegerField()
+    has_contributed = serializers.BooleanField()
+    has_received_payout = serializers.BooleanField()
+
+
+class PendingPayoutSerializer(serializers.Serializer):
+    recipient = serializers.CharField()
+    amount = serializers.IntegerField()
+    cycle = serializers.IntegerField()
+    signatures = serializers.ListField(child=serializers.CharField())
+
+
+class ChainStateSerializer(serializers.Serializer):
+    """
+    On-chain state of a savings group (a SavingsGroupInfo), served through
+    the read-through state cache.
+    """
+    object_id = serializers.CharField()
+    version = serializers.IntegerField()
+    name = serializers.CharField()
+    cycle_duration_days = serializers.IntegerField()
+    contribution_amount = serializers.IntegerField()
+    current_cycle = serializers.IntegerField()
+    current_balance = serializers.IntegerField()
+    is_active = serializers.BooleanField()
+    start_cycle = serializers.IntegerField()
+    total_cycles_completed = serializers.IntegerField()
+    participants = ParticipantInfoSerializer(many=True)
+    multisig_signers = serializers.ListField(child=serializers.CharField())
+    multisig_threshold = serializers.IntegerField()
+    pending_payout = PendingPayoutSerializer(allow_null=True)
+
+
+class ChainTransactionSerializer(serializers.ModelSerializer):
+    """
+    A tracked Sui transaction and its confirmed outcome.
+    """
+    class Meta:
+        model = ChainTransaction
+        fields = [
+            'digest',
+            'operation',
+            'status',
+            'sender',
+            'group_address',
+            'error',
+            'effects',
+            'gas_used',
+            'checkpoint',
+            'latency_ms',
+            'submitted_at',
+            'confirmed_at',
+        ]
+        read_only_fields = fields
+
+
+class TrackTransactionSerializer(serializers.Serializer):
+    """
+    A digest signed and submitted by the user's wallet, reported for tracking.
+    """
+    digest = serializers.RegexField(r'^[1-9A-HJ-NP-Za-km-z]{43,44}$')
+    operation = serializers.CharField(max_length=50)
+    group_address = serializers.RegexField(r'^0x[0-9a-fA-F]{1,64}$', required=False, allow_blank=True)
@@ -0,0 +1,33 @@
+import logging
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+from ajo.models import SavingsGroup
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(m2m_changed, sender=SavingsGroup.participants.through)
+def update_participants_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep SavingsGroup.participants_count in step with the participants
+    relation, from either side (group.participants or user.savings_groups).
+    """
+    if action == 'pre_clear' and reverse:
+        # The cleared groups are gone by post_clear, remember them now
+        instance._cleared_savings_group_ids = list(
+            instance.savings_groups.values_list('pk', flat=True)
+        )
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        group_ids = [instance.pk]
+    elif action == 'post_clear':
+        group_ids = getattr(instance, '_cleared_savings_group_ids', [])
+    else:
+        group_ids = list(pk_set or [])
+
+    if group_ids:
+        SavingsGroup.objects.filter(pk__in=group_ids).refresh_participants_count()
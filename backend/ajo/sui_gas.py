@@ -0,0 +1,466 @@
+"""
+Gas coin reservation pool per signer
+
+Every Sui transaction pays for gas with a coin object, and two in-flight
+transactions that pay with the same coin conflict on its version: one is
+rejected, or the coin stays locked until the end of the epoch. GasCoinManager
+keeps a set of pre-split gas coins per signer and leases each coin to at
+most one transaction at a time, so parallel submissions from one key no
+longer serialize or fail. Leases are also recorded in the shared cache (as
+SignerLock does), so worker processes signing with the same key never hand
+out the same coin or merge one another's leased coins. Coins worn down to dust are merged back into the
+largest free coin by maintain(), which runs after every few leases and can
+also be scheduled with start_background_maintenance().
+
+GasEstimator replaces fixed gas budgets: the first transaction of each
+shape (move target and argument-size bucket) is dry-run, and the measured
+cost plus a safety margin is reused until the entry expires.
+"""
+
+import asyncio
+import base64
+import inspect
+import os
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from django.conf import settings
+from django.core.cache import caches
+from pysui.sui.sui_bcs import bcs
+from pysui.sui.sui_builders.exec_builders import DryRunTransaction
+from pysui.sui.sui_txresults.complex_tx import DryRunTxResult
+from pysui.sui.sui_types.address import SuiAddress
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_GAS_POOL_SIZE = int(os.environ.get('SUI_GAS_POOL_SIZE', 0))
+DEFAULT_GAS_COIN_BALANCE = int(os.environ.get('SUI_GAS_COIN_BALANCE', 500_000_000))  # 0.5 SUI
+DEFAULT_GAS_DUST_BALANCE = int(os.environ.get('SUI_GAS_DUST_BALANCE', 50_000_000))  # 0.05 SUI
+DEFAULT_GAS_LEASE_TIMEOUT = float(os.environ.get('SUI_GAS_LEASE_TIMEOUT_SECONDS', 30))
+# Shared leases expire after this long, in case their process died holding them
+DEFAULT_GAS_LEASE_TTL = float(os.environ.get('SUI_GAS_LEASE_TTL_SECONDS', 120))
+
+DEFAULT_GAS_SAFETY_MARGIN = float(os.environ.get('SUI_GAS_SAFETY_MARGIN', 1.2))
+DEFAULT_GAS_ESTIMATE_TTL = float(os.environ.get('SUI_GAS_ESTIMATE_TTL_SECONDS', 600))
+
+# Gas budget for the pool's own split and merge transactions
+MAINTENANCE_GAS_BUDGET = 20_000_000
+
+# Budgets below this are rejected by validators regardless of the measured cost
+MIN_GAS_BUDGET = 1_000_000
+
+
+class GasPoolError(Exception):
+    """Gas coins could not be fetched, split or leased"""
+    pass
+
+
+async def maybe_await(value):
+    """Await builder results from async transactions, pass sync ones through"""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class GasCoinManager:
+    """Leases pre-split gas coins to in-flight transactions, per signer"""
+
+    def __init__(
+        self,
+        sdk,
+        pool_size: int = DEFAULT_GAS_POOL_SIZE,
+        coin_balance: int = DEFAULT_GAS_COIN_BALANCE,
+        dust_balance: int = DEFAULT_GAS_DUST_BALANCE,
+        lease_timeout: float = DEFAULT_GAS_LEASE_TIMEOUT,
+        lease_ttl: float = DEFAULT_GAS_LEASE_TTL,
+        cache=None
+    ):
+        """
+        Initialize the manager
+
+        Args:
+            sdk: SavingsGroupSDK whose client and keypairs are used
+            pool_size: Gas coins kept per signer
+            coin_balance: Balance of each pre-split coin (in MIST)
+            dust_balance: Coins below this balance are merged away (in MIST)
+            lease_timeout: Seconds to wait for a free coin before giving up
+            lease_ttl: Seconds before a shared lease held by a dead process expires
+            cache: Cache shared by the signing processes (SUI_STATE_CACHE_ALIAS by default)
+        """
+        self.sdk = sdk
+        self.pool_size = pool_size
+        self.coin_balance = coin_balance
+        self.dust_balance = dust_balance
+        self.lease_timeout = lease_timeout
+        self.lease_ttl = lease_ttl
+        self.cache = cache or caches[settings.SUI_STATE_CACHE_ALIAS]
+        self.token = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._free: Dict[str, Dict[str, int]] = {}  # address -> {coin id: last known balance}
+        self._leased: Dict[str, Dict[str, int]] = {}  # address -> {coin id: balance at lease}
+        self._leases_since_maintenance: Dict[str, int] = {}
+        self._maintaining: Set[str] = set()
+        self._background_task: Optional[asyncio.Task] = None
+
+    async def _fetch_coins(self, address: str) -> Dict[str, int]:
+        result = await maybe_await(self.sdk.client.get_gas(SuiAddress(address), fetch_all=True))
+        if not result.is_ok():
+            raise GasPoolError(f"Failed to fetch gas coins for {address}: {result.result_string}")
+        return {coin.coin_object_id: int(coin.balance) for coin in result.result_data.data}
+
+    async def _submit(self, alias: str, build, gas_coin: str):
+        """Build and execute a pool maintenance transaction paid by gas_coin"""
+        txn = self.sdk._new_transaction(self.sdk.keypairs[alias])
+        await build(txn)
+        result = await maybe_await(
+            txn.execute(gas_budget=MAINTENANCE_GAS_BUDGET, use_gas_object=gas_coin)
+        )
+        return self.sdk._handle_transaction_result(result)
+
+    @staticmethod
+    def _lease_key(coin_id: str) -> str:
+        return f'sui:gas-lease:{coin_id}'
+
+    def _hold(self, key: str) -> bool:
+        """Take a shared lease, False if another process holds it"""
+        return self.cache.add(key, self.token, self.lease_ttl)
+
+    def _drop(self, key: str):
+        if self.cache.get(key) == self.token:
+            self.cache.delete(key)
+
+    def _held_elsewhere(self, coin_ids) -> Set[str]:
+        keys = {self._lease_key(coin_id): coin_id for coin_id in coin_ids}
+        return {
+            keys[key] for key, token in self.cache.get_many(list(keys)).items()
+            if token != self.token
+        }
+
+    def _claim(self, address: str, coin_ids: List[str]) -> bool:
+        """Lease coins for a maintenance transaction, all or none"""
+        held = []
+        for coin_id in coin_ids:
+            if not self._hold(self._lease_key(coin_id)):
+                for key in held:
+                    self._drop(key)
+                return False
+            held.append(self._lease_key(coin_id))
+        with self._lock:
+            leased = self._leased.setdefault(address, {})
+            free = self._free.setdefault(address, {})
+            for coin_id in coin_ids:
+                leased[coin_id] = free.pop(coin_id, 0)
+        return True
+
+    def _unclaim(self, address: str, coin_ids: List[str]):
+        with self._lock:
+            leased = self._leased.setdefault(address, {})
+            for coin_id in coin_ids:
+                leased.pop(coin_id, None)
+        for coin_id in coin_ids:
+            self._drop(self._lease_key(coin_id))
+
+    async def maintain(self, alias: str):
+        """
+        Reconcile a signer's pool with the chain
+
+        Free coins are refreshed, dust coins are merged into the largest free
+        coin and, if fewer than pool_size usable coins remain, the largest
+        coin is split to top the pool up. Coins leased here or by another
+        process are never touched, and only one process at a time submits
+        maintenance transactions for a signer; the others just refresh.
+        """
+        address = self.sdk.get_address(alias)
+        with self._lock:
+            if address in self._maintaining:
+                return
+            self._maintaining.add(address)
+            self._leases_since_maintenance[address] = 0
+
+        maintenance_key = f'sui:gas-maintenance:{address}'
+        owner = self._hold(maintenance_key)
+        try:
+            coins = await self._fetch_coins(address)
+            with self._lock:
+                leased = set(self._leased.get(address, ()))
+            elsewhere = self._held_elsewhere(coins)
+            free = {
+                coin_id: balance for coin_id, balance in coins.items()
+                if coin_id not in leased and coin_id not in elsewhere
+            }
+            if not free or not owner:
+                self._set_free(address, coins)
+                return
+
+            primary = max(free, key=free.get)
+            dust = [coin_id for coin_id, balance in free.items() if coin_id != primary and balance < self.dust_balance]
+            usable = [coin_id for coin_id, balance in free.items() if balance >= self.dust_balance]
+            missing = self.pool_size - len(usable) - len(leased) - len(elsewhere)
+            affordable = (free[primary] - self.coin_balance) // self.coin_balance
+            split_count = max(0, min(missing, affordable))
+
+            # Keep these coins away from lessees while the transaction is in flight
+            if (dust or split_count) and self._claim(address, [primary] + dust):
+                try:
+                    async def build(txn):
+                        if dust:
+                            await maybe_await(txn.merge_coins(merge_to=txn.gas, merge_from=dust))
+                        if split_count:
+                            new_coins = await maybe_await(
+                                txn.split_coin(coin=txn.gas, amounts=[self.coin_balance] * split_count)
+                            )
+                            if not isinstance(new_coins, list):
+                                new_coins = [new_coins]
+                            await maybe_await(
+                                txn.transfer_objects(transfers=new_coins, recipient=SuiAddress(address))
+                            )
+
+                    await self._submit(alias, build, primary)
+                    logger.info(
+                        f"Gas pool for {alias}: merged {len(dust)} dust coins, split {split_count} new coins"
+                    )
+                finally:
+                    self._unclaim(address, [primary] + dust)
+                coins = await self._fetch_coins(address)
+
+            self._set_free(address, coins)
+        finally:
+            if owner:
+                self._drop(maintenance_key)
+            with self._lock:
+                self._maintaining.discard(address)
+
+    def _set_free(self, address: str, coins: Dict[str, int]):
+        # Coins leased by other processes stay listed; _acquire skips them while held
+        with self._lock:
+            leased = self._leased.get(address, {})
+            self._free[address] = {
+                coin_id: balance for coin_id, balance in coins.items()
+                if coin_id not in leased and balance >= self.dust_balance
+            }
+
+    def _acquire(self, address: str, min_balance: int) -> Optional[str]:
+        with self._lock:
+            free = self._free.get(address, {})
+            candidates = sorted(
+                (coin_id for coin_id, balance in free.items() if balance >= min_balance),
+                key=free.get, reverse=True
+            )
+        for coin_id in candidates:
+            with self._lock:
+                balance = self._free.get(address, {}).pop(coin_id, None)
+                if balance is None:
+                    continue
+                self._leased.setdefault(address, {})[coin_id] = balance
+            if self._hold(self._lease_key(coin_id)):
+                return coin_id
+            # Leased by another process: keep it listed for a later attempt
+            with self._lock:
+                self._leased[address].pop(coin_id, None)
+                self._free.setdefault(address, {})[coin_id] = balance
+        return None
+
+    def _release(self, address: str, coin_id: str, spent: int) -> bool:
+        """Return a coin to the pool; True when the pool is due for maintenance"""
+        with self._lock:
+            balance = self._leased.get(address, {}).pop(coin_id, 0) - spent
+            if balance >= self.dust_balance:
+                self._free.setdefault(address, {})[coin_id] = balance
+            count = self._leases_since_maintenance.get(address, 0) + 1
+            self._leases_since_maintenance[address] = count
+        self._drop(self._lease_key(coin_id))
+        return count >= self.pool_size
+
+    @asynccontextmanager
+    async def lease(self, alias: str, gas_budget: int = 0):
+        """
+        Lease a gas coin for one transaction
+
+        Usage:
+            async with manager.lease('admin', gas_budget) as coin_id:
+                await txn.execute(gas_budget=gas_budget, use_gas_object=coin_id)
+
+        Args:
+            alias: Signer keypair alias
+            gas_budget: Budget (plus any amount split from gas) the coin must cover
+        """
+        address = self.sdk.get_address(alias)
+        with self._lock:
+            known = address in self._free
+        if not known:
+            await self.maintain(alias)
+
+        deadline = time.monotonic() + self.lease_timeout
+        coin_id = self._acquire(address, gas_budget)
+        while coin_id is None:
+            if time.monotonic() >= deadline:
+                raise GasPoolError(f"No free gas coin for {alias} after {self.lease_timeout}s")
+            await asyncio.sleep(0.05)
+            coin_id = self._acquire(address, gas_budget)
+
+        try:
+            yield coin_id
+        finally:
+            # The real balance is only known after the next refresh, so assume
+            # the whole budget was spent and let worn coins retire early
+            if self._release(address, coin_id, gas_budget):
+                try:
+                    asyncio.get_running_loop().create_task(self._maintain_quietly(alias))
+                except RuntimeError:
+                    pass
+
+    async def _maintain_quietly(self, alias: str):
+        try:
+            await self.maintain(alias)
+        except Exception as e:
+            logger.warning(f"Gas pool maintenance failed for {alias}: {e}")
+
+    def start_background_maintenance(self, interval: float = 60.0) -> asyncio.Task:
+        """Periodically maintain every signer's pool on the running event loop"""
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                for alias in list(self.sdk.keypairs):
+                    with self._lock:
+                        known = self.sdk.get_address(alias) in self._free
+                    if known:
+                        await self._maintain_quietly(alias)
+
+        self._background_task = asyncio.get_running_loop().create_task(loop())
+        return self._background_task
+
+    def stop_background_maintenance(self):
+        if self._background_task is not None:
+            self._background_task.cancel()
+            self._background_task = None
+
+
+def size_bucket(size: int) -> int:
+    """Round an argument size (participants, batched calls) up to a power of two"""
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return bucket
+
+
+class GasEstimator:
+    """Caches dry-run gas costs per transaction shape"""
+
+    def __init__(
+        self,
+        margin: float = DEFAULT_GAS_SAFETY_MARGIN,
+        ttl: float = DEFAULT_GAS_ESTIMATE_TTL
+    ):
+        """
+        Initialize the estimator
+
+        Args:
+            margin: Multiplier applied to the measured cost
+            ttl: Seconds a measured cost is reused before the shape is dry-run again
+        """
+        self.margin = margin
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (target, bucket) -> (measured cost, measured size, expires at)
+        self._costs: Dict[Tuple[str, int], Tuple[int, int, float]] = {}
+
+    def _budget(self, cost: int, measured_size: int, size: int) -> int:
+        # Costs grow roughly linearly with size inside a bucket
+        scaled = cost * max(size, 1) / max(measured_size, 1) if size > measured_size else cost
+        return max(MIN_GAS_BUDGET, int(scaled * self.margin))
+
+    def cached(self, target: str, size: int = 1) -> Optional[int]:
+        """Return the cached budget for a shape, or None if unknown or expired"""
+        with self._lock:
+            entry = self._costs.get((target, size_bucket(size)))
+        if entry is None or entry[2] < time.monotonic():
+            return None
+        return self._budget(entry[0], entry[1], size)
+
+    def record(self, target: str, size: int, cost: int):
+        """Store a measured cost for a shape"""
+        with self._lock:
+            self._costs[(target, size_bucket(size))] = (cost, max(size, 1), time.monotonic() + self.ttl)
+
+    def invalidate(self, target: Optional[str] = None):
+        """Forget measured costs, for one target or all of them"""
+        with self._lock:
+            if target is None:
+                self._costs.clear()
+            else:
+                for key in [key for key in self._costs if key[0] == target]:
+                    del self._costs[key]
+
+    @staticmethod
+    async def dry_run(txn) -> int:
+        """
+        Dry-run a built transaction and return its gas cost
+
+        Mirrors the dry run pysui performs when execute() is called without a
+        budget: no gas payment and the protocol's maximum budget.
+        """
+        sender = txn.signer_block.sender
+        address = sender.address if isinstance(sender, SuiAddress) else sender.signing_address
+        tx_data = bcs.TransactionData(
+            "V1",
+            bcs.TransactionDataV1(
+                txn.raw_kind(),
+                bcs.Address.from_str(address),
+                bcs.GasData(
+                    [],
+                    bcs.Address.from_str(address),
+                    int(txn.gas_price),
+                    txn.constraints.max_tx_gas,
+                ),
+                bcs.TransactionExpiration("None"),
+            ),
+        )
+        result = await maybe_await(txn.client.execute(
+            DryRunTransaction(tx_bytes=base64.b64encode(tx_data.serialize()).decode())
+        ))
+        if not result.is_ok() or not isinstance(result.result_data, DryRunTxResult):
+            raise GasPoolError(f"Dry run failed: {result.result_string}")
+        effects = result.result_data.effects
+        if effects.status.status != 'success':
+            raise GasPoolError(f"Dry run aborted: {effects.status.error}")
+        return effects.gas_used.total
+
+    async def estimate(self, txn, target: str, size: int = 1, fallback: Optional[int] = None) -> int:
+        """
+        Gas budget for a built transaction
+
+        Args:
+            txn: Built, unexecuted transaction
+            target: Move call target identifying the transaction shape
+            size: Argument size (e.g. participant count or batched calls)
+            fallback: Budget to use if the dry run fails (re-raises if None)
+        """
+        budget = self.cached(target, size)
+        if budget is not None:
+            return budget
+        try:
+            cost = await self.dry_run(txn)
+        except Exception as e:
+            if fallback is None:
+                raise
+            logger.warning(f"Gas estimation for {target} failed, using {fallback}: {e}")
+            return fallback
+        self.record(target, size, cost)
+        logger.debug(f"Measured {cost} MIST gas for {target} (size {size})")
+        return self._budget(cost, size, size)
+
+
+_estimator: Optional[GasEstimator] = None
+
+
+def get_gas_estimator() -> GasEstimator:
+    """Return the process-wide estimator shared by SavingsGroupSDK instances"""
+    global _estimator
+    if _estimator is None:
+        _estimator = GasEstimator()
+    return _estimator
@@ -0,0 +1,232 @@
+"""
+Process-wide Sui RPC client pool
+
+Building a pysui client is expensive: the config file is parsed and every
+client performs three RPC round trips (rpc.discover, gas price, protocol
+config) before it can be used. This module keeps one SuiConfig and one set
+of clients per process so that SavingsGroupSDK instances, Celery tasks and
+request handlers all share warm keep-alive connections.
+
+Sync callers share a single SyncClient. httpx.AsyncClient connections are
+bound to the event loop that opened them, so async callers get one
+AsyncClient per running event loop, and none outside of one.
+"""
+
+import asyncio
+import os
+import ssl
+import threading
+import weakref
+from typing import Optional
+import logging
+
+import httpx
+from pysui import SuiConfig, SyncClient, AsyncClient
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_POOL_SIZE = int(os.environ.get('SUI_RPC_POOL_SIZE', 10))
+DEFAULT_KEEPALIVE_SECONDS = float(os.environ.get('SUI_RPC_KEEPALIVE_SECONDS', 60))
+DEFAULT_TIMEOUT_SECONDS = float(os.environ.get('SUI_RPC_TIMEOUT_SECONDS', 120))
+
+
+class SuiClientPool:
+    """Shares SuiConfig and RPC clients across a process"""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        keepalive: float = DEFAULT_KEEPALIVE_SECONDS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        config: Optional[SuiConfig] = None
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            size: Maximum number of open connections per client
+            keepalive: Seconds an idle connection is kept open
+            timeout: Request timeout in seconds
+            config: SuiConfig object (if None, uses the default config)
+        """
+        self.size = size
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self._config = config
+        # Process that created the pool; a forked child must not reuse it
+        self.pid = os.getpid()
+        self._sync_client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        # Close tasks of replaced transports, held until they finish
+        self._closing = set()
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> SuiConfig:
+        """The shared SuiConfig, loaded once per process"""
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = SuiConfig.default_config()
+        return self._config
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.size,
+            max_keepalive_connections=self.size,
+            keepalive_expiry=self.keepalive
+        )
+
+    def _transport_kwargs(self) -> dict:
+        # pysui's own transports skip certificate verification; ours do not
+        return {
+            'http2': True,
+            'timeout': self.timeout,
+            'limits': self._limits(),
+            'verify': ssl.create_default_context(),
+        }
+
+    def sync_client(self) -> SyncClient:
+        """Return the shared synchronous client"""
+        if self._sync_client is None:
+            with self._lock:
+                if self._sync_client is None:
+                    client = SyncClient(self.config)
+                    client._client.close()
+                    client._client = httpx.Client(**self._transport_kwargs())
+                    self._sync_client = client
+                    logger.info(f"Created pooled sync Sui client (size={self.size})")
+        return self._sync_client
+
+    def async_client(self) -> AsyncClient:
+        """
+        Return the asynchronous client for the running event loop
+
+        Raises:
+            RuntimeError: Called outside of a running event loop; its
+                transport would bind to an unknown loop and never be closed
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = AsyncClient(self.config)
+                # pysui's default transport has not opened a connection yet
+                default, client._client = client._client, httpx.AsyncClient(**self._transport_kwargs())
+                task = loop.create_task(default.aclose())
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+                self._async_clients[loop] = client
+                logger.info(f"Created pooled async Sui client (size={self.size})")
+        return client
+
+    def warm(self):
+        """Load config and open the sync client ahead of the first request"""
+        self.sync_client()
+
+    def close(self):
+        """Close every client owned by the pool"""
+        with self._lock:
+            sync_client, self._sync_client = self._sync_client, None
+            async_clients = list(self._async_clients.items())
+            self._async_clients.clear()
+
+        if sync_client is not None:
+            sync_client.close()
+
+        for loop, client in async_clients:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                loop.call_soon_threadsafe(
+                    lambda c=client: asyncio.ensure_future(c.close())
+                )
+            else:
+                loop.run_until_complete(client.close())
+
+    async def aclose(self):
+        """Close the async client bound to the running loop"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+
+    def reset(self):
+        """
+        Forget inherited clients without closing them.
+
+        Used after fork: the child must not reuse or shut down sockets that
+        belong to the parent process.
+        """
+        with self._lock:
+            self._sync_client = None
+            self._async_clients = weakref.WeakKeyDictionary()
+
+
+_pool: Optional[SuiClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> SuiClientPool:
+    """Return the process-wide pool, creating it with defaults if needed"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SuiClientPool()
+    return _pool
+
+
+def init_client_pool(
+    size: int = DEFAULT_POOL_SIZE,
+    keepalive: float = DEFAULT_KEEPALIVE_SECONDS,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    warm: bool = True
+) -> SuiClientPool:
+    """
+    (Re)create the process-wide pool. Called from worker start hooks.
+
+    Under the uvicorn worker both gunicorn's post_worker_init and the ASGI
+    lifespan startup call this; a pool this process already created with the
+    same settings is kept, so its warm clients are neither dropped nor leaked.
+    A pool of this process with other settings is closed and replaced; one
+    inherited through fork is replaced without closing the parent's sockets.
+
+    Args:
+        size: Maximum number of open connections per client
+        keepalive: Seconds an idle connection is kept open
+        timeout: Request timeout in seconds
+        warm: Whether to load config and open the sync client immediately
+    """
+    global _pool
+    with _pool_lock:
+        current = _pool
+        if current is not None and current.pid == os.getpid() and (
+            (current.size, current.keepalive, current.timeout) == (size, keepalive, timeout)
+        ):
+            return current
+        if current is not None:
+            if current.pid == os.getpid():
+                current.close()
+            else:
+                current.reset()
+        _pool = SuiClientPool(size=size, keepalive=keepalive, timeout=timeout)
+    if warm:
+        try:
+            _pool.warm()
+        except Exception as e:
+            # A missing sui config must not stop the worker from booting
+            logger.warning(f"Could not warm Sui client pool: {e}")
+    return _pool
+
+
+def close_client_pool():
+    """Close the process-wide pool. Called from worker shutdown hooks."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
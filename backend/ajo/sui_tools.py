@@ -7,29 +7,87 @@ pip install pysui
 """
 
 import asyncio
+import base64
+import hashlib
 import json
+import re
 import time
-from typing import List, Dict, Optional, Tuple, Any, Union
-from dataclasses import dataclass
+from contextvars import ContextVar
+from typing import List, Dict, Optional, Set, Tuple, Any, Union, Callable, Awaitable
+from dataclasses import dataclass, field
 from enum import Enum
 import logging
 
+import base58
+import httpx
+
 # PySui imports
-from pysui import SuiConfig, SyncClient, AsyncClient
+from pysui import SuiConfig, SuiRpcResult, SyncClient, AsyncClient
 from pysui.sui.sui_types.address import SuiAddress
-from pysui.sui.sui_types.scalars import ObjectID, SuiString, SuiU64, SuiU8
+from pysui.sui.sui_types.scalars import ObjectID, SuiSignature, SuiString, SuiTxBytes, SuiU64, SuiU8
 from pysui.sui.sui_txn.sync_transaction import SuiTransaction
 from pysui.sui.sui_txn.async_transaction import SuiTransactionAsync
 from pysui.abstracts import KeyPair
-from pysui.sui.sui_crypto import SuiKeyPair, keypair_from_keystore
+from pysui.sui.sui_crypto import SuiKeyPair, keypair_from_keystring
 from pysui.sui.sui_clients.common import handle_result
+from pysui.sui.sui_builders.base_builder import SuiRequestType
+from pysui.sui.sui_builders.exec_builders import ExecuteTransaction
+from pysui.sui.sui_builders.get_builders import GetMultipleObjects, GetMultipleTx, QueryEvents
+from pysui.sui.sui_types.collections import EventID, SuiArray
+from pysui.sui.sui_types.event_filter import MoveModuleEventQuery
+from pysui.sui.sui_txresults.single_tx import ObjectRead
+
+from ajo.sui_gas import (
+    DEFAULT_GAS_POOL_SIZE, GasCoinManager, GasPoolError, get_gas_estimator, maybe_await
+)
+from ajo.sui_pool import get_client_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def normalize_address(address: str) -> str:
+    """Normalize a Sui address to lowercase, 0x-prefixed, 64 hex digits"""
+    address = address.lower()
+    if address.startswith('0x'):
+        address = address[2:]
+    return '0x' + address.rjust(64, '0')
+
+
+def payout_position(cycle: int, start_cycle: int, participants_count: int) -> Optional[int]:
+    """
+    Position paid out in the given cycle, mirroring the contract's
+    get_next_payout_recipient view function (None before payouts start)
+    """
+    if participants_count <= 0 or cycle <= start_cycle:
+        return None
+    return _cycle_position(cycle, start_cycle, participants_count)
+
+
+def _cycle_position(cycle: int, start_cycle: int, participants_count: int) -> int:
+    next_payout_cycle = cycle - start_cycle + 1
+    return (next_payout_cycle - 1) % participants_count + 1
+
+
+def paid_positions(start_cycle: int, participants_count: int, total_cycles_completed: int) -> Set[int]:
+    """
+    Positions already paid out, assuming one payout per cycle from the first
+    cycle the contract pays in (cycles start at 1 and contribute pays once
+    current_cycle >= start_cycle). Uses payout_position's formula, so with
+    start_cycle=0 the first payout goes to position 2, not 1.
+    """
+    if participants_count <= 0:
+        return set()
+    first = max(1, start_cycle)
+    payouts = min(total_cycles_completed, participants_count)
+    return {
+        _cycle_position(cycle, start_cycle, participants_count)
+        for cycle in range(first, first + payouts)
+    }
+
+
+@dataclass(slots=True)
 class ParticipantInfo:
     """Participant information"""
     address: str
@@ -38,6 +96,17 @@ class ParticipantInfo:
     has_received_payout: bool = False
 
 
+@dataclass
+class PendingPayout:
+    """Payout proposed for the current cycle and awaiting multisig approval"""
+    recipient: str
+    amount: int
+    cycle: int
+    signatures: List[str] = field(default_factory=list)
+    executed: bool = False
+    created_at: int = 0
+
+
 @dataclass
 class SavingsGroupInfo:
     """Savings group information"""
@@ -52,6 +121,163 @@ class SavingsGroupInfo:
     start_cycle: int
     created_at: int
     cycle_start_time: int
+    total_cycles_completed: int = 0
+    multisig_signers: List[str] = field(default_factory=list)
+    multisig_threshold: int = 0
+    pending_payout: Optional[PendingPayout] = None
+    version: int = 0  # Object version the state was read at
+    _by_address: Dict[str, ParticipantInfo] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_position: Dict[int, ParticipantInfo] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.index_participants()
+    
+    def index_participants(self):
+        """Rebuild the address and position lookups after participants change"""
+        self._by_address = {p.address: p for p in self.participants}
+        self._by_position = {p.position: p for p in self.participants}
+    
+    def get_participant(self, address: str) -> Optional[ParticipantInfo]:
+        """Participant with the given wallet address, if any"""
+        return self._by_address.get(normalize_address(address))
+    
+    def get_participant_at(self, position: int) -> Optional[ParticipantInfo]:
+        """Participant with the given payout position, if any"""
+        return self._by_position.get(position)
+    
+    def has_contributed(self, address: str) -> bool:
+        """Whether the address has contributed in the current cycle"""
+        participant = self.get_participant(address)
+        return participant is not None and participant.has_contributed
+    
+    @property
+    def contributors(self) -> List[ParticipantInfo]:
+        """Participants who have contributed in the current cycle"""
+        return [p for p in self.participants if p.has_contributed]
+    
+    @property
+    def pending_contributors(self) -> List[ParticipantInfo]:
+        """Participants who have not contributed in the current cycle"""
+        return [p for p in self.participants if not p.has_contributed]
+    
+    @property
+    def next_recipient(self) -> Optional[ParticipantInfo]:
+        """
+        Next participant to be paid, mirroring the contract's
+        get_next_payout_recipient view function
+        """
+        if not self.is_active:
+            return None
+        position = payout_position(self.current_cycle, self.start_cycle, len(self.participants))
+        return self._by_position.get(position)
+    
+    @property
+    def signatures_needed(self) -> int:
+        """Signatures still required before the pending payout executes"""
+        if self.pending_payout is None:
+            return 0
+        return max(0, self.multisig_threshold - len(self.pending_payout.signatures))
+
+
+class ContributionStatus(Enum):
+    """Outcome of one participant's contribution in a cycle run"""
+    CONTRIBUTED = "contributed"
+    ALREADY_CONTRIBUTED = "already_contributed"
+    RETRYABLE = "retryable"  # Transient failure that survived every retry
+    FATAL = "fatal"
+
+
+@dataclass
+class ContributionOutcome:
+    """Result of collecting a contribution from one participant"""
+    alias: str
+    status: ContributionStatus
+    attempts: int = 0
+    duration: float = 0.0
+    digest: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchedContribution:
+    """One contribute call packed into a programmable transaction block"""
+    group_id: str
+    amount: int
+    status: ContributionStatus = ContributionStatus.FATAL
+    digest: Optional[str] = None
+    command_index: Optional[int] = None
+    cycle: Optional[int] = None
+    gas_used: Optional[int] = None  # Share of the transaction's net gas cost
+    error: Optional[str] = None
+
+
+@dataclass
+class PayoutReport:
+    """Result of driving a payout through propose, sign and execute"""
+    group_id: str
+    cycle: int
+    recipient: str
+    amount: int
+    threshold: int
+    signers: List[str] = field(default_factory=list)  # Aliases whose signatures landed
+    failed_signers: Dict[str, str] = field(default_factory=dict)  # Alias -> error
+    executed: bool = False
+    digest: Optional[str] = None  # Transaction that executed the payout
+    duration: float = 0.0
+
+
+@dataclass
+class CycleRunReport:
+    """Structured report of a SavingsGroupManager.run_full_cycle run"""
+    group_id: str
+    cycle: int
+    outcomes: List[ContributionOutcome] = field(default_factory=list)
+    contributions_duration: float = 0.0
+    payout_processed: bool = False
+    payout: Optional[PayoutReport] = None
+    new_cycle_started: bool = False
+    
+    def by_status(self, status: ContributionStatus) -> List[ContributionOutcome]:
+        return [o for o in self.outcomes if o.status == status]
+    
+    @property
+    def failed(self) -> List[ContributionOutcome]:
+        """Outcomes that did not end with a contribution on chain"""
+        return [
+            o for o in self.outcomes
+            if o.status in (ContributionStatus.RETRYABLE, ContributionStatus.FATAL)
+        ]
+    
+    @property
+    def all_contributed(self) -> bool:
+        return not self.failed
+
+
+@dataclass(frozen=True)
+class SignedTransaction:
+    """A built and signed transaction that has not necessarily been executed"""
+    tx_bytes: str  # Base64 BCS TransactionData
+    signatures: Tuple[str, ...]  # Base64 serialized signatures
+    
+    @property
+    def digest(self) -> str:
+        """Transaction digest: Blake2b-256 of the intent-prefixed data, in base58"""
+        data = b'TransactionData::' + base64.b64decode(self.tx_bytes)
+        return base58.b58encode(hashlib.blake2b(data, digest_size=32).digest()).decode()
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {'tx_bytes': self.tx_bytes, 'signatures': list(self.signatures)}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SignedTransaction':
+        return cls(data['tx_bytes'], tuple(data['signatures']))
+
+
+# Awaited with each transaction after it is signed and before it is sent.
+# Set per task so concurrent operations on one SDK each get their own hook.
+before_execute: ContextVar[Optional[Callable[[SignedTransaction], Awaitable[None]]]] = ContextVar(
+    'before_execute', default=None
+)
 
 
 class SavingsGroupError(Exception):
@@ -66,22 +292,44 @@ class ContractError(SavingsGroupError):
         self.error_code = error_code
 
 
+class TransactionError(SavingsGroupError):
+    """Transaction could not be submitted or did not execute (RPC, network or object conflicts)"""
+    pass
+
+
 class SavingsGroupSDK:
     """High-level SDK for interacting with the savings group smart contract"""
     
-    # Error codes from the smart contract
+    # Error codes from the smart contract (abort codes in codeforge.move)
     ERROR_CODES = {
-        0: "E_INVALID_PARTICIPANT_COUNT",
-        1: "E_INVALID_POSITION", 
-        2: "E_DUPLICATE_POSITION",
-        3: "E_INVALID_CYCLE_DURATION",
-        4: "E_INSUFFICIENT_FUNDS",
-        5: "E_NOT_PARTICIPANT",
-        6: "E_ALREADY_CONTRIBUTED",
-        7: "E_NOT_CONTRIBUTION_TIME",
-        8: "E_NOT_PAYOUT_TIME",
-        9: "E_CYCLE_NOT_STARTED",
-        10: "E_PAYOUT_ALREADY_PROCESSED"
+        1: "E_INVALID_PARTICIPANT_COUNT",
+        2: "E_INVALID_POSITION",
+        3: "E_INSUFFICIENT_FUNDS",
+        4: "E_NOT_CONTRIBUTION_TIME",
+        5: "E_NOT_PAYOUT_TIME",
+        6: "E_CYCLE_NOT_STARTED",
+        7: "E_ALREADY_CONTRIBUTED",
+        8: "E_DUPLICATE_POSITION",
+        9: "E_INVALID_CYCLE_DURATION",
+        10: "E_INVALID_THRESHOLD",
+        11: "E_NOT_AUTHORIZED_SIGNER",
+        12: "E_ALREADY_SIGNED",
+        13: "E_PAYOUT_NOT_READY",
+        14: "E_INSUFFICIENT_SIGNATURES",
+        15: "E_PAYOUT_ALREADY_EXECUTED"
+    }
+    E_ALREADY_CONTRIBUTED = 7
+    E_ALREADY_SIGNED = 12
+    E_PAYOUT_NOT_READY = 13
+    
+    # Budgets used when a dry run cannot be performed; per call for batched functions
+    FALLBACK_GAS_BUDGETS = {
+        "create_savings_group": 10000000,
+        "contribute": 5000000,
+        "propose_payout": 5000000,
+        "sign_payout": 5000000,
+        "execute_payout": 5000000,
+        "start_new_cycle": 3000000,
     }
     
     def __init__(
@@ -89,37 +337,57 @@ class SavingsGroupSDK:
         package_id: str,
         config: Optional[SuiConfig] = None,
         keystore_path: Optional[str] = None,
-        use_async: bool = False
+        use_async: bool = False,
+        gas_pool_size: int = DEFAULT_GAS_POOL_SIZE,
+        state_cache=None
     ):
         """
         Initialize the SDK
         
         Args:
             package_id: The published package ID of the smart contract
-            config: SuiConfig object (if None, uses default testnet config)
+            config: SuiConfig object (if None, uses the shared client pool)
             keystore_path: Path to keystore file
             use_async: Whether to use async client
+            gas_pool_size: Gas coins reserved per signer (0 lets pysui pick gas per transaction)
+            state_cache: Read-through cache for group state and balances (see ajo/chain_cache.py)
         """
         self.package_id = package_id
         self.use_async = use_async
         
-        # Initialize config
+        # Without an explicit config, clients come from the process-wide pool
+        self._pool = None
+        self._client = None
         if config is None:
-            self.config = SuiConfig.default_config()
+            self._pool = get_client_pool()
+            self.config = self._pool.config
         else:
             self.config = config
+            if use_async:
+                self._client = AsyncClient(self.config)
+            else:
+                self._client = SyncClient(self.config)
         
-        # Initialize client
-        if use_async:
-            self.client = AsyncClient(self.config)
-        else:
-            self.client = SyncClient(self.config)
+        self.gas_estimator = get_gas_estimator()
+        self.state_cache = state_cache
+        
+        # Concurrent transactions from one signer each lease their own gas coin
+        self.gas = GasCoinManager(self, pool_size=gas_pool_size) if gas_pool_size > 0 else None
         
         # Load keystore if provided
         self.keypairs = {}
         if keystore_path:
             self.load_keystore(keystore_path)
     
+    @property
+    def client(self) -> Union[SyncClient, AsyncClient]:
+        """RPC client for this SDK (pooled clients are resolved per event loop)"""
+        if self._client is not None:
+            return self._client
+        if self.use_async:
+            return self._pool.async_client()
+        return self._pool.sync_client()
+    
     def load_keystore(self, keystore_path: str):
         """Load keypairs from keystore file"""
         try:
@@ -127,7 +395,7 @@ class SavingsGroupSDK:
                 keystore_data = json.load(f)
             
             for alias, key_data in keystore_data.items():
-                keypair = keypair_from_keystore(key_data)
+                keypair = keypair_from_keystring(key_data)
                 self.keypairs[alias] = keypair
                 logger.info(f"Loaded keypair for alias: {alias}")
         except Exception as e:
@@ -145,58 +413,166 @@ class SavingsGroupSDK:
             raise SavingsGroupError(f"Keypair not found for alias: {alias}")
         return str(self.keypairs[alias].public_key.sui_address())
     
+    def _new_transaction(self, keypair: KeyPair) -> Union[SuiTransaction, SuiTransactionAsync]:
+        """Create a transaction builder matching the client mode"""
+        if self.use_async:
+            return SuiTransactionAsync(client=self.client, initial_sender=keypair)
+        return SuiTransaction(client=self.client, initial_sender=keypair)
+    
+    def _target(self, function: str) -> str:
+        return f"{self.package_id}::codeforge::{function}"
+    
+    async def _execute(
+        self,
+        txn: Union[SuiTransaction, SuiTransactionAsync],
+        signer_alias: str,
+        gas_budget: Optional[int],
+        function: str,
+        size: int = 1,
+        spend: int = 0
+    ):
+        """
+        Execute a transaction, paying gas from a leased coin when the gas pool is enabled
+        
+        Args:
+            txn: Built transaction
+            signer_alias: Alias of the signing keypair
+            gas_budget: Gas budget for the transaction (None to estimate it)
+            function: codeforge function the transaction calls, used as the estimate key
+            size: Argument size bucket for the estimate (participants or batched calls)
+            spend: Amount the transaction splits from the gas coin (in MIST)
+        """
+        if gas_budget is None:
+            gas_budget = await self.gas_estimator.estimate(
+                txn, self._target(function), size,
+                fallback=self.FALLBACK_GAS_BUDGETS.get(function, 10000000) * max(size, 1)
+            )
+        if self.gas is None:
+            return await self._sign_and_execute(txn, gas_budget)
+        try:
+            async with self.gas.lease(signer_alias, gas_budget + spend) as coin_id:
+                return await self._sign_and_execute(txn, gas_budget, coin_id)
+        except GasPoolError as e:
+            raise TransactionError(str(e))
+    
+    async def _sign_and_execute(self, txn, gas_budget: int, gas_object: Optional[str] = None):
+        """
+        Sign a built transaction, hand it to the before_execute hook, then send it
+        
+        What txn.execute does, split so the signed bytes and digest can be
+        recorded before anything reaches the chain.
+        """
+        tx_bytes = await maybe_await(txn.deferred_execution(gas_budget=gas_budget, use_gas_object=gas_object))
+        signatures = txn.signer_block.get_signatures(client=self.client, tx_bytes=tx_bytes)
+        signed = SignedTransaction(tx_bytes, tuple(str(sig) for sig in signatures.array))
+        hook = before_execute.get()
+        if hook is not None:
+            await hook(signed)
+        return await self.execute_signed(signed)
+    
+    async def execute_signed(self, signed: SignedTransaction):
+        """
+        Send a signed transaction and wait for local execution
+        
+        Sending the same bytes again is safe: a transaction executes at most
+        once, and a repeat either returns its effects or fails as a conflict.
+        """
+        builder = ExecuteTransaction(
+            tx_bytes=SuiTxBytes(signed.tx_bytes),
+            signatures=SuiArray([SuiSignature(sig) for sig in signed.signatures]),
+            request_type=SuiRequestType.WAITFORLOCALEXECUTION,
+        )
+        result = await maybe_await(self.client.execute(builder))
+        self._invalidate_cached_state(result)
+        return result
+    
+    async def settle_signed(self, signed: SignedTransaction):
+        """
+        Outcome of a signed transaction that may or may not have been executed
+        
+        Looks the digest up on chain and sends the same bytes again only if it
+        is not there, so the transaction runs at most once.
+        
+        Raises:
+            ContractError: The transaction aborted on chain
+            TransactionError: It could not be found or sent
+        """
+        response = (await self.get_transactions([signed.digest])).get(signed.digest)
+        if response is not None:
+            result = SuiRpcResult(True, '', response)
+        else:
+            logger.info(f"Transaction {signed.digest} not found on chain, sending it again")
+            result = await self.execute_signed(signed)
+        return self._handle_transaction_result(result)
+    
+    def _invalidate_cached_state(self, result):
+        """
+        Drop cached state for every object and balance a transaction touched
+        
+        Failed transactions still bump the versions of their mutable inputs,
+        so this runs whatever the execution status.
+        """
+        tx_response = getattr(result, 'result_data', None)
+        if self.state_cache is None or tx_response is None:
+            return
+        effects = getattr(tx_response, 'effects', None)
+        versions = {}
+        for ref in (getattr(effects, 'mutated', None) or []):
+            versions[normalize_address(ref.reference.object_id)] = ref.reference.version
+        for ref in (getattr(effects, 'shared_objects', None) or []):
+            object_id = normalize_address(ref.object_id)
+            versions.setdefault(object_id, ref.version + 1)
+        if versions:
+            self.state_cache.invalidate(versions)
+        
+        owners = set()
+        for change in (getattr(tx_response, 'balance_changes', None) or []):
+            owner = change.get('owner')
+            if isinstance(owner, dict) and 'AddressOwner' in owner:
+                owners.add(normalize_address(owner['AddressOwner']))
+        if owners:
+            self.state_cache.invalidate_balances(owners)
+    
+    @staticmethod
+    def _parse_abort_code(error_msg: str) -> Optional[int]:
+        """Extract the Move abort code from an execution error message"""
+        match = re.search(r'MoveAbort\(.*,\s*(\d+)\)', error_msg)
+        if match:
+            return int(match.group(1))
+        if 'abort_code' in error_msg:
+            try:
+                # Extract abort code number
+                parts = error_msg.split('abort_code')
+                if len(parts) > 1:
+                    code_part = parts[1].strip(' :=').split()[0]
+                    return int(code_part)
+            except:
+                pass
+        return None
+    
     def _handle_transaction_result(self, result):
         """Handle transaction result and check for errors"""
+        if hasattr(result, 'is_ok') and not result.is_ok():
+            raise TransactionError(f"Transaction failed: {result.result_string}")
         if hasattr(result, 'result_data') and result.result_data:
             if hasattr(result.result_data, 'effects'):
                 effects = result.result_data.effects
                 if effects and hasattr(effects, 'status'):
-                    if effects.status.get('status') == 'failure':
-                        error_msg = effects.status.get('error', 'Unknown error')
+                    status = effects.status
+                    if isinstance(status, dict):
+                        state, error_msg = status.get('status'), status.get('error')
+                    else:
+                        state, error_msg = status.status, status.error
+                    if state == 'failure':
+                        error_msg = error_msg or 'Unknown error'
                         # Try to extract error code from abort message
-                        error_code = None
-                        if 'abort_code' in error_msg:
-                            try:
-                                # Extract abort code number
-                                parts = error_msg.split('abort_code')
-                                if len(parts) > 1:
-                                    code_part = parts[1].strip().split()[0]
-                                    error_code = int(code_part)
-                            except:
-                                pass
-                        
+                        error_code = self._parse_abort_code(error_msg)
                         error_name = self.ERROR_CODES.get(error_code, f"Unknown error (code: {error_code})")
                         raise ContractError(f"{error_name}: {error_msg}", error_code)
         return result
     
-    async def create_savings_group(
-        self,
-        signer_alias: str,
-        name: str,
-        cycle_duration_days: int,
-        start_cycle: int,
-        contribution_amount: int,
-        participants: List[str],
-        positions: List[int],
-        gas_budget: int = 10000000
-    ) -> Dict[str, Any]:
-        """
-        Create a new savings group
-        
-        Args:
-            signer_alias: Alias of the keypair to sign the transaction
-            name: Name of the savings group
-            cycle_duration_days: Duration of each cycle in days
-            start_cycle: Which cycle to start payouts (0 = immediately)
-            contribution_amount: Amount each participant must contribute per cycle (in MIST)
-            participants: List of participant addresses
-            positions: List of payout positions for each participant
-            gas_budget: Gas budget for the transaction
-        
-        Returns:
-            Transaction result
-        """
-        # Validation
+    @staticmethod
+    def _validate_group_layout(participants: List[str], positions: List[int]):
         if len(participants) != len(positions):
             raise ValueError("Participants and positions lists must have the same length")
         
@@ -208,25 +584,45 @@ class SavingsGroupSDK:
         
         if len(set(positions)) != len(positions):
             raise ValueError("Duplicate positions not allowed")
+    
+    async def _build_create_savings_group(
+        self,
+        signer_alias: str,
+        name: str,
+        cycle_duration_days: int,
+        start_cycle: int,
+        contribution_amount: int,
+        participants: List[str],
+        positions: List[int],
+        multisig_signers: Optional[List[str]] = None,
+        multisig_threshold: Optional[int] = None
+    ) -> Union[SuiTransaction, SuiTransactionAsync]:
+        self._validate_group_layout(participants, positions)
         
         if signer_alias not in self.keypairs:
             raise SavingsGroupError(f"Keypair not found for alias: {signer_alias}")
         
         keypair = self.keypairs[signer_alias]
         
+        # The creator approves payouts alone unless signers are given; a
+        # signer set defaults to a simple majority threshold
+        if not multisig_signers:
+            multisig_signers = [self.get_address(signer_alias)]
+        if multisig_threshold is None:
+            multisig_threshold = len(multisig_signers) // 2 + 1
+        if not 0 < multisig_threshold <= len(multisig_signers):
+            raise ValueError("Multisig threshold must be between 1 and the number of signers")
+        
         # Create transaction
-        if self.use_async:
-            txn = SuiTransactionAsync(client=self.client, initial_sender=keypair)
-        else:
-            txn = SuiTransaction(client=self.client, initial_sender=keypair)
+        txn = self._new_transaction(keypair)
         
         # Convert participants to SuiAddress objects
         sui_participants = [SuiAddress(addr) for addr in participants]
         sui_positions = [SuiU8(pos) for pos in positions]
         
         # Build move call
-        txn.move_call(
-            target=f"{self.package_id}::codeforge::create_savings_group",
+        await maybe_await(txn.move_call(
+            target=self._target("create_savings_group"),
             arguments=[
                 SuiString(name),
                 SuiU64(cycle_duration_days),
@@ -234,26 +630,84 @@ class SavingsGroupSDK:
                 SuiU64(contribution_amount),
                 sui_participants,
                 sui_positions,
+                [SuiAddress(addr) for addr in multisig_signers],
+                SuiU64(multisig_threshold),
                 ObjectID("0x6")  # Clock object
             ]
+        ))
+        return txn
+    
+    async def estimate_create_savings_group(self, signer_alias: str, **group) -> int:
+        """
+        Gas budget for create_savings_group with the same arguments
+        
+        Raises if the dry run fails, so callers can reject a group before submitting it.
+        """
+        txn = await self._build_create_savings_group(signer_alias, **group)
+        return await self.gas_estimator.estimate(
+            txn, self._target("create_savings_group"), len(group['participants'])
+        )
+    
+    async def create_savings_group(
+        self,
+        signer_alias: str,
+        name: str,
+        cycle_duration_days: int,
+        start_cycle: int,
+        contribution_amount: int,
+        participants: List[str],
+        positions: List[int],
+        multisig_signers: Optional[List[str]] = None,
+        multisig_threshold: Optional[int] = None,
+        gas_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a new savings group
+        
+        Args:
+            signer_alias: Alias of the keypair to sign the transaction
+            name: Name of the savings group
+            cycle_duration_days: Duration of each cycle in days
+            start_cycle: Which cycle to start payouts (0 = immediately)
+            contribution_amount: Amount each participant must contribute per cycle (in MIST)
+            participants: List of participant addresses
+            positions: List of payout positions for each participant
+            multisig_signers: Addresses allowed to approve payouts (defaults to the signer)
+            multisig_threshold: Approvals needed to release a payout (defaults to a majority)
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
+        
+        Returns:
+            Transaction result
+        """
+        txn = await self._build_create_savings_group(
+            signer_alias, name, cycle_duration_days, start_cycle,
+            contribution_amount, participants, positions,
+            multisig_signers, multisig_threshold
         )
         
         # Execute transaction
         logger.info(f"Creating savings group '{name}' with {len(participants)} participants")
         
-        if self.use_async:
-            result = await txn.execute(gas_budget=gas_budget)
-        else:
-            result = txn.execute(gas_budget=gas_budget)
+        result = await self._execute(
+            txn, signer_alias, gas_budget, "create_savings_group", size=len(participants)
+        )
         
         return self._handle_transaction_result(result)
     
+    @staticmethod
+    def created_group_id(result) -> Optional[str]:
+        """Object ID of the SavingsGroup created by a create_savings_group result"""
+        for change in getattr(getattr(result, 'result_data', None), 'object_changes', None) or []:
+            if change.get('type') == 'created' and change.get('objectType', '').endswith('::codeforge::SavingsGroup'):
+                return change.get('objectId')
+        return None
+    
     async def contribute(
         self,
         signer_alias: str,
         group_id: str,
         payment_amount: int,
-        gas_budget: int = 5000000
+        gas_budget: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Make a contribution to the savings group
@@ -262,7 +716,7 @@ class SavingsGroupSDK:
             signer_alias: Alias of the keypair to sign the transaction
             group_id: ID of the savings group object
             payment_amount: Amount to contribute (in MIST)
-            gas_budget: Gas budget for the transaction
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
         
         Returns:
             Transaction result
@@ -273,89 +727,399 @@ class SavingsGroupSDK:
         keypair = self.keypairs[signer_alias]
         
         # Create transaction
-        if self.use_async:
-            txn = SuiTransactionAsync(client=self.client, initial_sender=keypair)
-        else:
-            txn = SuiTransaction(client=self.client, initial_sender=keypair)
+        txn = self._new_transaction(keypair)
         
         # Get coins for payment
-        payment_coin = txn.split_coin(
+        payment_coin = await maybe_await(txn.split_coin(
             coin=txn.gas,
             amounts=[payment_amount]
-        )
+        ))
         
         # Build move call
-        txn.move_call(
-            target=f"{self.package_id}::codeforge::contribute",
+        await maybe_await(txn.move_call(
+            target=self._target("contribute"),
             arguments=[
                 ObjectID(group_id),
                 payment_coin,
                 ObjectID("0x6")  # Clock object
             ]
-        )
+        ))
         
         # Execute transaction
         logger.info(f"Making contribution of {payment_amount} MIST to group {group_id}")
         
-        if self.use_async:
-            result = await txn.execute(gas_budget=gas_budget)
-        else:
-            result = txn.execute(gas_budget=gas_budget)
+        result = await self._execute(txn, signer_alias, gas_budget, "contribute", spend=payment_amount)
         
         return self._handle_transaction_result(result)
     
-    async def process_payout(
+    def _batch_size(self) -> int:
+        """Contributions that fit in one programmable transaction block"""
+        constraints = self.client.protocol.transaction_constraints
+        # One split_coin with an amount per call, then one move call each;
+        # every move call also counts against the input object limit
+        return max(1, min(
+            constraints.max_programmable_tx_commands - 1,
+            constraints.max_arguments,
+            (constraints.max_input_objects - 1) // 2
+        ))
+    
+    @staticmethod
+    def _parse_failed_command(error_msg: str) -> Optional[int]:
+        """Extract the index of the failing command from an execution error message"""
+        match = re.search(r'in command (\d+)', error_msg or '')
+        return int(match.group(1)) if match else None
+    
+    async def _execute_contribution_batch(
+        self,
+        signer_alias: str,
+        calls: List[BatchedContribution],
+        gas_budget: Optional[int]
+    ):
+        """Build and execute one PTB contributing to every group in calls"""
+        txn = self._new_transaction(self.keypairs[signer_alias])
+        
+        # A single split produces one payment coin per call
+        coins = await maybe_await(txn.split_coin(coin=txn.gas, amounts=[call.amount for call in calls]))
+        if not isinstance(coins, list):
+            coins = [coins]
+        
+        for index, (call, coin) in enumerate(zip(calls, coins), start=1):
+            call.command_index = index
+            await maybe_await(txn.move_call(
+                target=self._target("contribute"),
+                arguments=[
+                    ObjectID(call.group_id),
+                    coin,
+                    ObjectID("0x6")  # Clock object
+                ]
+            ))
+        
+        return await self._execute(
+            txn, signer_alias, gas_budget, "contribute",
+            size=len(calls), spend=sum(call.amount for call in calls)
+        )
+    
+    async def contribute_many(
+        self,
+        signer_alias: str,
+        contributions: List[Tuple[str, int]],
+        gas_budget_per_call: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> List[BatchedContribution]:
+        """
+        Contribute to several groups from one signer in as few transactions as possible
+        
+        The contract records the transaction sender as the contributor, so each
+        group may appear only once. Calls are packed into programmable
+        transaction blocks up to the protocol limits; larger batches are split
+        into several blocks. A call that aborts because the signer already
+        contributed is dropped and the rest of its block is resubmitted.
+        
+        Args:
+            signer_alias: Alias of the keypair paying every contribution
+            contributions: (group_id, payment_amount in MIST) pairs
+            gas_budget_per_call: Gas budget per contribute call (estimated by dry run if None)
+            batch_size: Maximum calls per transaction (defaults to the protocol limit)
+        
+        Returns:
+            One BatchedContribution per input pair, in input order
+        """
+        if signer_alias not in self.keypairs:
+            raise SavingsGroupError(f"Keypair not found for alias: {signer_alias}")
+        
+        group_ids = [normalize_address(group_id) for group_id, _ in contributions]
+        if len(set(group_ids)) != len(group_ids):
+            raise SavingsGroupError("A signer can contribute to each group only once per transaction")
+        
+        calls = [
+            BatchedContribution(group_id=group_id, amount=amount)
+            for (group_id, amount) in contributions
+        ]
+        size = min(batch_size or self._batch_size(), self._batch_size())
+        
+        for start in range(0, len(calls), size):
+            pending = calls[start:start + size]
+            while pending:
+                logger.info(f"Contributing to {len(pending)} groups in one transaction")
+                result = await self._execute_contribution_batch(
+                    signer_alias, pending, gas_budget_per_call * len(pending) if gas_budget_per_call else None
+                )
+                try:
+                    self._handle_transaction_result(result)
+                except ContractError as e:
+                    failed_index = self._parse_failed_command(str(e))
+                    failed = next((c for c in pending if c.command_index == failed_index), None)
+                    if failed is None:
+                        for call in pending:
+                            call.status, call.error = ContributionStatus.FATAL, str(e)
+                        break
+                    failed.status = (
+                        ContributionStatus.ALREADY_CONTRIBUTED
+                        if e.error_code == self.E_ALREADY_CONTRIBUTED
+                        else ContributionStatus.FATAL
+                    )
+                    failed.error = str(e)
+                    # Every other call was rolled back with the block; retry them without the culprit
+                    pending = [c for c in pending if c is not failed]
+                    continue
+                except TransactionError as e:
+                    for call in pending:
+                        call.status, call.error = ContributionStatus.RETRYABLE, str(e)
+                    break
+                
+                self._record_batch_effects(result.result_data, pending)
+                pending = []
+        
+        return calls
+    
+    @staticmethod
+    def _record_batch_effects(tx_response, calls: List[BatchedContribution]):
+        """Attribute a successful block's ContributionMade events and gas to its calls"""
+        by_group = {normalize_address(call.group_id): call for call in calls}
+        for event in tx_response.events or []:
+            if not event.event_type.endswith('::codeforge::ContributionMade'):
+                continue
+            call = by_group.get(normalize_address(event.parsed_json.get('group_id', '')))
+            if call is not None:
+                call.cycle = int(event.parsed_json['cycle'])
+        
+        gas = getattr(getattr(tx_response, 'effects', None), 'gas_used', None)
+        share = gas.total_after_rebate // len(calls) if gas is not None else None
+        for call in calls:
+            call.status = ContributionStatus.CONTRIBUTED
+            call.digest = tx_response.digest
+            call.gas_used = share
+            call.error = None
+    
+    async def _call_group_function(
+        self,
+        signer_alias: str,
+        group_id: str,
+        function: str,
+        with_clock: bool,
+        gas_budget: Optional[int]
+    ):
+        """Execute a codeforge entry function that takes only the group (and the clock)"""
+        if signer_alias not in self.keypairs:
+            raise SavingsGroupError(f"Keypair not found for alias: {signer_alias}")
+        
+        txn = self._new_transaction(self.keypairs[signer_alias])
+        arguments = [ObjectID(group_id)]
+        if with_clock:
+            arguments.append(ObjectID("0x6"))  # Clock object
+        await maybe_await(txn.move_call(target=self._target(function), arguments=arguments))
+        
+        result = await self._execute(txn, signer_alias, gas_budget, function)
+        return self._handle_transaction_result(result)
+    
+    @staticmethod
+    def _has_event(result, name: str) -> bool:
+        """Whether a transaction result emitted the given codeforge event"""
+        events = getattr(getattr(result, 'result_data', None), 'events', None) or []
+        return any(event.event_type.endswith(f'::codeforge::{name}') for event in events)
+    
+    async def propose_payout(
         self,
         signer_alias: str,
         group_id: str,
-        gas_budget: int = 5000000
+        gas_budget: Optional[int] = None
     ) -> Dict[str, Any]:
         """
-        Process payout for the current cycle
+        Propose the payout for the current cycle
+        
+        The contract only records a proposal once the cycle has elapsed and
+        every participant has contributed; otherwise the call is a no-op.
         
         Args:
             signer_alias: Alias of the keypair to sign the transaction
             group_id: ID of the savings group object
-            gas_budget: Gas budget for the transaction
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
         
         Returns:
             Transaction result
         """
-        if signer_alias not in self.keypairs:
-            raise SavingsGroupError(f"Keypair not found for alias: {signer_alias}")
+        logger.info(f"Proposing payout for group {group_id}")
+        return await self._call_group_function(signer_alias, group_id, "propose_payout", True, gas_budget)
+    
+    async def sign_payout(
+        self,
+        signer_alias: str,
+        group_id: str,
+        gas_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Approve the pending payout as one of the group's multisig signers
         
-        keypair = self.keypairs[signer_alias]
+        The contract executes the payout in the same transaction when this
+        signature reaches the threshold.
         
-        # Create transaction
-        if self.use_async:
-            txn = SuiTransactionAsync(client=self.client, initial_sender=keypair)
-        else:
-            txn = SuiTransaction(client=self.client, initial_sender=keypair)
+        Args:
+            signer_alias: Alias of a keypair listed in the group's multisig signers
+            group_id: ID of the savings group object
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
         
-        # Build move call
-        txn.move_call(
-            target=f"{self.package_id}::codeforge::process_payout",
-            arguments=[
-                ObjectID(group_id),
-                ObjectID("0x6")  # Clock object
-            ]
-        )
+        Returns:
+            Transaction result
+        """
+        logger.info(f"Signing payout for group {group_id} as {signer_alias}")
+        return await self._call_group_function(signer_alias, group_id, "sign_payout", False, gas_budget)
+    
+    async def execute_payout(
+        self,
+        signer_alias: str,
+        group_id: str,
+        gas_budget: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a pending payout that already has enough signatures
         
-        # Execute transaction
-        logger.info(f"Processing payout for group {group_id}")
+        Args:
+            signer_alias: Alias of the keypair to sign the transaction
+            group_id: ID of the savings group object
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
         
-        if self.use_async:
-            result = await txn.execute(gas_budget=gas_budget)
-        else:
-            result = txn.execute(gas_budget=gas_budget)
+        Returns:
+            Transaction result
+        """
+        logger.info(f"Executing payout for group {group_id}")
+        return await self._call_group_function(signer_alias, group_id, "execute_payout", False, gas_budget)
+    
+    async def collect_payout_signatures(
+        self,
+        group_id: str,
+        signer_aliases: List[str],
+        needed: int,
+        report: PayoutReport
+    ) -> PayoutReport:
+        """
+        Sign the pending payout concurrently until the threshold is met
         
-        return self._handle_transaction_result(result)
+        Exactly `needed` signers are started at once; each failure starts the
+        next available signer, so latency is bounded by the slowest of the
+        signers that actually respond rather than by signing in sequence.
+        """
+        queue = list(signer_aliases)
+        running: Dict[asyncio.Task, str] = {}
+        
+        def launch():
+            alias = queue.pop(0)
+            running[asyncio.ensure_future(self.sign_payout(alias, group_id))] = alias
+        
+        for _ in range(min(needed, len(queue))):
+            launch()
+        
+        settled = False
+        while running and not report.executed and not settled:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                alias = running.pop(task)
+                try:
+                    result = task.result()
+                except ContractError as e:
+                    if e.error_code == self.E_ALREADY_SIGNED:
+                        report.signers.append(alias)
+                        continue
+                    if e.error_code == self.E_PAYOUT_NOT_READY:
+                        # Another transaction already executed the payout
+                        settled = True
+                        continue
+                    report.failed_signers[alias] = str(e)
+                except Exception as e:
+                    report.failed_signers[alias] = str(e)
+                else:
+                    report.signers.append(alias)
+                    if self._has_event(result, 'PayoutExecuted'):
+                        report.executed = True
+                        report.digest = getattr(result.result_data, 'digest', None)
+                    continue
+                
+                if queue:
+                    launch()
+        
+        for task in running:
+            task.cancel()
+        return report
+    
+    async def process_payout(
+        self,
+        admin_alias: str,
+        group_id: str,
+        signer_aliases: Optional[List[str]] = None
+    ) -> PayoutReport:
+        """
+        Propose, approve and execute the payout for the current cycle
+        
+        Args:
+            admin_alias: Alias that proposes the payout (and executes it if needed)
+            group_id: ID of the savings group object
+            signer_aliases: Loaded aliases allowed to sign (defaults to every
+                loaded keypair that is one of the group's multisig signers)
+        
+        Returns:
+            PayoutReport describing who signed and whether the payout executed
+        """
+        started = time.monotonic()
+        info = await self.get_group_info(group_id)
+        if info.pending_payout is None:
+            await self.propose_payout(admin_alias, group_id)
+            info = await self.get_group_info(group_id)
+            if info.pending_payout is None:
+                raise SavingsGroupError(
+                    "No payout is due: the cycle has not ended, a participant has not contributed "
+                    "or payouts have not started"
+                )
+        
+        pending = info.pending_payout
+        report = PayoutReport(
+            group_id=group_id,
+            cycle=pending.cycle,
+            recipient=pending.recipient,
+            amount=pending.amount,
+            threshold=info.multisig_threshold
+        )
+        
+        needed = info.signatures_needed
+        if needed:
+            signed = set(pending.signatures)
+            candidates = [
+                alias for alias in (signer_aliases or list(self.keypairs))
+                if alias in self.keypairs
+                and normalize_address(self.get_address(alias)) in info.multisig_signers
+                and normalize_address(self.get_address(alias)) not in signed
+            ]
+            if len(candidates) < needed:
+                raise SavingsGroupError(
+                    f"Payout needs {needed} more signatures but only {len(candidates)} signers are available"
+                )
+            await self.collect_payout_signatures(group_id, candidates, needed, report)
+        
+        if not report.executed:
+            info = await self.get_group_info(group_id)
+            pending = info.pending_payout
+            if pending is None or pending.cycle != report.cycle:
+                report.executed = True
+            elif info.signatures_needed == 0:
+                result = await self.execute_payout(admin_alias, group_id)
+                report.executed = True
+                report.digest = getattr(result.result_data, 'digest', None)
+        
+        report.duration = time.monotonic() - started
+        if not report.executed:
+            error = SavingsGroupError(
+                f"Payout not executed: {len(report.failed_signers)} signers failed "
+                f"({', '.join(report.failed_signers)})"
+            )
+            error.report = report
+            raise error
+        
+        logger.info(f"Payout of {report.amount} MIST for cycle {report.cycle} executed")
+        return report
     
     async def start_new_cycle(
         self,
         signer_alias: str,
         group_id: str,
-        gas_budget: int = 3000000
+        gas_budget: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Start a new cycle for the savings group
@@ -363,7 +1127,7 @@ class SavingsGroupSDK:
         Args:
             signer_alias: Alias of the keypair to sign the transaction
             group_id: ID of the savings group object
-            gas_budget: Gas budget for the transaction
+            gas_budget: Gas budget for the transaction (estimated by dry run if None)
         
         Returns:
             Transaction result
@@ -374,30 +1138,111 @@ class SavingsGroupSDK:
         keypair = self.keypairs[signer_alias]
         
         # Create transaction
-        if self.use_async:
-            txn = SuiTransactionAsync(client=self.client, initial_sender=keypair)
-        else:
-            txn = SuiTransaction(client=self.client, initial_sender=keypair)
+        txn = self._new_transaction(keypair)
         
         # Build move call
-        txn.move_call(
-            target=f"{self.package_id}::codeforge::start_new_cycle",
+        await maybe_await(txn.move_call(
+            target=self._target("start_new_cycle"),
             arguments=[
                 ObjectID(group_id),
                 ObjectID("0x6")  # Clock object
             ]
-        )
+        ))
         
         # Execute transaction
         logger.info(f"Starting new cycle for group {group_id}")
         
-        if self.use_async:
-            result = await txn.execute(gas_budget=gas_budget)
-        else:
-            result = txn.execute(gas_budget=gas_budget)
+        result = await self._execute(txn, signer_alias, gas_budget, "start_new_cycle")
         
         return self._handle_transaction_result(result)
     
+    @staticmethod
+    def _parse_participants(
+        participants_data: List[Any],
+        total_cycles_completed: int = 0,
+        start_cycle: int = 1
+    ) -> List[ParticipantInfo]:
+        """
+        Decode the Move `vector<Participant>` field
+        
+        Each entry is rendered by the fullnode as
+        {"type": "...::codeforge::Participant", "fields": {"wallet", "position",
+        "has_contributed_current_cycle"}}. Whether a participant has been paid
+        is derived from the positions of the first total_cycles_completed
+        payouts (see paid_positions); only with start_cycle=1 is that the same
+        as position <= total_cycles_completed.
+        """
+        paid = paid_positions(start_cycle, len(participants_data), total_cycles_completed)
+        participants = []
+        append = participants.append
+        for entry in participants_data:
+            data = entry.get('fields', entry)
+            position = int(data['position'])
+            append(ParticipantInfo(
+                normalize_address(data['wallet']),
+                position,
+                bool(data.get('has_contributed_current_cycle', False)),
+                position in paid
+            ))
+        return participants
+    
+    def _parse_group_object(self, group_id: str, obj_data) -> SavingsGroupInfo:
+        """Build a SavingsGroupInfo from an ObjectRead result"""
+        content = obj_data.content
+        
+        if not content or not hasattr(content, 'fields'):
+            raise SavingsGroupError("Invalid object data format")
+        
+        fields = content.fields
+        total_cycles_completed = int(fields.get('total_cycles_completed', 0))
+        multisig = self._struct_fields(fields.get('multisig_config')) or {}
+        pending = self._struct_fields(fields.get('pending_payout'))
+        
+        # Extract group information
+        return SavingsGroupInfo(
+            object_id=group_id,
+            name=fields.get('name', ''),
+            cycle_duration_days=int(fields.get('cycle_duration_days', 0)),
+            contribution_amount=int(fields.get('contribution_amount', 0)),
+            current_cycle=int(fields.get('current_cycle', 0)),
+            current_balance=int(fields.get('savings_balance', fields.get('current_savings_balance', 0))),
+            is_active=bool(fields.get('is_active', False)),
+            participants=self._parse_participants(
+                fields.get('participants') or [],
+                total_cycles_completed,
+                int(fields.get('start_cycle', 0))
+            ),
+            start_cycle=int(fields.get('start_cycle', 0)),
+            created_at=int(fields.get('created_at', 0)),
+            cycle_start_time=int(fields.get('cycle_start_time', 0)),
+            total_cycles_completed=total_cycles_completed,
+            multisig_signers=[normalize_address(a) for a in multisig.get('signers', [])],
+            multisig_threshold=int(multisig.get('threshold', 0)),
+            pending_payout=PendingPayout(
+                recipient=normalize_address(pending['recipient']),
+                amount=int(pending['amount']),
+                cycle=int(pending['cycle']),
+                signatures=[normalize_address(a) for a in pending.get('signatures', [])],
+                executed=bool(pending.get('executed', False)),
+                created_at=int(pending.get('created_at', 0))
+            ) if pending else None,
+            version=int(getattr(obj_data, 'version', 0) or 0)
+        )
+    
+    @staticmethod
+    def _struct_fields(value) -> Optional[Dict[str, Any]]:
+        """
+        Fields of a Move struct value as rendered by the fullnode
+        
+        Unwraps {"type", "fields"} wrappers and Option values, which appear
+        either as null / the inner value or as {"vec": [...]}.
+        """
+        if isinstance(value, dict) and 'fields' in value:
+            value = value['fields']
+        if isinstance(value, dict) and 'vec' in value:
+            return SavingsGroupSDK._struct_fields(value['vec'][0]) if value['vec'] else None
+        return value or None
+    
     async def get_group_info(self, group_id: str) -> SavingsGroupInfo:
         """
         Get information about a savings group
@@ -408,6 +1253,11 @@ class SavingsGroupSDK:
         Returns:
             SavingsGroupInfo object with group details
         """
+        if self.state_cache is not None:
+            cached = self.state_cache.get(group_id)
+            if cached is not None:
+                return cached
+        
         # Get object data
         if self.use_async:
             result = await self.client.get_object(ObjectID(group_id))
@@ -417,37 +1267,164 @@ class SavingsGroupSDK:
         if not result.result_data:
             raise SavingsGroupError(f"Group not found: {group_id}")
         
-        # Parse object data
-        obj_data = result.result_data
-        content = obj_data.content
+        info = self._parse_group_object(group_id, result.result_data)
+        if self.state_cache is not None:
+            self.state_cache.set_many([info])
+        return info
+    
+    async def get_groups_info(
+        self,
+        group_ids: List[str],
+        chunk_size: Optional[int] = None,
+        ignore_missing: bool = False
+    ) -> List[Optional[SavingsGroupInfo]]:
+        """
+        Get information about many savings groups with sui_multiGetObjects
         
-        if not content or not hasattr(content, 'fields'):
-            raise SavingsGroupError("Invalid object data format")
+        IDs are fetched in chunks of at most the RPC multi-get limit. With the
+        async client all chunks are requested concurrently.
         
-        fields = content.fields
+        Args:
+            group_ids: IDs of the savings group objects
+            chunk_size: Objects per RPC call (defaults to the client's max_gets)
+            ignore_missing: Return None for groups that do not exist instead of raising
         
-        # Extract group information
-        group_info = SavingsGroupInfo(
-            object_id=group_id,
-            name=fields.get('name', ''),
-            cycle_duration_days=int(fields.get('cycle_duration_days', 0)),
-            contribution_amount=int(fields.get('contribution_amount', 0)),
-            current_cycle=int(fields.get('current_cycle', 0)),
-            current_balance=int(fields.get('current_savings_balance', 0)),
-            is_active=bool(fields.get('is_active', False)),
-            participants=[],  # Will be populated from participants map
-            start_cycle=int(fields.get('start_cycle', 0)),
-            created_at=int(fields.get('created_at', 0)),
-            cycle_start_time=int(fields.get('cycle_start_time', 0))
+        Returns:
+            SavingsGroupInfo objects in the same order as group_ids
+        """
+        if not group_ids:
+            return []
+        
+        unique_ids = list(dict.fromkeys(group_ids))
+        by_id: Dict[str, SavingsGroupInfo] = {}
+        if self.state_cache is not None:
+            by_id.update(self.state_cache.get_many(unique_ids))
+        to_fetch = [gid for gid in unique_ids if gid not in by_id]
+        
+        chunk_size = min(chunk_size or self.client.max_gets, self.client.max_gets)
+        chunks = [
+            to_fetch[i:i + chunk_size]
+            for i in range(0, len(to_fetch), chunk_size)
+        ]
+        
+        def builder_for(chunk):
+            return GetMultipleObjects(object_ids=[ObjectID(gid) for gid in chunk])
+        
+        logger.info(f"Fetching {len(to_fetch)} of {len(unique_ids)} groups in {len(chunks)} RPC calls")
+        
+        if self.use_async:
+            results = await asyncio.gather(
+                *(self.client.execute(builder_for(chunk)) for chunk in chunks)
+            )
+        else:
+            results = [self.client.execute(builder_for(chunk)) for chunk in chunks]
+        
+        fetched = []
+        for chunk, result in zip(chunks, results):
+            if not result.is_ok():
+                raise SavingsGroupError(f"Failed to fetch groups: {result.result_string}")
+            # multiGetObjects returns one entry per requested ID, in request order
+            for group_id, obj_data in zip(chunk, result.result_data):
+                if isinstance(obj_data, ObjectRead):
+                    fetched.append(self._parse_group_object(group_id, obj_data))
+        if self.state_cache is not None and fetched:
+            self.state_cache.set_many(fetched)
+        by_id.update((info.object_id, info) for info in fetched)
+        
+        missing = [gid for gid in unique_ids if gid not in by_id]
+        if missing and not ignore_missing:
+            raise SavingsGroupError(f"Groups not found: {', '.join(missing)}")
+        
+        return [by_id.get(gid) for gid in group_ids]
+    
+    async def query_events(
+        self,
+        cursor: Optional[Dict[str, str]] = None,
+        limit: int = 50
+    ) -> Tuple[List[Any], Optional[Dict[str, str]], bool]:
+        """
+        Page through events emitted by the codeforge module, oldest first
+        
+        Args:
+            cursor: {"txDigest", "eventSeq"} of the last event already seen
+            limit: Maximum events to return
+        
+        Returns:
+            (events, next_cursor, has_next_page)
+        """
+        builder = QueryEvents(
+            query=MoveModuleEventQuery(module="codeforge", package=self.package_id),
+            cursor=EventID(cursor['eventSeq'], cursor['txDigest']) if cursor else None,
+            limit=min(limit, self.client.max_gets),
+            descending_order=False
         )
         
-        # Parse participants if available
-        if 'participants' in fields:
-            participants_data = fields['participants']
-            # This would need to be parsed based on the actual structure
-            # of the participants field in your smart contract
+        if self.use_async:
+            result = await self.client.execute(builder)
+        else:
+            result = self.client.execute(builder)
+        
+        if not result.is_ok():
+            raise SavingsGroupError(f"Failed to query events: {result.result_string}")
+        
+        page = result.result_data
+        next_cursor = page.next_cursor
+        if isinstance(next_cursor, EventID):
+            next_cursor = next_cursor.map
+        if next_cursor:
+            next_cursor = {'txDigest': next_cursor['txDigest'], 'eventSeq': str(next_cursor['eventSeq'])}
+        
+        return page.data, next_cursor, page.has_next_page
+    
+    async def get_transactions(self, digests: List[str]) -> Dict[str, Any]:
+        """
+        Fetch executed transactions with their effects and events
+        
+        Digests are fetched up to the RPC page size per call. A fullnode may
+        reject a whole batch because one digest is unknown, so a batch that
+        fails with "not found" is split in half until the unknown digests are
+        isolated. Any other failure (timeouts, fullnode errors) raises, so an
+        outage is never mistaken for missing transactions.
+        
+        Args:
+            digests: Transaction digests to look up
+        
+        Returns:
+            Digest -> TxResponse for every transaction found on chain
         
-        return group_info
+        Raises:
+            TransactionError: The lookup itself failed
+        """
+        digests = list(dict.fromkeys(digests))
+        chunk_size = self.client.max_gets
+        chunks = [digests[i:i + chunk_size] for i in range(0, len(digests), chunk_size)]
+        options = {'showInput': True, 'showEffects': True, 'showEvents': True, 'showObjectChanges': True}
+        
+        async def fetch(chunk):
+            builder = GetMultipleTx(digests=[SuiString(d) for d in chunk], options=options)
+            result = await maybe_await(self.client.execute(builder))
+            if result.is_ok():
+                return {tx.digest: tx for tx in result.result_data.transactions if tx.effects}
+            if not self._is_not_found(result.result_string):
+                raise TransactionError(f"Transaction lookup failed: {result.result_string}")
+            if len(chunk) == 1:
+                logger.debug(f"Transaction {chunk[0]} not found: {result.result_string}")
+                return {}
+            middle = len(chunk) // 2
+            found = await fetch(chunk[:middle])
+            found.update(await fetch(chunk[middle:]))
+            return found
+        
+        found = {}
+        for chunk in chunks:
+            found.update(await fetch(chunk))
+        return found
+    
+    @staticmethod
+    def _is_not_found(error) -> bool:
+        """Whether an RPC error means a requested transaction does not exist"""
+        message = error.get('message', '') if isinstance(error, dict) else str(error)
+        return 'could not find' in message.lower()
     
     async def get_balance(self, address: str) -> int:
         """
@@ -459,14 +1436,20 @@ class SavingsGroupSDK:
         Returns:
             Balance in MIST
         """
+        if self.state_cache is not None:
+            cached = self.state_cache.get_balance(address)
+            if cached is not None:
+                return cached
+        
         if self.use_async:
             result = await self.client.get_balance(SuiAddress(address))
         else:
             result = self.client.get_balance(SuiAddress(address))
         
-        if result.result_data:
-            return int(result.result_data.total_balance)
-        return 0
+        balance = int(result.result_data.total_balance) if result.result_data else 0
+        if self.state_cache is not None:
+            self.state_cache.set_balance(address, balance)
+        return balance
     
     def mist_to_sui(self, mist: int) -> float:
         """Convert MIST to SUI (1 SUI = 1e9 MIST)"""
@@ -491,7 +1474,9 @@ class SavingsGroupManager:
         start_cycle: int,
         contribution_amount_sui: float,
         participants: List[str],
-        positions: List[int]
+        positions: List[int],
+        multisig_signers: Optional[List[str]] = None,
+        multisig_threshold: Optional[int] = None
     ) -> str:
         """
         Create a savings group with comprehensive validation
@@ -506,36 +1491,125 @@ class SavingsGroupManager:
         admin_address = self.sdk.get_address(admin_alias)
         admin_balance = await self.sdk.get_balance(admin_address)
         
-        estimated_gas = self.sdk.sui_to_mist(0.01)  # Estimate 0.01 SUI for gas
-        if admin_balance < estimated_gas:
-            raise SavingsGroupError(f"Insufficient balance for gas fees. Need at least 0.01 SUI")
-        
-        # Create the group
-        result = await self.sdk.create_savings_group(
-            signer_alias=admin_alias,
+        group = dict(
             name=name,
             cycle_duration_days=cycle_duration_days,
             start_cycle=start_cycle,
             contribution_amount=contribution_amount,
             participants=participants,
-            positions=positions
+            positions=positions,
+            multisig_signers=multisig_signers,
+            multisig_threshold=multisig_threshold
+        )
+        
+        # Dry-run (or reuse the cached cost of) a group of this size
+        try:
+            estimated_gas = await self.sdk.estimate_create_savings_group(admin_alias, **group)
+        except GasPoolError as e:
+            raise SavingsGroupError(f"Group creation would fail: {e}")
+        if admin_balance < estimated_gas:
+            raise SavingsGroupError(
+                f"Insufficient balance for gas fees. Need at least {self.sdk.mist_to_sui(estimated_gas)} SUI"
+            )
+        
+        # Create the group
+        result = await self.sdk.create_savings_group(
+            signer_alias=admin_alias,
+            gas_budget=estimated_gas,
+            **group
         )
         
         # Extract created object ID from result
-        if hasattr(result, 'result_data') and result.result_data:
-            if hasattr(result.result_data, 'object_changes'):
-                for change in result.result_data.object_changes:
-                    if change.get('type') == 'created':
-                        return change.get('object_id')
+        group_id = self.sdk.created_group_id(result)
+        if group_id is None:
+            raise SavingsGroupError("Failed to extract group ID from creation result")
+        return group_id
+    
+    @staticmethod
+    def classify_error(error: Exception) -> ContributionStatus:
+        """Classify a contribution failure as already-contributed, retryable or fatal"""
+        if isinstance(error, ContractError):
+            if error.error_code == SavingsGroupSDK.E_ALREADY_CONTRIBUTED:
+                return ContributionStatus.ALREADY_CONTRIBUTED
+            return ContributionStatus.FATAL
+        if isinstance(error, (TransactionError, httpx.TransportError, asyncio.TimeoutError, ConnectionError)):
+            return ContributionStatus.RETRYABLE
+        return ContributionStatus.FATAL
+    
+    async def collect_contributions(
+        self,
+        group_id: str,
+        participant_aliases: List[str],
+        contribution_amount: int,
+        concurrency: int = 1,
+        max_retries: int = 2,
+        retry_delay: float = 1.0
+    ) -> List[ContributionOutcome]:
+        """
+        Collect contributions from participants, up to `concurrency` at a time
         
-        raise SavingsGroupError("Failed to extract group ID from creation result")
+        Transactions from the same signer alias are never in flight together,
+        so they cannot race on that signer's gas coins.
+        
+        Args:
+            group_id: Savings group ID
+            participant_aliases: Participant keypair aliases
+            contribution_amount: Amount each participant pays (in MIST)
+            concurrency: Maximum transactions in flight
+            max_retries: Extra attempts for retryable failures
+            retry_delay: Base delay between retries in seconds (doubles each attempt)
+        
+        Returns:
+            One ContributionOutcome per alias, in input order
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        signer_locks: Dict[str, asyncio.Lock] = {}
+        
+        async def contribute_one(alias: str) -> ContributionOutcome:
+            outcome = ContributionOutcome(alias=alias, status=ContributionStatus.FATAL)
+            lock = signer_locks.setdefault(alias, asyncio.Lock())
+            started = time.monotonic()
+            async with lock:
+                for attempt in range(max_retries + 1):
+                    outcome.attempts = attempt + 1
+                    try:
+                        async with semaphore:
+                            result = await self.sdk.contribute(
+                                signer_alias=alias,
+                                group_id=group_id,
+                                payment_amount=contribution_amount
+                            )
+                        outcome.status = ContributionStatus.CONTRIBUTED
+                        outcome.digest = getattr(getattr(result, 'result_data', None), 'digest', None)
+                        outcome.error = None
+                        break
+                    except Exception as e:
+                        outcome.status = self.classify_error(e)
+                        outcome.error = str(e)
+                        if outcome.status != ContributionStatus.RETRYABLE or attempt == max_retries:
+                            break
+                        await asyncio.sleep(retry_delay * (2 ** attempt))
+            outcome.duration = time.monotonic() - started
+            
+            if outcome.status == ContributionStatus.CONTRIBUTED:
+                logger.info(f"✓ Contribution successful from {alias}")
+            elif outcome.status == ContributionStatus.ALREADY_CONTRIBUTED:
+                logger.info(f"✓ {alias} already contributed this cycle")
+            else:
+                logger.error(f"✗ Contribution failed from {alias} ({outcome.status.value}): {outcome.error}")
+            return outcome
+        
+        return list(await asyncio.gather(*(contribute_one(alias) for alias in participant_aliases)))
     
     async def run_full_cycle(
         self,
         admin_alias: str,
         group_id: str,
-        participant_aliases: List[str]
-    ):
+        participant_aliases: List[str],
+        concurrency: int = 1,
+        max_retries: int = 2,
+        signer_aliases: Optional[List[str]] = None
+    ) -> CycleRunReport:
         """
         Run a complete cycle: collect contributions and process payout
         
@@ -543,6 +1617,12 @@ class SavingsGroupManager:
             admin_alias: Admin keypair alias
             group_id: Savings group ID
             participant_aliases: List of participant keypair aliases
+            concurrency: Maximum contribution transactions in flight
+            max_retries: Extra attempts for retryable contribution failures
+            signer_aliases: Multisig signer aliases used to approve the payout
+        
+        Returns:
+            CycleRunReport describing every contribution and the payout
         """
         # Get group info
         group_info = await self.sdk.get_group_info(group_id)
@@ -551,23 +1631,26 @@ class SavingsGroupManager:
             raise SavingsGroupError("Group is not active")
         
         logger.info(f"Running cycle {group_info.current_cycle} for group {group_id}")
+        report = CycleRunReport(group_id=group_id, cycle=group_info.current_cycle)
         
         # Collect contributions from all participants
-        for alias in participant_aliases:
-            try:
-                logger.info(f"Collecting contribution from {alias}")
-                await self.sdk.contribute(
-                    signer_alias=alias,
-                    group_id=group_id,
-                    payment_amount=group_info.contribution_amount
-                )
-                logger.info(f"✓ Contribution successful from {alias}")
-            except ContractError as e:
-                if e.error_code == 6:  # E_ALREADY_CONTRIBUTED
-                    logger.info(f"✓ {alias} already contributed this cycle")
-                else:
-                    logger.error(f"✗ Contribution failed from {alias}: {e}")
-                    raise
+        started = time.monotonic()
+        report.outcomes = await self.collect_contributions(
+            group_id=group_id,
+            participant_aliases=participant_aliases,
+            contribution_amount=group_info.contribution_amount,
+            concurrency=concurrency,
+            max_retries=max_retries
+        )
+        report.contributions_duration = time.monotonic() - started
+        
+        if report.failed:
+            error = SavingsGroupError(
+                f"{len(report.failed)} contributions failed: "
+                + ", ".join(o.alias for o in report.failed)
+            )
+            error.report = report
+            raise error
         
         # Wait for cycle duration (in a real scenario)
         logger.info("Waiting for cycle to complete...")
@@ -575,10 +1658,12 @@ class SavingsGroupManager:
         
         # Process payout
         logger.info("Processing payout...")
-        await self.sdk.process_payout(
-            signer_alias=admin_alias,
-            group_id=group_id
+        report.payout = await self.sdk.process_payout(
+            admin_alias=admin_alias,
+            group_id=group_id,
+            signer_aliases=signer_aliases
         )
+        report.payout_processed = True
         logger.info("✓ Payout processed")
         
         # Start new cycle if group is still active
@@ -589,9 +1674,12 @@ class SavingsGroupManager:
                 signer_alias=admin_alias,
                 group_id=group_id
             )
+            report.new_cycle_started = True
             logger.info("✓ New cycle started")
         else:
             logger.info("Group has completed all cycles")
+        
+        return report
 
 
 # Example usage
@@ -634,7 +1722,9 @@ async def example_usage():
             start_cycle=0,
             contribution_amount_sui=1.0,  # 1 SUI per cycle
             participants=participants,
-            positions=positions
+            positions=positions,
+            multisig_signers=participants,
+            multisig_threshold=2  # Any two participants release a payout
         )
         
         print(f"Created savings group: {group_id}")
@@ -0,0 +1,57 @@
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.conf import settings
+
+
+logger = get_task_logger(__name__)
+
+
+@shared_task
+def index_chain_events(max_pages=None):
+    from ajo.indexer import EventIndexer
+
+    if not settings.SUI_PACKAGE_ID:
+        logger.debug('SUI_PACKAGE_ID is not set, skipping event indexing')
+        return 0
+
+    return EventIndexer().run(max_pages=max_pages or settings.SUI_INDEXER_MAX_PAGES)
+
+
+@shared_task(
+    bind=True,
+    acks_late=True,
+    max_retries=settings.SUI_CHAIN_MAX_RETRIES,
+    rate_limit=settings.SUI_CHAIN_RATE_LIMIT,
+)
+def submit_chain_transaction(self, operation, signer_alias, kwargs, idempotency_key):
+    from ajo import chain_queue
+
+    return chain_queue.submit(self, operation, signer_alias, kwargs, idempotency_key)
+
+
+@shared_task
+def check_chain_transactions(limit=None):
+    from ajo.transactions import TransactionChecker
+
+    return TransactionChecker().run(limit=limit)
+
+
+@shared_task(ignore_result=True)
+def fan_out_group_notification(event, group_id, actor_id):
+    from ajo.notifications import fan_out
+
+    return fan_out(event, group_id, actor_id)
+
+
+@shared_task(ignore_result=True)
+def deliver_group_notifications(event, actor_id, recipient_ids, params):
+    from ajo.notifications import deliver
+
+    return deliver(event, actor_id, recipient_ids, params)
+
+
+@shared_task(ignore_result=True)
+def send_notification_digest(user_id):
+    from ajo.notifications import send_digest
+
+    return send_digest(user_id)
@@ -0,0 +1,129 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from ajo.chain_cache import GroupStateCache
+from ajo.models import SavingsGroup
+from ajo.sui_tools import SavingsGroupInfo, SavingsGroupSDK
+from main.models import User
+
+
+GROUP = '0x' + 'a' * 64
+OWNER = '0x' + 'b' * 64
+
+
+def make_info(version, balance=0):
+    return SavingsGroupInfo(
+        object_id=GROUP, name='g', cycle_duration_days=7, contribution_amount=10,
+        current_cycle=1, current_balance=balance, is_active=True, participants=[],
+        start_cycle=0, created_at=0, cycle_start_time=0, version=version
+    )
+
+
+class FakeObjectClient:
+    """get_object / get_balance returning a fixed version and counting calls"""
+
+    def __init__(self):
+        self.version = 5
+        self.object_reads = 0
+        self.balance_reads = 0
+
+    def get_object(self, object_id):
+        self.object_reads += 1
+        return SimpleNamespace(result_data=object())
+
+    def get_balance(self, address):
+        self.balance_reads += 1
+        return SimpleNamespace(result_data=SimpleNamespace(total_balance='42'))
+
+
+class CachedSDK(SavingsGroupSDK):
+
+    def __init__(self, state_cache):
+        self.use_async = False
+        self.state_cache = state_cache
+        self._client = FakeObjectClient()
+
+    def _parse_group_object(self, group_id, obj_data):
+        return make_info(self._client.version)
+
+
+def new_cache():
+    return GroupStateCache(cache=LocMemCache('chain-cache-tests', {}), ttl=60, version_ttl=60)
+
+
+class GroupStateCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.state_cache = new_cache()
+        self.state_cache.cache.clear()
+        self.sdk = CachedSDK(self.state_cache)
+
+    def test_group_reads_are_served_from_cache(self):
+        asyncio.run(self.sdk.get_group_info(GROUP))
+        info = asyncio.run(self.sdk.get_group_info(GROUP))
+
+        self.assertEqual(info.version, 5)
+        self.assertEqual(self.sdk.client.object_reads, 1)
+
+    def test_own_transaction_invalidates_touched_objects(self):
+        asyncio.run(self.sdk.get_group_info(GROUP))
+        result = SimpleNamespace(result_data=SimpleNamespace(
+            effects=SimpleNamespace(
+                mutated=[SimpleNamespace(reference=SimpleNamespace(object_id=GROUP, version=6))],
+                shared_objects=[]
+            ),
+            balance_changes=[{'owner': {'AddressOwner': OWNER}, 'amount': '-10'}]
+        ))
+        asyncio.run(self.sdk.get_balance(OWNER))
+        self.sdk._invalidate_cached_state(result)
+
+        self.sdk.client.version = 6
+        self.assertEqual(asyncio.run(self.sdk.get_group_info(GROUP)).version, 6)
+        self.assertEqual(self.sdk.client.object_reads, 2)
+        asyncio.run(self.sdk.get_balance(OWNER))
+        self.assertEqual(self.sdk.client.balance_reads, 2)
+
+    def test_stale_read_does_not_overwrite_newer_state(self):
+        self.state_cache.invalidate({GROUP: 6})
+        self.state_cache.set_many([make_info(5)])
+        self.assertIsNone(self.state_cache.get(GROUP))
+
+        self.state_cache.set_many([make_info(6)])
+        self.assertEqual(self.state_cache.get(GROUP).version, 6)
+
+
+class ChainStateEndpointTestCase(TestCase):
+
+    def get_chain_state(self, address_link, sdk=None):
+        user = User.objects.create(email='chain@example.com', confirmed=True)
+        group = SavingsGroup.objects.create(
+            name='Chain Group',
+            cycle_duration_days=7,
+            start_cycle=1,
+            contribution_amount=Decimal('1.0000'),
+            address_link=address_link,
+        )
+        group.participants.add(user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with patch('ajo.views.groups.get_sdk', return_value=sdk):
+            return client.get(reverse('savingsgroup-chain-state', kwargs={'pk': group.pk}))
+
+    def test_chain_state(self):
+        response = self.get_chain_state(GROUP, CachedSDK(new_cache()))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['object_id'], GROUP)
+        self.assertEqual(response.data['version'], 5)
+        self.assertIsNone(response.data['pending_payout'])
+
+    def test_invalid_address(self):
+        response = self.get_chain_state('not-an-address')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
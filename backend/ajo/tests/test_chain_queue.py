@@ -0,0 +1,200 @@
+import asyncio
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ajo.chain_queue import SignerBusy, SignerLock, submit
+from ajo.models import ChainTransaction
+from ajo.sui_tools import ContractError, SignedTransaction, TransactionError, before_execute
+
+
+GROUP = '0x' + 'a' * 64
+
+
+class Retry(Exception):
+    pass
+
+
+class FakeTask:
+    """Enough of a bound Celery task for chain_queue.submit"""
+
+    max_retries = 3
+
+    def __init__(self, task_id='task-1', retries=0):
+        self.request = SimpleNamespace(id=task_id, retries=retries)
+        self.retried_with = None
+
+    def retry(self, exc=None, countdown=None, max_retries=None):
+        self.retried_with = exc
+        return Retry()
+
+
+SIGNED = SignedTransaction('dHgtMQ==', ('c2lnLTE=',))
+
+
+class FakeChainSDK:
+    """errors are raised before signing, sent_errors after the transaction is sent"""
+
+    def __init__(self, errors=(), sent_errors=(), settle_errors=()):
+        self.errors = list(errors)
+        self.sent_errors = list(sent_errors)
+        self.settle_errors = list(settle_errors)
+        self.calls = []
+        self.settled = []
+
+    async def settle_signed(self, signed):
+        self.settled.append(signed)
+        if self.settle_errors:
+            raise self.settle_errors.pop(0)
+        return self.result()
+
+    def get_address(self, alias):
+        return '0x' + 'b' * 64
+
+    async def create_savings_group(self, signer_alias, **kwargs):
+        self.calls.append((signer_alias, kwargs))
+        if self.errors:
+            raise self.errors.pop(0)
+        hook = before_execute.get()
+        if hook is not None:
+            await hook(SIGNED)
+        if self.sent_errors:
+            raise self.sent_errors.pop(0)
+        return self.result()
+
+    def result(self):
+        return SimpleNamespace(result_data=SimpleNamespace(
+            digest=SIGNED.digest,
+            object_changes=[{
+                'type': 'created',
+                'objectType': '0x1::codeforge::SavingsGroup',
+                'objectId': GROUP,
+            }],
+        ))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SubmitTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.kwargs = {'name': 'g', 'participants': [GROUP], 'positions': [1]}
+
+    def test_submits_once_per_idempotency_key(self):
+        sdk = FakeChainSDK()
+        first = submit(FakeTask('task-1'), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        # A second enqueue of the same key returns the recorded result
+        second = submit(FakeTask('task-2'), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertEqual(len(sdk.calls), 1)
+        self.assertEqual(first['status'], ChainTransaction.Status.SUCCESS)
+        self.assertEqual(first['result'], {'digest': SIGNED.digest, 'group_id': GROUP})
+        self.assertEqual(second, first)
+
+        tx = ChainTransaction.objects.get(idempotency_key='key-1')
+        self.assertEqual(tx.digest, SIGNED.digest)
+        self.assertEqual(tx.signed_tx, SIGNED.as_dict())
+        self.assertEqual(tx.group_address, GROUP)
+        self.assertIsNotNone(tx.latency_ms)
+
+    def test_retry_keeps_key_and_resubmits(self):
+        sdk = FakeChainSDK(errors=[TransactionError('rpc unavailable')])
+        task = FakeTask('task-1')
+        with self.assertRaises(Retry):
+            submit(task, 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertIsInstance(task.retried_with, TransactionError)
+
+        # A duplicate enqueued meanwhile does not submit while the key is held
+        duplicate = submit(FakeTask('task-2'), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(duplicate['status'], ChainTransaction.Status.SUBMITTING)
+
+        result = submit(FakeTask('task-1', retries=1), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(result['status'], ChainTransaction.Status.SUCCESS)
+        self.assertEqual(len(sdk.calls), 2)
+
+    def test_error_after_sending_is_settled_by_digest(self):
+        # e.g. a read timeout after the node already received the transaction
+        sdk = FakeChainSDK(sent_errors=[TransactionError('read timeout')])
+        task = FakeTask('task-1')
+        with self.assertRaises(Retry):
+            submit(task, 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertIsInstance(task.retried_with, TransactionError)
+        tx = ChainTransaction.objects.get(idempotency_key='key-1')
+        self.assertEqual(tx.digest, SIGNED.digest)
+
+        result = submit(FakeTask('task-1', retries=1), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(result['status'], ChainTransaction.Status.SUCCESS)
+        self.assertEqual(result['result'], {'digest': SIGNED.digest, 'group_id': GROUP})
+        self.assertEqual(len(sdk.calls), 1)
+        self.assertEqual(sdk.settled, [SIGNED])
+
+    def _signed_row(self, operation='create_savings_group'):
+        # Left by a worker that died after saving the signed transaction
+        return ChainTransaction.objects.create(
+            idempotency_key='key-1', task_id='task-1', operation=operation,
+            signer_alias='admin', status=ChainTransaction.Status.SUBMITTING,
+            digest=SIGNED.digest, signed_tx=SIGNED.as_dict(),
+        )
+
+    def test_redelivery_after_signing_is_settled_by_digest(self):
+        self._signed_row()
+        sdk = FakeChainSDK()
+        result = submit(FakeTask('task-1'), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertEqual(result['status'], ChainTransaction.Status.SUCCESS)
+        self.assertEqual(sdk.calls, [])
+        self.assertEqual(sdk.settled, [SIGNED])
+
+    def test_unsettled_after_retries_is_unknown(self):
+        self._signed_row()
+        sdk = FakeChainSDK(settle_errors=[TransactionError('rpc unavailable')])
+        result = submit(FakeTask('task-1', retries=3), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertEqual(result['status'], ChainTransaction.Status.UNKNOWN)
+        self.assertEqual(sdk.calls, [])
+
+    def test_signed_multi_transaction_operation_is_unknown(self):
+        self._signed_row('contribute_many')
+        sdk = FakeChainSDK()
+        result = submit(FakeTask('task-1'), 'contribute_many', 'admin', {'contributions': []}, 'key-1', sdk=sdk)
+
+        self.assertEqual(result['status'], ChainTransaction.Status.UNKNOWN)
+        self.assertEqual(sdk.settled, [])
+
+    def test_contract_error_is_final(self):
+        sdk = FakeChainSDK(errors=[ContractError('abort', 4)])
+        result = submit(FakeTask(), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertEqual(result['status'], ChainTransaction.Status.FAILURE)
+        submit(FakeTask('task-2'), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(len(sdk.calls), 1)
+
+    def test_interrupted_submission_is_not_retried(self):
+        sdk = FakeChainSDK(errors=[asyncio.TimeoutError()])
+        with self.assertRaises(asyncio.TimeoutError):
+            submit(FakeTask(), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertEqual(ChainTransaction.objects.get(idempotency_key='key-1').status, ChainTransaction.Status.UNKNOWN)
+        submit(FakeTask('task-1', retries=1), 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(len(sdk.calls), 1)
+
+    def test_busy_signer_retries(self):
+        held = SignerLock('admin')
+        asyncio.run(held.__aenter__())
+        sdk = FakeChainSDK()
+        task = FakeTask()
+        with self.settings(SUI_CHAIN_SIGNER_WAIT_SECONDS=0):
+            with self.assertRaises(Retry):
+                submit(task, 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+
+        self.assertIsInstance(task.retried_with, SignerBusy)
+        self.assertEqual(sdk.calls, [])
+
+        asyncio.run(held.__aexit__(None, None, None))
+        result = submit(task, 'create_savings_group', 'admin', self.kwargs, 'key-1', sdk=sdk)
+        self.assertEqual(result['status'], ChainTransaction.Status.SUCCESS)
+
+    def test_rejects_unknown_operation(self):
+        with self.assertRaises(ValueError):
+            submit(FakeTask(), 'transfer_everything', 'admin', {}, 'key-1', sdk=FakeChainSDK())
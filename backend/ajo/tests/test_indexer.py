@@ -0,0 +1,205 @@
+from django.test import TestCase
+from django.urls import reverse
+from decimal import Decimal
+from rest_framework.test import APIClient
+from rest_framework import status
+from pysui.sui.sui_txresults.complex_tx import Event
+from ajo.indexer import EventIndexer
+from ajo.models import ChainEvent, ChainEventCursor, Contribution, CycleSummary, SavingsGroup
+from ajo.sui_tools import normalize_address, ParticipantInfo, SavingsGroupInfo
+from main.models import User
+
+
+GROUP = '0x' + 'a' * 64
+ALICE = '0x' + 'b' * 64
+BOB = '0x' + 'c' * 64
+CAROL = '0x' + 'd' * 64
+
+
+def make_event(tx_digest, seq, event_type, **fields):
+    return Event.from_dict({
+        'bcs': '',
+        'packageId': '0x1',
+        'parsedJson': {'group_id': GROUP, **fields},
+        'sender': ALICE,
+        'transactionModule': 'codeforge',
+        'type': f'0x1::codeforge::{event_type}',
+        'id': {'txDigest': tx_digest, 'eventSeq': str(seq)},
+        'timestampMs': '1700000000000',
+    })
+
+
+class FakeSDK:
+    """Serves a fixed list of events in pages, like suix_queryEvents"""
+
+    def __init__(self, events):
+        self.events = events
+        self.group_fetches = 0
+
+    async def get_groups_info(self, group_ids, ignore_missing=False):
+        self.group_fetches += 1
+        participants = [
+            ParticipantInfo(address, position)
+            for position, address in enumerate([ALICE, BOB, CAROL], start=1)
+        ]
+        return [
+            SavingsGroupInfo(
+                object_id=group_id, name='g', cycle_duration_days=7,
+                contribution_amount=1000, current_cycle=1, current_balance=0,
+                is_active=True, participants=participants, start_cycle=0,
+                created_at=0, cycle_start_time=0
+            )
+            for group_id in group_ids
+        ]
+
+    async def query_events(self, cursor=None, limit=50):
+        start = 0
+        if cursor:
+            ids = [e.event_id for e in self.events]
+            start = ids.index({'txDigest': cursor['txDigest'], 'eventSeq': cursor['eventSeq']}) + 1
+        page = self.events[start:start + limit]
+        next_cursor = page[-1].event_id if page else cursor
+        return page, next_cursor, start + limit < len(self.events)
+
+
+class EventIndexerTestCase(TestCase):
+
+    def setUp(self):
+        self.events = [
+            make_event('tx1', 0, 'GroupCreated', name='g', participants_count='2', multisig_threshold='1'),
+            make_event('tx2', 0, 'ContributionMade', contributor=ALICE, cycle='1', amount='1000'),
+            make_event('tx3', 0, 'PayoutProposed', recipient=ALICE, cycle='1', amount='2000', required_signatures='1'),
+            make_event('tx3', 1, 'PayoutSigned', signer=ALICE, cycle='1', current_signatures='1', required_signatures='1'),
+            make_event('tx3', 2, 'PayoutExecuted', recipient=ALICE, cycle='1', amount='2000', final_signatures='1'),
+        ]
+
+    def test_indexes_all_pages_and_advances_cursor(self):
+        indexer = EventIndexer(sdk=FakeSDK(self.events), page_size=2)
+        indexer.run()
+
+        self.assertEqual(ChainEvent.objects.count(), 5)
+        cursor = ChainEventCursor.objects.get(name='codeforge')
+        self.assertEqual((cursor.tx_digest, cursor.event_seq), ('tx3', '2'))
+
+        contribution = ChainEvent.objects.get(event_type='ContributionMade')
+        self.assertEqual(contribution.group_address, normalize_address(GROUP))
+        self.assertEqual(contribution.actor, ALICE)
+        self.assertEqual(contribution.cycle, 1)
+        self.assertEqual(contribution.amount, Decimal(1000))
+
+    def test_replay_is_idempotent(self):
+        EventIndexer(sdk=FakeSDK(self.events), page_size=2).run()
+        ChainEventCursor.objects.all().delete()
+        EventIndexer(sdk=FakeSDK(self.events), page_size=3).run()
+
+        self.assertEqual(ChainEvent.objects.count(), 5)
+
+    def test_resumes_from_cursor(self):
+        indexer = EventIndexer(sdk=FakeSDK(self.events), page_size=2)
+        indexer.run(max_pages=1)
+        self.assertEqual(ChainEvent.objects.count(), 2)
+
+        indexer.run()
+        self.assertEqual(ChainEvent.objects.count(), 5)
+
+    def test_page_discarded_when_cursor_moves_during_fetch(self):
+        sdk = FakeSDK(self.events)
+        fetch = sdk.query_events
+
+        async def query_events(cursor=None, limit=50):
+            # Another run advances the cursor while this page is in flight
+            await ChainEventCursor.objects.filter(name='codeforge').aupdate(tx_digest='tx2', event_seq='0')
+            return await fetch(cursor=cursor, limit=limit)
+
+        sdk.query_events = query_events
+        written, has_next = EventIndexer(sdk=sdk, page_size=2).index_page()
+
+        self.assertEqual((written, has_next), (0, True))
+        self.assertEqual(ChainEvent.objects.count(), 0)
+        cursor = ChainEventCursor.objects.get(name='codeforge')
+        self.assertEqual((cursor.tx_digest, cursor.event_seq), ('tx2', '0'))
+
+
+class ContributionLedgerTestCase(TestCase):
+
+    def setUp(self):
+        self.events = [
+            make_event('tx1', 0, 'ContributionMade', contributor=ALICE, cycle='1', amount='1000'),
+            make_event('tx2', 0, 'ContributionMade', contributor=BOB, cycle='1', amount='1000'),
+        ]
+        self.sdk = FakeSDK(self.events)
+
+    def test_cycle_summary_aggregates(self):
+        EventIndexer(sdk=self.sdk, page_size=1).run()
+
+        summary = CycleSummary.objects.get(group_address=GROUP, cycle=1)
+        self.assertEqual(summary.contributors, [ALICE, BOB])
+        self.assertEqual(summary.pending_contributors, [CAROL])
+        self.assertEqual(summary.contributions_count, 2)
+        self.assertEqual(summary.total_contributed, Decimal(2000))
+        self.assertEqual(summary.expected_total, Decimal(3000))
+        self.assertEqual(summary.next_recipient_position, 2)
+        self.assertEqual(summary.next_recipient, BOB)
+        # The roster is fetched once and reused for later pages
+        self.assertEqual(self.sdk.group_fetches, 1)
+
+    def test_completed_cycle_opens_the_next_one(self):
+        self.sdk.events += [
+            make_event('tx3', 0, 'PayoutExecuted', recipient=ALICE, cycle='1', amount='2000', final_signatures='1'),
+            make_event('tx3', 1, 'CycleCompleted', cycle='1', next_recipient_position='2'),
+        ]
+        EventIndexer(sdk=self.sdk).run()
+
+        summary = CycleSummary.objects.order_by('-cycle').first()
+        self.assertEqual(summary.cycle, 2)
+        self.assertEqual(summary.contributors, [])
+        self.assertEqual(summary.pending_contributors, [ALICE, BOB, CAROL])
+        self.assertEqual(summary.next_recipient, CAROL)
+        self.assertFalse(summary.payout_executed)
+
+    def test_no_cycle_opened_after_the_last_payout(self):
+        self.sdk.events += [
+            make_event(f'tx{cycle + 2}', seq, event_type, cycle=str(cycle), **fields)
+            for cycle in (1, 2, 3)
+            for seq, (event_type, fields) in enumerate([
+                ('PayoutExecuted', {'recipient': ALICE, 'amount': '3000', 'final_signatures': '1'}),
+                ('CycleCompleted', {'next_recipient_position': '1'}),
+            ])
+        ]
+        EventIndexer(sdk=self.sdk).run()
+
+        self.assertEqual(CycleSummary.objects.order_by('-cycle').first().cycle, 3)
+
+    def test_replay_does_not_double_count(self):
+        EventIndexer(sdk=self.sdk).run()
+        ChainEventCursor.objects.all().delete()
+        EventIndexer(sdk=self.sdk).run()
+
+        self.assertEqual(Contribution.objects.count(), 2)
+        summary = CycleSummary.objects.get(group_address=GROUP, cycle=1)
+        self.assertEqual(summary.total_contributed, Decimal(2000))
+
+    def test_cycle_summary_endpoint(self):
+        EventIndexer(sdk=self.sdk).run()
+
+        user = User.objects.create(email='ledger@example.com', confirmed=True)
+        group = SavingsGroup.objects.create(
+            name='Ledger Group',
+            cycle_duration_days=7,
+            start_cycle=1,
+            contribution_amount=Decimal('1.0000'),
+            address_link=GROUP,
+        )
+        group.participants.add(user)
+
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('savingsgroup-cycle-summary', kwargs={'pk': group.pk})
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cycle'], 1)
+        self.assertEqual(response.data['pending_contributors'], [CAROL])
+
+        response = client.get(url, {'cycle': 2})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,337 @@
+import asyncio
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from ajo.models import MyNotification, SavingsGroup
+from ajo.notification_stream import issue_stream_ticket, publish_notifications, user_channel
+from ajo.notification_templates import TEMPLATES, register, render
+from ajo.notifications import member_id_chunks, metrics, notify_group, send_digest
+from ajo.views.stream import authenticate_stream, event_stream
+from main.models import User
+
+
+class NotificationViewSetTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(email='inbox@example.com', confirmed=True)
+        self.other = User.objects.create(email='other@example.com', confirmed=True)
+        MyNotification.objects.bulk_create(
+            [MyNotification(user=self.user, message=f'n{i}', is_read=i < 5) for i in range(45)]
+            + [MyNotification(user=self.other, message='other')]
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_cursor_pages_cover_inbox_once(self):
+        url = reverse('notification-list')
+        seen = []
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(n['id'] for n in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(seen), 45)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+    def test_page_size_and_filters(self):
+        response = self.client.get(reverse('notification-list'), {'page_size': 3, 'is_read': 'true'})
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertTrue(all(n['is_read'] for n in response.data['results']))
+
+    def test_unread_count(self):
+        response = self.client.get(reverse('notification-unread-count'))
+        self.assertEqual(response.data, {'unread': 40})
+
+    def test_type_filter(self):
+        MyNotification.objects.bulk_create([
+            MyNotification(user=self.user, notification_type=MyNotification.Type.MEMBER_JOINED, message='m1'),
+            MyNotification(user=self.user, notification_type=MyNotification.Type.GROUP_JOINED, message='j1', is_read=True),
+            MyNotification(user=self.user, notification_type=MyNotification.Type.MEMBER_JOINED, message='m2'),
+        ])
+        url = reverse('notification-list')
+
+        response = self.client.get(url, {'type': 'member_joined', 'page_size': 1})
+        self.assertEqual([n['message'] for n in response.data['results']], ['m2'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([n['message'] for n in response.data['results']], ['m1'])
+        self.assertIsNone(response.data['next'])
+
+        response = self.client.get(url, {'type': 'member_joined,group_joined'})
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.get(reverse('notification-unread-count'), {'type': 'member_joined,group_joined'})
+        self.assertEqual(response.data, {'unread': 2})
+
+        response = self.client.get(url, {'type': 'bogus'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_classify_command(self):
+        legacy = MyNotification.objects.bulk_create([
+            MyNotification(user=self.user, message="You have successfully joined the savings group 'A'. Welcome!"),
+            MyNotification(user=self.user, message="Ada has joined the savings group 'A'."),
+            MyNotification(user=self.user, template='group_invitation', params={'group': 'A', 'actor': 'Ada'}),
+        ])
+
+        call_command('classify_notifications', '--batch-size', '7', stdout=StringIO())
+
+        self.assertEqual(
+            [MyNotification.objects.get(pk=n.pk).notification_type for n in legacy],
+            ['group_joined', 'member_joined', 'group_invitation'],
+        )
+        self.assertEqual(
+            MyNotification.objects.filter(notification_type=MyNotification.Type.OTHER).count(), 46
+        )
+
+    def test_mark_read(self):
+        url = reverse('notification-mark-read')
+        ids = list(MyNotification.objects.filter(user=self.user, is_read=False).values_list('id', flat=True)[:2])
+
+        with self.assertNumQueries(1):
+            response = self.client.post(url, {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'updated': 2})
+
+        newest = MyNotification.objects.filter(user=self.user).latest('id')
+        response = self.client.post(url, {'up_to_id': newest.id - 1}, format='json')
+        self.assertEqual(response.data, {'updated': 37})
+
+        response = self.client.post(url, {}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertFalse(MyNotification.objects.filter(user=self.other, is_read=True).exists())
+
+        response = self.client.post(url, {'ids': 'all'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FakePipeline:
+
+    def __init__(self, published):
+        self.published = published
+        self.pending = []
+
+    def publish(self, channel, message):
+        self.pending.append((channel, message))
+
+    def execute(self):
+        self.published.extend(self.pending)
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.published)
+
+
+class FakeHub:
+    """In-process stand-in for the pub/sub hub"""
+
+    def __init__(self):
+        self.queues = {}
+
+    async def subscribe(self, user_id):
+        queue = self.queues[user_id] = asyncio.Queue()
+        return queue
+
+    async def unsubscribe(self, user_id, queue):
+        del self.queues[user_id]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class NotificationStreamTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(email='stream@example.com', confirmed=True)
+        self.old = MyNotification.objects.create(user=self.user, message='before')
+
+    def test_publishes_after_commit(self):
+        client = FakeRedis()
+        notifications = MyNotification.objects.bulk_create(
+            [MyNotification(user=self.user, message='hello')]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            publish_notifications(notifications, client=client)
+            self.assertEqual(client.published, [])
+
+        channel, message = client.published[0]
+        self.assertEqual(channel, user_channel(self.user.id))
+        self.assertEqual(json.loads(message)['message'], 'hello')
+
+    def test_stream_requires_ticket(self):
+        url = reverse('notification-stream')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(url, {'ticket': 'junk'}).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_access_token_is_refused_in_query_string(self):
+        token = str(AccessToken.for_user(self.user))
+        self.assertIsNone(authenticate_stream(RequestFactory().get('/', {'token': token})))
+        self.assertIsNone(authenticate_stream(RequestFactory().get('/', {'ticket': token})))
+
+    def test_ticket_opens_one_stream(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.post(reverse('notification-stream-ticket'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        request = RequestFactory().get('/', {'ticket': response.data['ticket']})
+        self.assertEqual(authenticate_stream(request), self.user)
+        self.assertIsNone(authenticate_stream(request))
+
+    def test_unconfirmed_user_is_refused(self):
+        self.user.confirmed = False
+        self.user.save()
+        request = RequestFactory().get('/', {'ticket': issue_stream_ticket(self.user)})
+        self.assertIsNone(authenticate_stream(request))
+
+        token = str(AccessToken.for_user(self.user))
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertIsNone(authenticate_stream(request))
+
+    def test_replays_missed_then_streams_live(self):
+        hub = FakeHub()
+        missed = MyNotification.objects.create(user=self.user, message='missed')
+        live = {'id': missed.id + 1, 'message': 'live'}
+
+        async def read():
+            stream = event_stream(self.user, last_event_id=self.old.id, hub=hub)
+            frames = [await stream.__anext__() for _ in range(2)]
+            # Published while replaying: already-replayed ids are skipped
+            await hub.queues[self.user.id].put(json.dumps({'id': missed.id, 'message': 'missed'}))
+            await hub.queues[self.user.id].put(json.dumps(live))
+            frames.append(await stream.__anext__())
+            await stream.aclose()
+            return frames
+
+        retry, replayed, pushed = async_to_sync(read)()
+        self.assertTrue(retry.startswith('retry:'))
+        self.assertIn(f'id: {missed.id}\n', replayed)
+        self.assertIn(f'id: {live["id"]}\n', pushed)
+        self.assertEqual(hub.queues, {})
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+@mock.patch('ajo.notifications.publish_notifications')
+class GroupNotificationFanOutTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create(email='creator@example.com', username='creator', confirmed=True)
+        self.members = [
+            User.objects.create(email=f'member{i}@example.com', username=f'member{i}', confirmed=True)
+            for i in range(7)
+        ]
+        self.group = SavingsGroup.objects.create(
+            name='Fan Out', cycle_duration_days=30, start_cycle=1, contribution_amount=Decimal('10.0000'),
+        )
+        self.group.participants.add(self.creator, *self.members)
+        self.client = APIClient()
+
+    def test_member_chunks_cover_group_once(self, publish):
+        chunks = list(member_id_chunks(self.group.id, chunk_size=3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 2])
+        ids = [user_id for chunk in chunks for user_id in chunk]
+        self.assertEqual(ids, sorted(u.id for u in [self.creator] + self.members))
+
+    def _join(self, user):
+        # join_group only finds groups the caller is already in
+        self.group.participants.add(user)
+        notify_group('group_joined', self.group, user)
+
+    def test_join_fans_out_after_commit(self, publish):
+        joiner = User.objects.create(email='joiner@example.com', username='joiner', confirmed=True)
+
+        with self.settings(NOTIFICATION_FANOUT_CHUNK_SIZE=3, NOTIFICATION_BULK_BATCH_SIZE=2):
+            with self.captureOnCommitCallbacks() as callbacks:
+                self._join(joiner)
+            # Nothing is written until the transaction commits
+            self.assertFalse(MyNotification.objects.exists())
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(MyNotification.objects.count(), 9)
+        joined = MyNotification.objects.get(user=joiner)
+        self.assertEqual(joined.template, 'group_joined')
+        self.assertEqual(joined.params, {'group': 'Fan Out', 'actor': 'joiner'})
+        self.assertEqual(joined.message, '')
+        self.assertEqual(joined.render(), "You have successfully joined the savings group 'Fan Out'. Welcome!")
+        self.assertEqual(MyNotification.objects.filter(template='member_joined').count(), 8)
+        self.assertEqual(
+            MyNotification.objects.filter(notification_type=MyNotification.Type.MEMBER_JOINED).count(), 8
+        )
+        self.assertEqual(publish.call_count, 3)
+        self.assertEqual(metrics.snapshot()['delivered'], 9)
+        self.assertEqual(metrics.snapshot()['batches'], 6)
+        self.assertEqual(metrics.snapshot()['fanouts'], 1)
+
+        out = StringIO()
+        call_command('notification_metrics', '--reset', stdout=out)
+        self.assertIn('delivered: 9', out.getvalue())
+        self.assertEqual(metrics.snapshot()['delivered'], 0)
+
+    def test_digest_batches_unread_notifications(self, publish):
+        with self.settings(NOTIFICATION_EMAIL_DIGESTS=1, NOTIFICATION_DIGEST_WINDOW_SECONDS=60):
+            with mock.patch('ajo.tasks.send_notification_digest.apply_async') as apply_async:
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.force_authenticate(user=self.members[0])
+                    self.client.post(reverse('savingsgroup-leave-group', kwargs={'pk': self.group.pk}))
+                    self._join(self.members[0])
+                    self.client.post(reverse('savingsgroup-leave-group', kwargs={'pk': self.group.pk}))
+                    self._join(self.members[0])
+
+        # One digest per member within the window, however many events arrive
+        self.assertEqual(apply_async.call_count, 8)
+        self.assertEqual(MyNotification.objects.filter(user=self.creator).count(), 2)
+
+        with mock.patch('main.tasks.celery_send_email.delay') as send_email:
+            self.assertEqual(send_digest(self.creator.id), 2)
+            self.assertEqual(send_digest(self.creator.id), 0)
+
+        self.assertEqual(send_email.call_count, 1)
+        self.assertEqual(send_email.call_args.kwargs['recipient_list'], [self.creator.email])
+        self.assertIn("member0 has joined", send_email.call_args.kwargs['html_message'])
+        self.assertEqual(metrics.snapshot()['digests'], 1)
+
+
+class NotificationTemplateTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(email='templates@example.com', confirmed=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_renders_templates_and_legacy_messages(self):
+        MyNotification.objects.create(user=self.user, message='Stored text')
+        MyNotification.objects.create(
+            user=self.user, template='member_joined', params={'group': 'Circle', 'actor': 'Ada'}
+        )
+
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(
+            [n['message'] for n in response.data['results']],
+            ["Ada has joined the savings group 'Circle'.", 'Stored text'],
+        )
+
+    def test_render_is_cached_per_params(self):
+        params = {'group': 'Circle', 'actor': 'Ada'}
+        self.assertIs(render('member_joined', params), render('member_joined', dict(params)))
+
+        register('member_joined_test', '{actor} joined {group}')
+        self.addCleanup(TEMPLATES.pop, 'member_joined_test')
+        self.assertEqual(render('member_joined_test', params), 'Ada joined Circle')
+        # Unknown templates and missing params render as empty text instead of failing the list
+        self.assertEqual(render('no_such_template', params), '')
+        self.assertEqual(render('member_joined_test', {'group': 'Circle'}), '')
@@ -7,6 +7,11 @@ from decimal import Decimal
 from ajo.models import SavingsGroup, AjoUser, MyNotification
 import logging
 import json
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
@@ -91,7 +96,8 @@ class SavingsGroupViewSetTestCase(APITestCase):
         self.assertEqual(response.json()['count'], 2)  # user1 is in 2 groups
     
 
-    def test_create_savings_group(self):
+    @mock.patch('ajo.notifications.publish_notifications')
+    def test_create_savings_group(self, publish):
         """
         Test creating a new savings group with notifications and verify notifications endpoint
         """
@@ -119,7 +125,9 @@ class SavingsGroupViewSetTestCase(APITestCase):
         MyNotification.objects.all().delete()
         
         initial_notification_count = MyNotification.objects.count()
-        response = self.client.post(url, data, format='json')
+        # Notifications are fanned out once the request's transaction commits
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, data, format='json')
         
         self._log_response("CREATE SAVINGS GROUP", response)
         
@@ -140,12 +148,12 @@ class SavingsGroupViewSetTestCase(APITestCase):
         # Check notification content
         creator_notification = MyNotification.objects.filter(
             user=self.user1,
-            message__icontains='successfully created'
+            template='group_created'
         ).first()
         self.assertIsNotNone(creator_notification)
         
         invitation_notifications = MyNotification.objects.filter(
-            message__icontains='invited to join'
+            template='group_invitation'
         )
         self.assertEqual(invitation_notifications.count(), 2)
 
@@ -158,10 +166,10 @@ class SavingsGroupViewSetTestCase(APITestCase):
         # Get all notifications for creator
         response = self.client.get(notifications_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # Creator should have 1 notification
+        self.assertEqual(len(response.data['results']), 1)  # Creator should have 1 notification
         
         # Verify notification content
-        creator_notification_data = response.data[0]
+        creator_notification_data = response.data['results'][0]
         self.assertIn('successfully created', creator_notification_data['message'])
         
         
@@ -170,9 +178,9 @@ class SavingsGroupViewSetTestCase(APITestCase):
         self.client.force_authenticate(user=user2)
         response = self.client.get(notifications_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # Participant should have 1 invitation
+        self.assertEqual(len(response.data['results']), 1)  # Participant should have 1 invitation
         
-        participant_notification_data = response.data[0]
+        participant_notification_data = response.data['results'][0]
         self.assertIn('invited to join', participant_notification_data['message'])
         
         
@@ -241,4 +249,157 @@ class SavingsGroupViewSetTestCase(APITestCase):
         self._log_response("USER CAN ONLY SEE THEIR GROUPS - DETAIL", detail_response)
         
         self.assertEqual(detail_response.status_code, status.HTTP_404_NOT_FOUND)
-  
\ No newline at end of file
+  
+
+class ParticipantsCountTestCase(TestCase):
+    """
+    Test cases for the denormalized SavingsGroup.participants_count
+    """
+    
+    def setUp(self):
+        self.users = [User.objects.create(email=f'count{i}@example.com', confirmed=True) for i in range(3)]
+        self.group = SavingsGroup.objects.create(
+            name='Count Group',
+            cycle_duration_days=30,
+            start_cycle=1,
+            contribution_amount=Decimal('10.0000'),
+        )
+    
+    def _count(self):
+        self.group.refresh_from_db()
+        return self.group.participants_count
+    
+    def test_count_follows_membership_changes(self):
+        self.group.participants.add(*self.users)
+        self.assertEqual(self._count(), 3)
+        
+        self.group.participants.remove(self.users[0])
+        self.assertEqual(self._count(), 2)
+        
+        # Changes made from the user side are counted too
+        self.users[0].savings_groups.add(self.group)
+        self.assertEqual(self._count(), 3)
+        self.users[1].savings_groups.clear()
+        self.assertEqual(self._count(), 2)
+        
+        self.group.participants.set([self.users[2]])
+        self.assertEqual(self._count(), 1)
+        self.group.participants.clear()
+        self.assertEqual(self._count(), 0)
+    
+    def test_leave_returns_count(self):
+        self.group.participants.add(*self.users[:2])
+        client = APIClient()
+        client.force_authenticate(user=self.users[0])
+        
+        response = client.post(reverse('savingsgroup-leave-group', kwargs={'pk': self.group.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['participants_count'], 1)
+    
+    def test_list_query_count_does_not_grow_with_page(self):
+        client = APIClient()
+        client.force_authenticate(user=self.users[0])
+        url = reverse('savingsgroup-list')
+        
+        self.group.participants.add(*self.users)
+        with self.assertNumQueries(2):  # page count + page
+            response = client.get(url)
+        self.assertEqual(response.data['results'][0]['participants_count'], 3)
+        
+        for i in range(10):
+            group = SavingsGroup.objects.create(
+                name=f'Group {i}', cycle_duration_days=7, start_cycle=1,
+                contribution_amount=Decimal('1.0000'),
+            )
+            group.participants.add(*self.users)
+        with self.assertNumQueries(2):
+            response = client.get(url)
+        self.assertEqual(response.data['count'], 11)
+    
+    def test_save_of_stale_instance_keeps_count(self):
+        stale = SavingsGroup.objects.get(pk=self.group.pk)
+        self.group.participants.add(*self.users)
+        
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertEqual(self._count(), 3)
+        self.assertEqual(self.group.name, 'Renamed')
+    
+    def test_update_returns_fresh_count(self):
+        from ajo.serializers import SavingsGroupSerializer
+        ajo_users = [AjoUser.objects.create(user=u, wallet_address='0x1') for u in self.users]
+        serializer = SavingsGroupSerializer(
+            self.group, data={'participant_ids': [a.id for a in ajo_users]}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        group = serializer.save()
+        self.assertEqual(group.participants_count, 3)
+    
+    def test_backfill_command(self):
+        self.group.participants.add(*self.users)
+        SavingsGroup.objects.update(participants_count=0)
+        
+        call_command('backfill_participants_count', batch_size=1, stdout=StringIO())
+        self.assertEqual(self._count(), 3)
+
+
+class SavingsGroupQueryCountTestCase(TestCase):
+    """
+    Query counts of the group endpoints must not grow with the number of participants
+    """
+    
+    def setUp(self):
+        self.owner = User.objects.create(email='owner@example.com', confirmed=True)
+        AjoUser.objects.create(user=self.owner, wallet_address='0x1')
+        self.group = SavingsGroup.objects.create(
+            name='Query Group',
+            cycle_duration_days=30,
+            start_cycle=1,
+            contribution_amount=Decimal('10.0000'),
+        )
+        self.group.participants.add(self.owner)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.owner)
+        self.members = 0
+    
+    def _grow(self, count):
+        users = []
+        for _ in range(count):
+            self.members += 1
+            user = User.objects.create(email=f'member{self.members}@example.com', confirmed=True)
+            AjoUser.objects.create(user=user, wallet_address=f'0x{self.members}')
+            users.append(user)
+        self.group.participants.add(*users)
+    
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+    
+    def assertConstantQueries(self, url, grow_by=(2, 10)):
+        """Request url at several group sizes and require the same query count each time"""
+        counts = []
+        for count in grow_by:
+            self._grow(count)
+            queries, response = self._queries(url)
+            counts.append(queries)
+        self.assertEqual(len(set(counts)), 1, f'Query counts grew with participants: {counts}')
+        return response
+    
+    def test_detail(self):
+        response = self.assertConstantQueries(reverse('savingsgroup-detail', kwargs={'pk': self.group.pk}))
+        self.assertEqual(len(response.data['participants']), 13)
+        self.assertEqual(response.data['participants_count'], 13)
+        self.assertIn('email', response.data['participants'][0]['user'])
+    
+    def test_participants_list(self):
+        response = self.assertConstantQueries(
+            reverse('savingsgroup-participants-list', kwargs={'pk': self.group.pk})
+        )
+        self.assertEqual(response.data['total_participants'], 13)
+    
+    def test_list(self):
+        response = self.assertConstantQueries(reverse('savingsgroup-list'))
+        self.assertEqual(response.data['results'][0]['participants_count'], 13)
+
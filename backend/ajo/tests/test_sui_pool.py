@@ -0,0 +1,84 @@
+import asyncio
+import ssl
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from django.test import SimpleTestCase
+
+from ajo import sui_pool
+from ajo.sui_pool import SuiClientPool, init_client_pool
+
+
+class FakeAsyncClient:
+    """Stands in for pysui's AsyncClient, which makes RPC calls when built"""
+
+    def __init__(self, config):
+        self.config = config
+        self._client = httpx.AsyncClient()
+
+    async def close(self):
+        await self._client.aclose()
+
+
+class AsyncClientTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.pool = SuiClientPool(config=SimpleNamespace())
+        patcher = mock.patch('ajo.sui_pool.AsyncClient', FakeAsyncClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_refused_outside_event_loop(self):
+        with self.assertRaises(RuntimeError):
+            self.pool.async_client()
+
+    def test_one_client_per_loop_and_default_transport_closed(self):
+        async def run():
+            first = self.pool.async_client()
+            second = self.pool.async_client()
+            closing = list(self.pool._closing)
+            await asyncio.gather(*closing)
+            await self.pool.aclose()
+            return first, second, closing
+
+        first, second, closing = asyncio.run(run())
+        self.assertIs(first, second)
+        self.assertEqual(len(closing), 1)
+        self.assertEqual(self.pool._closing, set())
+
+
+class TransportTestCase(SimpleTestCase):
+
+    def test_verifies_certificates(self):
+        context = SuiClientPool(config=SimpleNamespace())._transport_kwargs()['verify']
+        self.assertEqual(context.verify_mode, ssl.CERT_REQUIRED)
+        self.assertTrue(context.check_hostname)
+
+
+class InitClientPoolTestCase(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(sui_pool, '_pool', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_second_init_keeps_the_pool(self):
+        pool = init_client_pool(size=5, warm=False)
+        pool._sync_client = sync_client = mock.Mock()
+        self.assertIs(init_client_pool(size=5, warm=False), pool)
+        self.assertIs(pool._sync_client, sync_client)
+        sync_client.close.assert_not_called()
+
+    def test_new_settings_close_the_old_pool(self):
+        pool = init_client_pool(size=5, warm=False)
+        pool._sync_client = sync_client = mock.Mock()
+        self.assertIsNot(init_client_pool(size=6, warm=False), pool)
+        sync_client.close.assert_called_once()
+
+    def test_inherited_pool_is_replaced_without_closing(self):
+        pool = init_client_pool(size=5, warm=False)
+        pool._sync_client = sync_client = mock.Mock()
+        pool.pid = -1
+        self.assertIsNot(init_client_pool(size=5, warm=False), pool)
+        sync_client.close.assert_not_called()
@@ -0,0 +1,565 @@
+import asyncio
+import uuid
+from types import SimpleNamespace
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase
+from ajo.sui_gas import MIN_GAS_BUDGET, GasCoinManager, GasEstimator, GasPoolError
+from ajo.sui_tools import (
+    ContractError, ContributionStatus, PendingPayout, SavingsGroupError, SavingsGroupInfo,
+    SavingsGroupManager, SavingsGroupSDK, SignedTransaction, TransactionError, before_execute,
+    payout_position
+)
+
+
+class FakeContributeSDK:
+    """Fails contributions per alias and records how many run at once"""
+
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.calls = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def contribute(self, signer_alias, group_id, payment_amount):
+        self.calls[signer_alias] = self.calls.get(signer_alias, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            errors = self.failures.get(signer_alias, [])
+            if errors:
+                raise errors.pop(0)
+            return SimpleNamespace(result_data=SimpleNamespace(digest=f'digest-{signer_alias}'))
+        finally:
+            self.in_flight -= 1
+
+
+def make_manager(sdk):
+    manager = SavingsGroupManager.__new__(SavingsGroupManager)
+    manager.sdk = sdk
+    return manager
+
+
+class SDKErrorHandlingTestCase(SimpleTestCase):
+
+    def test_parse_abort_code(self):
+        message = 'MoveAbort(MoveLocation { module: ModuleId { name: Identifier("codeforge") } }, 7) in command 1'
+        self.assertEqual(SavingsGroupSDK._parse_abort_code(message), 7)
+
+    def test_failed_effects_raise_contract_error(self):
+        sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        status = SimpleNamespace(status='failure', error='MoveAbort(location, 7) in command 0')
+        result = SimpleNamespace(
+            is_ok=lambda: True,
+            result_data=SimpleNamespace(effects=SimpleNamespace(status=status))
+        )
+        with self.assertRaises(ContractError) as ctx:
+            sdk._handle_transaction_result(result)
+        self.assertEqual(ctx.exception.error_code, SavingsGroupSDK.E_ALREADY_CONTRIBUTED)
+
+    def test_rpc_failure_raises_transaction_error(self):
+        sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        result = SimpleNamespace(is_ok=lambda: False, result_string='object locked')
+        with self.assertRaises(TransactionError):
+            sdk._handle_transaction_result(result)
+
+
+class ParseParticipantsTestCase(SimpleTestCase):
+
+    def parse(self, total_cycles_completed, start_cycle):
+        data = [
+            {'fields': {'wallet': '0x' + str(position) * 64, 'position': position}}
+            for position in (1, 2, 3)
+        ]
+        participants = SavingsGroupSDK._parse_participants(data, total_cycles_completed, start_cycle)
+        return [p.position for p in participants if p.has_received_payout]
+
+    def test_paid_in_position_order_from_cycle_one(self):
+        self.assertEqual(self.parse(2, start_cycle=1), [1, 2])
+
+    def test_start_cycle_zero_pays_position_two_first(self):
+        # Cycle 1 pays (1 - 0) % 3 + 1 = 2, as payout_position says for the next cycle
+        self.assertEqual(payout_position(1, 0, 3), 2)
+        self.assertEqual(self.parse(1, start_cycle=0), [2])
+        self.assertEqual(self.parse(2, start_cycle=0), [2, 3])
+        self.assertEqual(self.parse(3, start_cycle=0), [1, 2, 3])
+
+
+class CollectContributionsTestCase(SimpleTestCase):
+
+    def test_classifies_outcomes(self):
+        sdk = FakeContributeSDK({
+            'bob': [ContractError('already contributed', 7)],
+            'carol': [TransactionError('object version conflict')],
+            'dave': [ContractError('insufficient payment', 3)],
+        })
+        outcomes = asyncio.run(make_manager(sdk).collect_contributions(
+            'group', ['alice', 'bob', 'carol', 'dave'], 1000, concurrency=4, retry_delay=0
+        ))
+
+        self.assertEqual([o.alias for o in outcomes], ['alice', 'bob', 'carol', 'dave'])
+        self.assertEqual(
+            [o.status for o in outcomes],
+            [
+                ContributionStatus.CONTRIBUTED,
+                ContributionStatus.ALREADY_CONTRIBUTED,
+                ContributionStatus.CONTRIBUTED,
+                ContributionStatus.FATAL,
+            ]
+        )
+        self.assertEqual(outcomes[0].digest, 'digest-alice')
+        self.assertEqual(outcomes[2].attempts, 2)
+        self.assertEqual(sdk.calls['dave'], 1)
+
+    def test_retries_are_bounded(self):
+        sdk = FakeContributeSDK({'alice': [TransactionError('timeout')] * 5})
+        outcomes = asyncio.run(make_manager(sdk).collect_contributions(
+            'group', ['alice'], 1000, max_retries=2, retry_delay=0
+        ))
+        self.assertEqual(outcomes[0].status, ContributionStatus.RETRYABLE)
+        self.assertEqual(outcomes[0].attempts, 3)
+
+    def test_bounded_concurrency_and_per_signer_ordering(self):
+        sdk = FakeContributeSDK()
+        asyncio.run(make_manager(sdk).collect_contributions(
+            'group', ['a', 'b', 'c', 'd', 'e', 'a'], 1000, concurrency=2
+        ))
+        self.assertEqual(sdk.max_in_flight, 2)
+        self.assertEqual(sdk.calls['a'], 2)
+
+
+class FakeBatchSDK(SavingsGroupSDK):
+    """Executes contribution blocks against an in-memory set of contributed groups"""
+
+    def __init__(self, contributed=(), batch_size=2):
+        self.package_id = '0x1'
+        self.keypairs = {'custodian': object()}
+        self.contributed = set(contributed)
+        self.batch_size = batch_size
+        self.blocks = []
+
+    def _batch_size(self):
+        return self.batch_size
+
+    async def _execute_contribution_batch(self, signer_alias, calls, gas_budget):
+        for index, call in enumerate(calls, start=1):
+            call.command_index = index
+        self.blocks.append([call.group_id for call in calls])
+        already = next((c for c in calls if c.group_id in self.contributed), None)
+        if already is not None:
+            error = f'MoveAbort(MoveLocation {{ module: codeforge }}, 7) in command {already.command_index}'
+            status = SimpleNamespace(status='failure', error=error)
+            events = []
+        else:
+            self.contributed.update(c.group_id for c in calls)
+            status = SimpleNamespace(status='success', error=None)
+            events = [
+                SimpleNamespace(
+                    event_type='0x1::codeforge::ContributionMade',
+                    parsed_json={'group_id': c.group_id, 'cycle': '3'}
+                )
+                for c in calls
+            ]
+        gas = SimpleNamespace(total_after_rebate=1000 * len(calls))
+        return SimpleNamespace(
+            is_ok=lambda: True,
+            result_data=SimpleNamespace(
+                digest=f'digest-{len(self.blocks)}',
+                effects=SimpleNamespace(status=status, gas_used=gas),
+                events=events
+            )
+        )
+
+
+class ContributeManyTestCase(SimpleTestCase):
+    groups = ['0x' + c * 64 for c in 'abcde']
+
+    def test_chunks_at_batch_size(self):
+        sdk = FakeBatchSDK(batch_size=2)
+        calls = asyncio.run(sdk.contribute_many('custodian', [(g, 1000) for g in self.groups]))
+
+        self.assertEqual([len(block) for block in sdk.blocks], [2, 2, 1])
+        self.assertTrue(all(c.status == ContributionStatus.CONTRIBUTED for c in calls))
+        self.assertEqual([c.digest for c in calls], ['digest-1', 'digest-1', 'digest-2', 'digest-2', 'digest-3'])
+        self.assertEqual(calls[0].cycle, 3)
+        self.assertEqual(calls[0].gas_used, 1000)
+
+    def test_already_contributed_call_is_dropped_and_block_retried(self):
+        sdk = FakeBatchSDK(contributed=[self.groups[1]], batch_size=3)
+        calls = asyncio.run(sdk.contribute_many('custodian', [(g, 1000) for g in self.groups[:3]]))
+
+        self.assertEqual(
+            [c.status for c in calls],
+            [ContributionStatus.CONTRIBUTED, ContributionStatus.ALREADY_CONTRIBUTED, ContributionStatus.CONTRIBUTED]
+        )
+        self.assertEqual(sdk.blocks[-1], [self.groups[0], self.groups[2]])
+
+    def test_rejects_duplicate_groups(self):
+        sdk = FakeBatchSDK()
+        with self.assertRaises(SavingsGroupError):
+            asyncio.run(sdk.contribute_many('custodian', [(self.groups[0], 1), (self.groups[0], 1)]))
+
+
+class FakeGasTransaction:
+
+    def __init__(self, chain):
+        self.chain = chain
+        self.gas = 'gas'
+        self.merged = []
+        self.splits = []
+
+    def merge_coins(self, merge_to, merge_from):
+        self.merged = list(merge_from)
+
+    def split_coin(self, coin, amounts):
+        self.splits = list(amounts)
+        return [f'split-{i}' for i in range(len(amounts))]
+
+    def transfer_objects(self, transfers, recipient):
+        pass
+
+    def execute(self, gas_budget, use_gas_object):
+        coins = self.chain.coins
+        for coin_id in self.merged:
+            coins[use_gas_object] += coins.pop(coin_id)
+        for amount in self.splits:
+            coins[use_gas_object] -= amount
+            coins[f'0xnew{len(coins)}'] = amount
+        self.chain.maintenance_txns += 1
+        return SimpleNamespace(is_ok=lambda: True, result_data=None)
+
+
+class FakeGasSDK:
+    """Signer 'admin' holding the coins in self.coins"""
+
+    def __init__(self, coins):
+        self.coins = dict(coins)
+        self.maintenance_txns = 0
+        self.keypairs = {'admin': object()}
+        self.client = SimpleNamespace(get_gas=self.get_gas)
+
+    def get_gas(self, address, fetch_all=False):
+        data = [SimpleNamespace(coin_object_id=c, balance=str(b)) for c, b in self.coins.items()]
+        return SimpleNamespace(is_ok=lambda: True, result_data=SimpleNamespace(data=data))
+
+    def get_address(self, alias):
+        return '0x' + 'e' * 64
+
+    def _new_transaction(self, keypair):
+        return FakeGasTransaction(self)
+
+    def _handle_transaction_result(self, result):
+        return result
+
+
+class FakeSigningTransaction:
+
+    def __init__(self, log):
+        self.log = log
+        self.signer_block = SimpleNamespace(get_signatures=self.get_signatures)
+
+    def deferred_execution(self, gas_budget, use_gas_object):
+        self.log.append('build')
+        return 'dHgtMQ=='
+
+    def get_signatures(self, client, tx_bytes):
+        return SimpleNamespace(array=['c2lnLTE='])
+
+
+class SignBeforeExecuteTestCase(SimpleTestCase):
+
+    def test_hook_sees_signed_transaction_before_it_is_sent(self):
+        log = []
+        sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        sdk._client = SimpleNamespace(execute=lambda builder: log.append('send') or SimpleNamespace(result_data=None))
+        sdk.gas = None
+        sdk.state_cache = None
+
+        async def hook(signed):
+            log.append(('signed', signed.digest))
+
+        async def run():
+            before_execute.set(hook)
+            return await sdk._execute(FakeSigningTransaction(log), 'admin', 1000, 'contribute')
+
+        asyncio.run(run())
+        digest = SignedTransaction('dHgtMQ==', ('c2lnLTE=',)).digest
+        self.assertEqual(log, ['build', ('signed', digest), 'send'])
+        self.assertEqual(len(digest), 44)
+
+
+class SettleSignedTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.signed = SignedTransaction('dHgtMQ==', ('c2lnLTE=',))
+        self.sent = []
+        self.sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        self.sdk._client = SimpleNamespace(execute=self.execute)
+        self.sdk.state_cache = None
+
+    def execute(self, builder):
+        self.sent.append(builder)
+        return SimpleNamespace(is_ok=lambda: True, result_data=None)
+
+    def settle(self, found):
+        async def get_transactions(digests):
+            return found
+        self.sdk.get_transactions = get_transactions
+        return asyncio.run(self.sdk.settle_signed(self.signed))
+
+    def test_found_on_chain_is_not_sent_again(self):
+        response = SimpleNamespace(digest=self.signed.digest, effects=None)
+        result = self.settle({self.signed.digest: response})
+        self.assertIs(result.result_data, response)
+        self.assertEqual(self.sent, [])
+
+    def test_missing_transaction_is_sent_again_unchanged(self):
+        self.settle({})
+        self.assertEqual(len(self.sent), 1)
+        self.assertEqual(str(self.sent[0].tx_bytes), self.signed.tx_bytes)
+
+
+class GetTransactionsTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.known = {'A': SimpleNamespace(digest='A', effects=True)}
+        self.calls = []
+        self.sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        self.sdk._client = SimpleNamespace(max_gets=50, execute=self.execute)
+        self.error = None
+
+    def execute(self, builder):
+        digests = [str(d) for d in builder.digests.array]
+        self.calls.append(digests)
+        if self.error:
+            return SimpleNamespace(is_ok=lambda: False, result_string=self.error)
+        missing = [d for d in digests if d not in self.known]
+        if missing:
+            error = {'code': -32602, 'message': f'Could not find the referenced transaction {missing[0]}'}
+            return SimpleNamespace(is_ok=lambda: False, result_string=error)
+        transactions = [self.known[d] for d in digests]
+        return SimpleNamespace(is_ok=lambda: True, result_data=SimpleNamespace(transactions=transactions))
+
+    def test_unknown_digests_are_isolated(self):
+        found = asyncio.run(self.sdk.get_transactions(['A', 'B']))
+        self.assertEqual(list(found), ['A'])
+        self.assertEqual(self.calls, [['A', 'B'], ['A'], ['B']])
+
+    def test_transport_errors_raise(self):
+        self.error = 'HTTPX error: ReadTimeout'
+        with self.assertRaises(TransactionError):
+            asyncio.run(self.sdk.get_transactions(['A']))
+
+
+def new_cache():
+    return LocMemCache(f'gas-tests-{uuid.uuid4().hex}', {})
+
+
+class GasCoinManagerTestCase(SimpleTestCase):
+
+    def test_presplits_pool_and_merges_dust(self):
+        sdk = FakeGasSDK({'0xbig': 10_000, '0xdust1': 5, '0xdust2': 7})
+        manager = GasCoinManager(sdk, pool_size=4, coin_balance=1_000, dust_balance=100, cache=new_cache())
+        asyncio.run(manager.maintain('admin'))
+
+        self.assertEqual(sdk.maintenance_txns, 1)
+        self.assertNotIn('0xdust1', sdk.coins)
+        self.assertEqual(len(sdk.coins), 4)
+        self.assertEqual(sum(sdk.coins.values()), 10_012)
+
+    def test_concurrent_leases_get_distinct_coins(self):
+        sdk = FakeGasSDK({f'0xcoin{i}': 1_000 for i in range(3)})
+        manager = GasCoinManager(sdk, pool_size=3, coin_balance=1_000, dust_balance=100, cache=new_cache())
+        leased = []
+
+        async def use_coin():
+            async with manager.lease('admin', gas_budget=10) as coin_id:
+                leased.append(coin_id)
+                await asyncio.sleep(0.01)
+
+        async def run():
+            await asyncio.gather(*(use_coin() for _ in range(3)))
+
+        asyncio.run(run())
+        self.assertEqual(len(set(leased)), 3)
+        self.assertEqual(sdk.maintenance_txns, 0)
+
+    def test_lease_waits_for_a_free_coin(self):
+        sdk = FakeGasSDK({'0xonly': 1_000})
+        manager = GasCoinManager(sdk, pool_size=1, coin_balance=1_000, dust_balance=100, lease_timeout=0.02, cache=new_cache())
+
+        async def run():
+            async with manager.lease('admin', gas_budget=10):
+                async with manager.lease('admin', gas_budget=10):
+                    pass
+
+        with self.assertRaises(GasPoolError):
+            asyncio.run(run())
+
+    def test_processes_sharing_a_signer_get_distinct_coins(self):
+        sdk = FakeGasSDK({f'0xcoin{i}': 1_000 for i in range(2)})
+        cache = new_cache()
+        # One manager per worker process, leases recorded in the shared cache
+        first, second = (
+            GasCoinManager(sdk, pool_size=2, coin_balance=1_000, dust_balance=100, lease_timeout=0.02, cache=cache)
+            for _ in range(2)
+        )
+
+        async def run():
+            async with first.lease('admin', gas_budget=10) as a:
+                async with second.lease('admin', gas_budget=10) as b:
+                    with self.assertRaises(GasPoolError):
+                        async with second.lease('admin', gas_budget=10):
+                            pass
+                    return a, b
+
+        a, b = asyncio.run(run())
+        self.assertNotEqual(a, b)
+        self.assertEqual(sdk.maintenance_txns, 0)
+
+
+class CountingEstimator(GasEstimator):
+    """Dry runs cost 1,000,000 MIST per unit of size"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.dry_runs = 0
+        self.fail = False
+
+    async def dry_run(self, txn):
+        self.dry_runs += 1
+        if self.fail:
+            raise GasPoolError('dry run failed')
+        return 1_000_000 * txn.size
+
+
+class GasEstimatorTestCase(SimpleTestCase):
+    target = '0x1::codeforge::create_savings_group'
+
+    def estimate(self, estimator, size, **kwargs):
+        return asyncio.run(estimator.estimate(SimpleNamespace(size=size), self.target, size, **kwargs))
+
+    def test_caches_per_size_bucket_with_margin(self):
+        estimator = CountingEstimator(margin=1.5)
+        self.assertEqual(self.estimate(estimator, 5), 7_500_000)
+        # 5 and 7 share the 8 bucket; the cost is scaled to the larger size
+        self.assertEqual(self.estimate(estimator, 7), 10_500_000)
+        self.assertEqual(estimator.dry_runs, 1)
+
+        self.estimate(estimator, 9)
+        self.assertEqual(estimator.dry_runs, 2)
+
+    def test_expired_entries_are_measured_again(self):
+        estimator = CountingEstimator(ttl=0)
+        self.estimate(estimator, 2)
+        self.estimate(estimator, 2)
+        self.assertEqual(estimator.dry_runs, 2)
+
+    def test_failed_dry_run_uses_fallback(self):
+        estimator = CountingEstimator()
+        estimator.fail = True
+        self.assertEqual(self.estimate(estimator, 2, fallback=123), 123)
+        with self.assertRaises(GasPoolError):
+            self.estimate(estimator, 2)
+
+    def test_budget_has_a_floor(self):
+        estimator = CountingEstimator(margin=0.1)
+        self.assertEqual(self.estimate(estimator, 1), MIN_GAS_BUDGET)
+
+
+SIGNERS = {alias: '0x' + char * 64 for alias, char in [('admin', '1'), ('s1', '2'), ('s2', '3'), ('s3', '4')]}
+
+
+class FakePayoutSDK(SavingsGroupSDK):
+    """Multisig payout state machine following codeforge.move"""
+
+    def __init__(self, threshold=2, unavailable=()):
+        self.keypairs = dict.fromkeys(SIGNERS)
+        self.threshold = threshold
+        self.unavailable = set(unavailable)
+        self.pending = None
+        self.executed = False
+        self.sign_calls = []
+
+    def get_address(self, alias):
+        return SIGNERS[alias]
+
+    async def get_group_info(self, group_id):
+        return SavingsGroupInfo(
+            object_id=group_id, name='g', cycle_duration_days=7, contribution_amount=10,
+            current_cycle=2, current_balance=30, is_active=True, participants=[],
+            start_cycle=0, created_at=0, cycle_start_time=0,
+            multisig_signers=[SIGNERS['s1'], SIGNERS['s2'], SIGNERS['s3']],
+            multisig_threshold=self.threshold,
+            pending_payout=self.pending
+        )
+
+    async def propose_payout(self, signer_alias, group_id, gas_budget=None):
+        self.pending = PendingPayout(recipient=SIGNERS['s1'], amount=30, cycle=2)
+
+    async def sign_payout(self, signer_alias, group_id, gas_budget=None):
+        self.sign_calls.append(signer_alias)
+        await asyncio.sleep(0.01)
+        if signer_alias in self.unavailable:
+            raise TransactionError('signer offline')
+        if self.pending is None:
+            raise ContractError('E_PAYOUT_NOT_READY', 13)
+        self.pending.signatures.append(SIGNERS[signer_alias])
+        events = []
+        if len(self.pending.signatures) >= self.threshold:
+            self.pending, self.executed = None, True
+            events = [SimpleNamespace(event_type='0x1::codeforge::PayoutExecuted')]
+        return SimpleNamespace(result_data=SimpleNamespace(digest=f'sig-{signer_alias}', events=events))
+
+
+class ProcessPayoutTestCase(SimpleTestCase):
+
+    def test_signs_concurrently_up_to_threshold(self):
+        sdk = FakePayoutSDK(threshold=2)
+        report = asyncio.run(sdk.process_payout('admin', 'group'))
+
+        self.assertTrue(report.executed)
+        self.assertEqual(sorted(sdk.sign_calls), ['s1', 's2'])
+        self.assertEqual(report.amount, 30)
+        self.assertIn(report.digest, ('sig-s1', 'sig-s2'))
+
+    def test_replaces_unavailable_signer(self):
+        sdk = FakePayoutSDK(threshold=2, unavailable=['s1'])
+        report = asyncio.run(sdk.process_payout('admin', 'group'))
+
+        self.assertTrue(report.executed)
+        self.assertEqual(sorted(report.signers), ['s2', 's3'])
+        self.assertIn('s1', report.failed_signers)
+
+    def test_not_enough_signers(self):
+        sdk = FakePayoutSDK(threshold=3)
+        with self.assertRaises(SavingsGroupError):
+            asyncio.run(sdk.process_payout('admin', 'group', signer_aliases=['s1', 's2']))
+
+
+class ParseMultisigTestCase(SimpleTestCase):
+
+    def test_parses_multisig_config_and_pending_payout(self):
+        fields = {
+            'name': 'g', 'cycle_duration_days': '7', 'contribution_amount': '10',
+            'current_cycle': '2', 'savings_balance': '30', 'is_active': True,
+            'start_cycle': '0', 'cycle_start_time': '0', 'participants': [],
+            'multisig_config': {'type': 'x::codeforge::MultisigConfig', 'fields': {
+                'signers': [SIGNERS['s1'], SIGNERS['s2'].upper().replace('0X', '0x')], 'threshold': '2'
+            }},
+            'pending_payout': {'type': 'x::codeforge::PendingPayout', 'fields': {
+                'recipient': SIGNERS['s1'], 'amount': '30', 'cycle': '2',
+                'signatures': [SIGNERS['s2']], 'executed': False, 'created_at': '5'
+            }},
+        }
+        sdk = SavingsGroupSDK.__new__(SavingsGroupSDK)
+        info = sdk._parse_group_object('group', SimpleNamespace(content=SimpleNamespace(fields=fields)))
+
+        self.assertEqual(info.multisig_signers, [SIGNERS['s1'], SIGNERS['s2']])
+        self.assertEqual(info.multisig_threshold, 2)
+        self.assertEqual(info.pending_payout.signatures, [SIGNERS['s2']])
+        self.assertEqual(info.signatures_needed, 1)
+
+        fields['pending_payout'] = None
+        info = sdk._parse_group_object('group', SimpleNamespace(content=SimpleNamespace(fields=fields)))
+        self.assertIsNone(info.pending_payout)
@@ -0,0 +1,205 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from pysui.sui.sui_txresults.complex_tx import TxResponse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ajo.models import AjoUser, ChainTransaction, SavingsGroup
+from ajo.sui_tools import TransactionError
+from ajo.transactions import TransactionChecker, track_transaction
+from main.models import User
+
+
+GROUP = '0x' + 'a' * 64
+WALLET = '0x' + 'b' * 64
+DIGESTS = ['D' * 43, 'E' * 43, 'F' * 43]
+
+
+def make_response(digest, status='success', error=None, sender=WALLET, group=GROUP):
+    ref = {'objectId': group, 'version': 7, 'digest': 'x'}
+    return TxResponse.from_dict({
+        'digest': digest,
+        'transaction': {
+            'data': {
+                'messageVersion': 'v1',
+                'sender': sender,
+                'gasData': {'payment': [], 'owner': sender, 'price': '1000', 'budget': '5000000'},
+                'transaction': {'kind': 'ProgrammableTransaction', 'inputs': [], 'transactions': []},
+            },
+            'txSignatures': ['sig'],
+        },
+        'checkpoint': '123',
+        'timestampMs': int(timezone.now().timestamp() * 1000),
+        'events': [],
+        'effects': {
+            'messageVersion': 'v1',
+            'status': {'status': status, 'error': error},
+            'executedEpoch': '1',
+            'gasUsed': {
+                'computationCost': '1000',
+                'storageCost': '3000',
+                'storageRebate': '2000',
+                'nonRefundableStorageFee': '10',
+            },
+            'transactionDigest': digest,
+            'gasObject': {'owner': {'AddressOwner': WALLET}, 'reference': ref},
+            'mutated': [{'owner': {'Shared': {'initial_shared_version': 1}}, 'reference': ref}],
+        },
+    })
+
+
+class FakeTxSDK:
+    """Answers get_transactions from a fixed set of executed transactions"""
+
+    def __init__(self, responses):
+        self.responses = {response.digest: response for response in responses}
+        self.calls = []
+
+    async def get_transactions(self, digests):
+        self.calls.append(list(digests))
+        return {d: self.responses[d] for d in digests if d in self.responses}
+
+
+class UnreachableTxSDK:
+
+    async def get_transactions(self, digests):
+        raise TransactionError('HTTPX error: ReadTimeout')
+
+
+class TransactionCheckerTestCase(TestCase):
+
+    def setUp(self):
+        for digest in DIGESTS:
+            track_transaction(digest, 'contribute', sender=WALLET, group_address=GROUP)
+
+    def test_confirms_pending_digests_in_batches(self):
+        sdk = FakeTxSDK([make_response(DIGESTS[0]), make_response(DIGESTS[1], 'failure', 'MoveAbort 7')])
+        confirmed = TransactionChecker(sdk=sdk, batch_size=2).run()
+
+        self.assertEqual(confirmed, 2)
+        self.assertEqual([len(call) for call in sdk.calls], [2, 1])
+
+        success = ChainTransaction.objects.get(digest=DIGESTS[0])
+        self.assertEqual(success.status, ChainTransaction.Status.SUCCESS)
+        self.assertEqual(success.gas_used, 2000)
+        self.assertEqual(success.checkpoint, 123)
+        self.assertEqual(success.effects['mutated'], [GROUP])
+        self.assertIsNotNone(success.latency_ms)
+
+        failure = ChainTransaction.objects.get(digest=DIGESTS[1])
+        self.assertEqual(failure.status, ChainTransaction.Status.FAILURE)
+        self.assertEqual(failure.error, 'MoveAbort 7')
+
+        missing = ChainTransaction.objects.get(digest=DIGESTS[2])
+        self.assertEqual(missing.status, ChainTransaction.Status.PENDING)
+        self.assertEqual(missing.check_attempts, 1)
+
+    def test_drops_digests_never_seen(self):
+        ChainTransaction.objects.filter(digest=DIGESTS[2]).update(
+            submitted_at=timezone.now() - timedelta(hours=1)
+        )
+        TransactionChecker(sdk=FakeTxSDK([]), drop_after=600).run()
+
+        self.assertEqual(ChainTransaction.objects.get(digest=DIGESTS[2]).status, ChainTransaction.Status.DROPPED)
+        self.assertEqual(ChainTransaction.objects.get(digest=DIGESTS[0]).status, ChainTransaction.Status.PENDING)
+
+    def test_lookup_failures_never_drop(self):
+        ChainTransaction.objects.update(submitted_at=timezone.now() - timedelta(hours=1))
+        confirmed = TransactionChecker(sdk=UnreachableTxSDK(), drop_after=600).run()
+
+        self.assertEqual(confirmed, 0)
+        self.assertEqual(
+            set(ChainTransaction.objects.values_list('status', flat=True)),
+            {ChainTransaction.Status.PENDING},
+        )
+
+    def test_rejects_reports_that_do_not_match(self):
+        other = '0x' + 'c' * 64
+        sdk = FakeTxSDK([
+            make_response(DIGESTS[0], sender=other),
+            make_response(DIGESTS[1], group=other),
+            make_response(DIGESTS[2]),
+        ])
+        confirmed = TransactionChecker(sdk=sdk).run()
+
+        self.assertEqual(confirmed, 1)
+        statuses = dict(ChainTransaction.objects.values_list('digest', 'status'))
+        self.assertEqual(statuses, {
+            DIGESTS[0]: ChainTransaction.Status.REJECTED,
+            DIGESTS[1]: ChainTransaction.Status.REJECTED,
+            DIGESTS[2]: ChainTransaction.Status.SUCCESS,
+        })
+        self.assertEqual(ChainTransaction.objects.get(digest=DIGESTS[0]).effects, {})
+
+    def test_tracking_is_idempotent(self):
+        _, created = track_transaction(DIGESTS[0], 'contribute', sender=WALLET)
+        self.assertFalse(created)
+        self.assertEqual(ChainTransaction.objects.count(), 3)
+
+
+class TransactionEndpointsTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(email='tx@example.com', confirmed=True)
+        AjoUser.objects.create(user=self.user, wallet_address=WALLET)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_group_exposes_creation_status(self):
+        response = self.client.post(reverse('savingsgroup-list'), {
+            'name': 'Tracked Group',
+            'description': 'd',
+            'cycle_duration_days': 7,
+            'start_cycle': 1,
+            'contribution_amount': '1.0000',
+            'address_link': GROUP,
+            'digest': DIGESTS[0],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        tx = ChainTransaction.objects.get(digest=DIGESTS[0])
+        self.assertEqual((tx.operation, tx.sender, tx.group_address), ('create_savings_group', WALLET, GROUP))
+
+        group = SavingsGroup.objects.get(name='Tracked Group')
+        response = self.client.get(reverse('savingsgroup-detail', kwargs={'pk': group.pk}))
+        self.assertEqual(response.data['transaction_status'], ChainTransaction.Status.PENDING)
+
+        TransactionChecker(sdk=FakeTxSDK([make_response(DIGESTS[0])])).run()
+        response = self.client.get(reverse('savingsgroup-list'))
+        self.assertEqual(response.data['results'][0]['transaction_status'], ChainTransaction.Status.SUCCESS)
+
+        response = self.client.get(reverse('savingsgroup-transactions', kwargs={'pk': group.pk}))
+        self.assertEqual([t['digest'] for t in response.data], [DIGESTS[0]])
+
+    def test_group_history_hides_rejected_reports(self):
+        group = SavingsGroup.objects.create(
+            name='Target', description='d', cycle_duration_days=7, start_cycle=1,
+            contribution_amount=Decimal('1.0000'), address_link=GROUP,
+        )
+        group.participants.add(self.user)
+        self.client.post(reverse('ajouser-transactions'), {
+            'digest': DIGESTS[1], 'operation': 'contribute', 'group_address': GROUP,
+        }, format='json')
+        TransactionChecker(sdk=FakeTxSDK([make_response(DIGESTS[1], sender='0x' + 'c' * 64)])).run()
+
+        response = self.client.get(reverse('savingsgroup-transactions', kwargs={'pk': group.pk}))
+        self.assertEqual(response.data, [])
+
+    def test_wallet_reports_and_lists_transactions(self):
+        url = reverse('ajouser-transactions')
+        response = self.client.post(url, {'digest': DIGESTS[1], 'operation': 'contribute'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sender'], WALLET)
+
+        response = self.client.post(url, {'digest': DIGESTS[1], 'operation': 'contribute'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(url, {'digest': 'not-a-digest', 'operation': 'contribute'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(url, {'status': 'pending'})
+        self.assertEqual([t['digest'] for t in response.data], [DIGESTS[1]])
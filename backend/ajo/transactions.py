@@ -0,0 +1,172 @@
+"""
+Tracking of transactions sent to Sui.
+
+Every transaction the backend knows about gets a ChainTransaction row:
+submissions made through the chain queue (see ajo/chain_queue.py) and
+digests reported by the frontend after signing with the user's wallet.
+Rows with a digest but no confirmed outcome stay pending until
+TransactionChecker finds them on chain. The checker confirms up to a full
+RPC page of digests per multiGetTransactionBlocks call and records the
+effects, net gas and latency. Digests that never show up are marked
+dropped after SUI_TX_DROP_AFTER_SECONDS; a batch whose lookup fails is
+left pending. A reported digest is only
+trusted if the transaction was sent by the row's sender and touched its
+group; otherwise the row is rejected.
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from logging import getLogger
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils import timezone
+
+from ajo.chain_cache import get_sdk
+from ajo.models import ChainTransaction
+from ajo.sui_tools import TransactionError, normalize_address
+
+logger = getLogger(__name__)
+
+
+def summarize_effects(response):
+    """
+    JSON-safe summary of a TxResponse: status, touched objects, events and gas.
+
+    Returns:
+        (summary, net gas used in MIST)
+    """
+    effects = response.effects
+    gas = effects.gas_used
+    gas_summary = {
+        'computation': int(gas.computation_cost),
+        'storage': int(gas.storage_cost),
+        'rebate': int(gas.storage_rebate),
+        'non_refundable_storage': int(gas.non_refundable_storage_fee),
+    }
+    summary = {
+        'status': effects.status.status,
+        'error': effects.status.error,
+        'created': [ref.reference.object_id for ref in effects.created or []],
+        'mutated': [ref.reference.object_id for ref in effects.mutated or []],
+        'deleted': [ref.object_id for ref in effects.deleted or []],
+        'events': [event.event_type.split('::')[-1] for event in response.events or []],
+        'gas': gas_summary,
+    }
+    net_gas = gas_summary['computation'] + gas_summary['storage'] - gas_summary['rebate']
+    return summary, net_gas
+
+
+def apply_response(tx, response, now=None):
+    """Record the on-chain outcome of a transaction on its (unsaved) row."""
+    tx.effects, tx.gas_used = summarize_effects(response)
+    succeeded = response.effects.status.status == 'success'
+    tx.status = ChainTransaction.Status.SUCCESS if succeeded else ChainTransaction.Status.FAILURE
+    tx.error = '' if succeeded else (response.effects.status.error or 'Unknown error')
+    tx.checkpoint = int(response.checkpoint) if response.checkpoint else None
+    if response.timestamp_ms:
+        tx.confirmed_at = datetime.fromtimestamp(int(response.timestamp_ms) / 1000, tz=dt_timezone.utc)
+    else:
+        tx.confirmed_at = now or timezone.now()
+    tx.latency_ms = max(0, int((tx.confirmed_at - tx.submitted_at).total_seconds() * 1000))
+
+
+def matches_report(tx, response):
+    """Whether an executed transaction was sent by the row's sender and touched its group"""
+    data = getattr(response.transaction, 'data', None)
+    if data is None or not tx.sender or normalize_address(data.sender) != tx.sender:
+        return False
+    if not tx.group_address:
+        return True
+    effects = response.effects
+    touched = [ref.reference.object_id for ref in (effects.created or []) + (effects.mutated or [])]
+    return tx.group_address in {normalize_address(object_id) for object_id in touched}
+
+
+def track_transaction(digest, operation, sender='', group_address=''):
+    """
+    Start tracking a digest reported by a client (idempotent per digest).
+
+    Returns:
+        (ChainTransaction, created)
+    """
+    defaults = {
+        'operation': operation,
+        'sender': normalize_address(sender) if sender else '',
+        'group_address': normalize_address(group_address) if group_address else '',
+        'status': ChainTransaction.Status.PENDING,
+    }
+    try:
+        return ChainTransaction.objects.get_or_create(digest=digest, defaults=defaults)
+    except IntegrityError:
+        return ChainTransaction.objects.get(digest=digest), False
+
+
+class TransactionChecker:
+    """Confirms pending digests in batches."""
+
+    FIELDS = [
+        'status', 'error', 'effects', 'gas_used', 'checkpoint', 'latency_ms',
+        'confirmed_at', 'check_attempts', 'updated_at',
+    ]
+
+    def __init__(self, sdk=None, batch_size=None, drop_after=None):
+        self.sdk = sdk or get_sdk()
+        self.batch_size = batch_size or settings.SUI_TX_CHECK_BATCH_SIZE
+        self.drop_after = timedelta(
+            seconds=settings.SUI_TX_DROP_AFTER_SECONDS if drop_after is None else drop_after
+        )
+
+    def pending(self, limit=None):
+        queryset = ChainTransaction.objects.filter(
+            status=ChainTransaction.Status.PENDING, digest__isnull=False
+        ).order_by('submitted_at')
+        return list(queryset[:limit] if limit else queryset)
+
+    def check_batch(self, batch):
+        """
+        Look up one batch of pending rows with a single RPC call and save the outcome.
+
+        Returns:
+            Number of transactions confirmed (successful or failed)
+        """
+        found = async_to_sync(self.sdk.get_transactions)([tx.digest for tx in batch])
+        now = timezone.now()
+        confirmed = 0
+        for tx in batch:
+            tx.check_attempts += 1
+            tx.updated_at = now
+            response = found.get(tx.digest)
+            if response is not None and not matches_report(tx, response):
+                tx.status = ChainTransaction.Status.REJECTED
+                tx.error = 'Transaction was not sent by this wallet or did not touch this group'
+                logger.warning(f'Transaction {tx.digest} does not match its report ({tx.operation} by {tx.sender})')
+            elif response is not None:
+                apply_response(tx, response, now)
+                confirmed += 1
+            elif now - tx.submitted_at > self.drop_after:
+                tx.status = ChainTransaction.Status.DROPPED
+                tx.error = 'Transaction was not found on chain'
+                logger.warning(f'Transaction {tx.digest} ({tx.operation}) was never found on chain')
+        ChainTransaction.objects.bulk_update(batch, self.FIELDS)
+        return confirmed
+
+    def run(self, limit=None):
+        """
+        Check pending transactions, oldest first.
+
+        Returns:
+            Number of transactions confirmed
+        """
+        pending = self.pending(limit)
+        confirmed = 0
+        for i in range(0, len(pending), self.batch_size):
+            batch = pending[i:i + self.batch_size]
+            try:
+                confirmed += self.check_batch(batch)
+            except TransactionError as e:
+                # Unreachable fullnode: leave the batch pending for the next run
+                logger.warning(f'Could not check {len(batch)} pending transactions: {e}')
+        if pending:
+            logger.info(f'Confirmed {confirmed} of {len(pending)} pending transactions')
+        return confirmed
@@ -3,6 +3,7 @@ from main.views import auth, permviews
 from django.urls import path, include
 from ajo.views.wallet import AjoUserViewSet, NotificationViewSet
 from ajo.views.groups import SavingsGroupViewSet
+from ajo.views.stream import notification_stream
 
 
 router = routers.DefaultRouter()
@@ -12,5 +13,7 @@ router.register(r'notifications', NotificationViewSet, basename='notification')
 
 
 urlpatterns = [
+    # Before the router, which would take "stream" for a notification id
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
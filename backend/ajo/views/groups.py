@@ -4,13 +4,23 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from logging import getLogger
-from ajo.models import SavingsGroup, AjoUser, MyNotification
+from django.db.models import OuterRef, Prefetch, Subquery
+from main.models import User
+from ajo.models import SavingsGroup, AjoUser, CycleSummary, ChainTransaction
 from ajo.serializers import (
     SavingsGroupSerializer,
     SavingsGroupCreateSerializer,
     SavingsGroupListSerializer,
-    AjoUserSerializer
+    AjoUserSerializer,
+    CycleSummarySerializer,
+    ChainStateSerializer,
+    ChainTransactionSerializer
 )
+from asgiref.sync import async_to_sync
+from ajo.chain_cache import get_sdk
+from ajo.sui_tools import SavingsGroupError, normalize_address
+from ajo.transactions import track_transaction
+from ajo.notifications import notify_group
 
 
 logger = getLogger(__name__)
@@ -35,12 +45,30 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
             return SavingsGroupListSerializer
         return SavingsGroupSerializer
     
+    # Actions that render every participant with their AjoUser profile
+    PARTICIPANT_ACTIONS = ['retrieve', 'update', 'partial_update', 'participants_list']
+    
     def get_queryset(self):
         """
         Filter queryset based on user permissions.
         Users can only see groups they participate in.
+        
+        Participants and their AjoUser profiles are loaded up front for the
+        actions that render them, so the query count does not grow with the
+        size of the group.
         """
-        return SavingsGroup.objects.filter(participants=self.request.user)
+        creation_status = ChainTransaction.objects.filter(
+            digest=OuterRef('digest')
+        ).values('status')[:1]
+        queryset = SavingsGroup.objects.filter(participants=self.request.user).annotate(
+            transaction_status=Subquery(creation_status)
+        )
+        
+        if self.action in self.PARTICIPANT_ACTIONS:
+            queryset = queryset.prefetch_related(
+                Prefetch('participants', queryset=User.objects.select_related('ajo'))
+            )
+        return queryset
     
     def perform_create(self, serializer):
         """
@@ -52,36 +80,18 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
         savings_group = serializer.save()
         savings_group.participants.add(self.request.user)
         
-        # Send notifications to all participants (including creator)
-        self.send_group_creation_notifications(savings_group)
-    
-    def send_group_creation_notifications(self, savings_group):
-        """
-        Send notification to all participants about the new savings group.
-        """
-        creator = self.request.user
-        participants = savings_group.participants.all()
-        
-        logger.debug(participants)
-        notifications = []
-        for participant in participants:
-            if participant == creator:
-                # Different message for the creator
-                message = f"You have successfully created the savings group '{savings_group.name}'. Your contribution cycle starts soon!"
-            else:
-                # Message for invited participants
-                message = f"You have been invited to join the savings group '{savings_group.name}' by {creator.get_full_name() or creator.username}. Welcome to the contribution!"
-            
-            notification = MyNotification(
-                user=participant,
-                message=message,
-                #notification_type='group_invitation',  # Assuming this field exists
-                is_read=False
+        # Follow the creation transaction until it is confirmed on chain
+        if savings_group.digest:
+            wallet = getattr(self.request.user, 'ajo', None)
+            track_transaction(
+                savings_group.digest,
+                'create_savings_group',
+                sender=wallet.wallet_address if wallet else '',
+                group_address=savings_group.address_link,
             )
-            notifications.append(notification)
         
-        # Bulk create notifications for efficiency
-        MyNotification.objects.bulk_create(notifications)
+        # Notify all participants (including creator) once the group is saved
+        notify_group('group_created', savings_group, self.request.user)
     
     @action(detail=True, methods=['post'])
     def join_group(self, request, pk=None):
@@ -92,37 +102,24 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
         logger.debug(savings_group)
         user = request.user
         
-        if user in savings_group.participants.all():
+        if savings_group.participants.filter(pk=user.pk).exists():
             return Response(
                 {'detail': 'You are already a member of this group.'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # participants_count is kept up to date by the m2m_changed hook
         savings_group.participants.add(user)
+        savings_group.refresh_from_db(fields=['participants_count'])
         
-        # Send notification to the user who joined
-        MyNotification.objects.create(
-            user=user,
-            message=f"You have successfully joined the savings group '{savings_group.name}'. Welcome!",
-            notification_type='group_joined',
-            is_read=False
-        )
-        
-        # Notify other group members about the new participant
-        other_participants = savings_group.participants.exclude(id=user.id)
-        notifications = [
-            MyNotification(
-                user=participant,
-                message=f"{user.get_full_name() or user.username} has joined the savings group '{savings_group.name}'.",
-                notification_type='member_joined',
-                is_read=False
-            )
-            for participant in other_participants
-        ]
-        MyNotification.objects.bulk_create(notifications)
+        # Notify the new member and the rest of the group
+        notify_group('group_joined', savings_group, user)
         
         return Response(
-            {'detail': 'Successfully joined the savings group.'}, 
+            {
+                'detail': 'Successfully joined the savings group.',
+                'participants_count': savings_group.participants_count
+            }, 
             status=status.HTTP_200_OK
         )
     
@@ -134,15 +131,19 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
         savings_group = self.get_object()
         user = request.user
         
-        if user not in savings_group.participants.all():
+        if not savings_group.participants.filter(pk=user.pk).exists():
             return Response(
                 {'detail': 'You are not a member of this group.'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         savings_group.participants.remove(user)
+        savings_group.refresh_from_db(fields=['participants_count'])
         return Response(
-            {'detail': 'Successfully left the savings group.'}, 
+            {
+                'detail': 'Successfully left the savings group.',
+                'participants_count': savings_group.participants_count
+            }, 
             status=status.HTTP_200_OK
         )
     
@@ -160,7 +161,7 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
             )
         
         savings_group.active = True
-        savings_group.save()
+        savings_group.save(update_fields=['active'])
         
         return Response(
             {'detail': 'Savings group activated successfully.'}, 
@@ -181,7 +182,7 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
             )
         
         savings_group.active = False
-        savings_group.save()
+        savings_group.save(update_fields=['active'])
         
         return Response(
             {'detail': 'Savings group deactivated successfully.'}, 
@@ -194,7 +195,7 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
         Get list of all participants in a savings group.
         """
         savings_group = self.get_object()
-        participants = [x.ajo for x in savings_group.participants.all()]
+        participants = [x.ajo for x in savings_group.participants.all() if hasattr(x, 'ajo')]
         
         # Use the AjoUserSerializer for consistent participant data
         
@@ -225,4 +226,86 @@ class SavingsGroupViewSet(viewsets.ModelViewSet):
         """
         inactive_groups = self.get_queryset().filter(active=False)
         serializer = self.get_serializer(inactive_groups, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def cycle_summary(self, request, pk=None):
+        """
+        Get contributors, pending contributors and the next recipient for a
+        cycle (the current one unless ?cycle= is given), read from the local
+        contribution ledger instead of the chain. The current cycle is the
+        latest one with indexed activity, or the one opened by the last
+        indexed CycleCompleted.
+        """
+        savings_group = self.get_object()
+        summaries = CycleSummary.objects.filter(
+            group_address=normalize_address(savings_group.address_link)
+        )
+        
+        cycle = request.query_params.get('cycle', None)
+        if cycle is not None:
+            if not cycle.isdigit():
+                return Response(
+                    {'detail': 'cycle must be a positive integer.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            summaries = summaries.filter(cycle=int(cycle))
+        
+        summary = summaries.order_by('-cycle').first()
+        if summary is None:
+            return Response(
+                {'detail': 'No on-chain activity has been indexed for this group yet.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(CycleSummarySerializer(summary).data, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'])
+    def chain_state(self, request, pk=None):
+        """
+        Get the group's live on-chain state. Reads go through the shared state
+        cache, so hot groups do not hit the fullnode on every request.
+        """
+        savings_group = self.get_object()
+        try:
+            address = int(savings_group.address_link or '0x0', 16)
+        except ValueError:
+            address = -1
+        if not 0 <= address < 1 << 256:
+            return Response(
+                {'detail': 'This group has an invalid on-chain address.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        if address == 0:
+            return Response(
+                {'detail': 'This group has not been created on chain yet.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        try:
+            info = async_to_sync(get_sdk().get_group_info)(savings_group.address_link)
+        except SavingsGroupError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            logger.error(f'Failed to read chain state for {savings_group.address_link}: {e}')
+            return Response(
+                {'detail': 'Could not reach the Sui network.'},
+                status=status.HTTP_502_BAD_GATEWAY
+            )
+        
+        return Response(ChainStateSerializer(info).data, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'])
+    def transactions(self, request, pk=None):
+        """
+        Get the tracked transactions of a group, newest first, with the
+        status confirmed by the transaction checker.
+        """
+        savings_group = self.get_object()
+        transactions = ChainTransaction.objects.filter(
+            group_address=normalize_address(savings_group.address_link)
+        ).exclude(
+            status=ChainTransaction.Status.REJECTED
+        ).order_by('-submitted_at')[:50]
+        
+        return Response(ChainTransactionSerializer(transactions, many=True).data, status=status.HTTP_200_OK)
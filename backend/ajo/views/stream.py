@@ -0,0 +1,109 @@
+import asyncio
+import json
+from logging import getLogger
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from ajo.models import MyNotification
+from ajo.notification_stream import get_hub, redeem_stream_ticket
+from ajo.serializers import NotificationSerializer
+from main.authentication import CachedJWTAuthentication
+from main.models import User
+
+
+logger = getLogger(__name__)
+
+
+def authenticate_stream(request):
+    """
+    Resolve the user from a Bearer header or, since EventSource cannot set
+    headers, from a single-use ticket in ?ticket= (POST
+    notifications/stream-ticket/). Access tokens are not accepted in the URL,
+    where they would end up in access logs and browser history. Unconfirmed
+    users are refused, as by main.perm.Authenticated.
+    """
+    auth = CachedJWTAuthentication()
+    try:
+        header = auth.get_header(request)
+        if header:
+            raw_token = auth.get_raw_token(header)
+            user = auth.get_user(auth.get_validated_token(raw_token)) if raw_token else None
+        else:
+            ticket = request.GET.get('ticket')
+            user_id = redeem_stream_ticket(ticket) if ticket else None
+            user = User.objects.filter(pk=user_id, is_active=True).first() if user_id else None
+    except (InvalidToken, AuthenticationFailed):
+        return None
+    if user is None or not user.confirmed:
+        return None
+    return user
+
+
+def sse_event(notification_data):
+    return f"id: {notification_data['id']}\nevent: notification\ndata: {json.dumps(notification_data)}\n\n"
+
+
+def missed_notifications(user, last_event_id):
+    """Notifications created after the last one the client received, oldest first"""
+    notifications = MyNotification.objects.filter(user=user, id__gt=last_event_id).order_by('id')
+    return NotificationSerializer(notifications[:settings.NOTIFICATION_STREAM_REPLAY_LIMIT], many=True).data
+
+
+async def event_stream(user, last_event_id=None, hub=None):
+    hub = hub or get_hub()
+    queue = await hub.subscribe(user.id)
+    try:
+        yield f'retry: {settings.NOTIFICATION_STREAM_RETRY_MS}\n\n'
+        
+        # Subscribed before replaying, so nothing created in between is lost
+        if last_event_id is not None:
+            for notification in await sync_to_async(missed_notifications)(user, last_event_id):
+                last_event_id = notification['id']
+                yield sse_event(notification)
+        
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+            notification = json.loads(message)
+            if last_event_id is not None and notification['id'] <= last_event_id:
+                continue
+            yield sse_event(notification)
+    finally:
+        await hub.unsubscribe(user.id, queue)
+
+
+async def notification_stream(request):
+    """
+    Stream the authenticated user's new notifications as Server-Sent Events.
+    Reconnecting clients send Last-Event-ID (or ?last_event_id=) to receive
+    what they missed while disconnected.
+    """
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided or are invalid.'},
+            status=401
+        )
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+    
+    response = StreamingHttpResponse(
+        event_stream(user, last_event_id),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -2,32 +2,118 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
-from ajo.models import AjoUser, MyNotification
-from ajo.serializers import AjoUserSerializer, NotificationSerializer
+from ajo.models import AjoUser, MyNotification, ChainTransaction
+from ajo.serializers import (
+    AjoUserSerializer,
+    NotificationSerializer,
+    ChainTransactionSerializer,
+    TrackTransactionSerializer,
+)
+from ajo.notification_stream import issue_stream_ticket
+from ajo.pagination import NotificationCursorPagination
+from ajo.sui_tools import normalize_address
+from ajo.transactions import track_transaction
+from main.perm import Authenticated
 
 class NotificationViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
     
     def list(self, request):
         """
-        Returns all notifications for the authenticated user
-        Can be filtered by notification_type and is_read status
+        Returns the authenticated user's notifications, newest first, one
+        cursor page at a time (?cursor=, ?page_size=)
+        Can be filtered by notification_type (?type=, comma separated) and is_read status
         """
-        queryset = MyNotification.objects.filter(user=request.user).order_by('-id')
+        queryset = MyNotification.objects.filter(user=request.user)
         
         # Optional filters
-        notification_type = request.query_params.get('type', None)
+        notification_types, error = self._notification_types(request)
+        if error:
+            return error
         is_read = request.query_params.get('is_read', None)
         
-        if notification_type:
-            queryset = queryset.filter(notification_type=notification_type)
+        if notification_types:
+            queryset = queryset.filter(notification_type__in=notification_types)
         if is_read is not None:
             queryset = queryset.filter(is_read=is_read.lower() == 'true')
         
-        serializer = NotificationSerializer(queryset, many=True)
-        return Response(serializer.data)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = NotificationSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        """
+        Returns the number of unread notifications for the authenticated user
+        (optionally of the types given in ?type=)
+        """
+        notification_types, error = self._notification_types(request)
+        if error:
+            return error
+        queryset = MyNotification.objects.filter(user=request.user, is_read=False)
+        if notification_types:
+            queryset = queryset.filter(notification_type__in=notification_types)
+        return Response({'unread': queryset.count()})
+    
+    def _notification_types(self, request):
+        """
+        Parse ?type= into a list of notification types.
+        
+        Returns:
+            (types, error response)
+        """
+        value = request.query_params.get('type', '')
+        notification_types = [t for t in value.split(',') if t]
+        unknown = set(notification_types) - set(MyNotification.Type.values)
+        if unknown:
+            return None, Response(
+                {'detail': f"Unknown notification type: {', '.join(sorted(unknown))}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return notification_types, None
+    
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        """
+        Marks notifications as read in a single UPDATE.
+        Pass "ids" to mark specific notifications, or "up_to_id" to mark
+        everything up to and including that id (omit both to mark all).
+        """
+        ids = request.data.get('ids', None)
+        up_to_id = request.data.get('up_to_id', None)
+        
+        queryset = MyNotification.objects.filter(user=request.user, is_read=False)
+        try:
+            if ids is not None:
+                if not isinstance(ids, list):
+                    raise ValueError
+                queryset = queryset.filter(id__in=[int(i) for i in ids])
+            if up_to_id is not None:
+                queryset = queryset.filter(id__lte=int(up_to_id))
+        except (TypeError, ValueError):
+            return Response(
+                {'detail': 'ids must be a list of integers and up_to_id an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        updated = queryset.update(is_read=True)
+        return Response({'updated': updated})
+    
+    @action(detail=False, methods=['post'], url_path='stream-ticket', permission_classes=[Authenticated])
+    def stream_ticket(self, request):
+        """
+        Returns a single-use ticket that opens the notification stream
+        (GET notifications/stream/?ticket=) within NOTIFICATION_STREAM_TICKET_SECONDS
+        """
+        return Response({
+            'ticket': issue_stream_ticket(request.user),
+            'expires_in': settings.NOTIFICATION_STREAM_TICKET_SECONDS,
+        })
 
 
 class AjoUserViewSet(viewsets.ModelViewSet):
@@ -42,6 +128,8 @@ class AjoUserViewSet(viewsets.ModelViewSet):
     - PATCH /ajo-users/{id}/ - Partially update a specific AjoUser
     - DELETE /ajo-users/{id}/ - Delete a specific AjoUser
     - GET /ajo-users/my-profile/ - Get current user's AjoUser profile
+    - GET /ajo-users/transactions/ - List transactions sent from the user's wallet
+    - POST /ajo-users/transactions/ - Report a digest signed by the user's wallet
     """
     
     queryset = AjoUser.objects.select_related('user').order_by('-id')
@@ -136,5 +224,39 @@ class AjoUserViewSet(viewsets.ModelViewSet):
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-
-
+    
+    @action(detail=False, methods=['get', 'post'], url_path='transactions')
+    def transactions(self, request):
+        """
+        List transactions sent from the current user's wallet (filter with
+        ?status=), or report a digest so the backend confirms it on chain.
+        """
+        try:
+            ajo_user = AjoUser.objects.get(user=request.user)
+        except AjoUser.DoesNotExist:
+            return Response(
+                {'detail': 'AjoUser profile not found for current user.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        if request.method == 'POST':
+            serializer = TrackTransactionSerializer(data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            transaction, created = track_transaction(
+                sender=ajo_user.wallet_address, **serializer.validated_data
+            )
+            return Response(
+                ChainTransactionSerializer(transaction).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
+        
+        transactions = ChainTransaction.objects.filter(
+            sender=normalize_address(ajo_user.wallet_address)
+        ).order_by('-submitted_at')
+        
+        tx_status = request.query_params.get('status', None)
+        if tx_status:
+            transactions = transactions.filter(status=tx_status)
+        
+        return Response(ChainTransactionSerializer(transactions[:50], many=True).data)
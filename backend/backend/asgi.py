@@ -13,4 +13,28 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+
+async def application(scope, receive, send):
+    """
+    Django does not handle ASGI lifespan events, so uvicorn worker start and
+    shutdown are handled here before delegating everything else to Django.
+    """
+    if scope['type'] == 'lifespan':
+        from django.conf import settings
+        from ajo.sui_pool import init_client_pool, get_client_pool
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                init_client_pool(size=settings.SUI_RPC_POOL_SIZE, keepalive=settings.SUI_RPC_KEEPALIVE_SECONDS)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                pool = get_client_pool()
+                await pool.aclose()
+                pool.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    return await django_application(scope, receive, send)
@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
@@ -7,3 +8,19 @@ app = Celery('backend')
 app.config_from_object('django.conf:settings', namespace= 'CELERY')
 app.autodiscover_tasks()
 
+
+@worker_process_init.connect
+def init_sui_client_pool(**kwargs):
+    # Each prefork child gets its own pool; sockets must not cross a fork
+    from django.conf import settings
+    from ajo.sui_pool import init_client_pool
+    init_client_pool(size=settings.SUI_RPC_POOL_SIZE, keepalive=settings.SUI_RPC_KEEPALIVE_SECONDS)
+
+
+@worker_process_shutdown.connect
+def close_sui_client_pool(**kwargs):
+    from ajo import chain_queue
+    from ajo.sui_pool import close_client_pool
+    chain_queue.shutdown()
+    close_client_pool()
+
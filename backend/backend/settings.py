@@ -109,6 +109,77 @@ CELERY_BROKER_URL= os.environ['CELERY_BROKER_URL']
 CELERY_RESULT_BACKEND = f'db+postgresql://{os.environ["DATABASE_USER"]}:{os.environ["DATABASE_PASSWORD"]}@{os.environ["DATABASE_HOST"]}:{os.environ["DATABASE_PORT"]}/{os.environ["DATABASE_NAME"]}'
 
 
+# Sui RPC client pool (see ajo/sui_pool.py)
+SUI_RPC_POOL_SIZE = int(os.environ.get('SUI_RPC_POOL_SIZE', 10))
+SUI_RPC_KEEPALIVE_SECONDS = float(os.environ.get('SUI_RPC_KEEPALIVE_SECONDS', 60))
+
+# On-chain event indexer (see ajo/indexer.py)
+SUI_PACKAGE_ID = os.environ.get('SUI_PACKAGE_ID', '')
+SUI_INDEXER_PAGE_SIZE = int(os.environ.get('SUI_INDEXER_PAGE_SIZE', 50))
+SUI_INDEXER_MAX_PAGES = int(os.environ.get('SUI_INDEXER_MAX_PAGES', 20))
+SUI_INDEXER_INTERVAL_SECONDS = float(os.environ.get('SUI_INDEXER_INTERVAL_SECONDS', 15))
+
+# Read-through cache for on-chain group state (see ajo/chain_cache.py)
+SUI_STATE_CACHE_ALIAS = 'default'
+SUI_STATE_CACHE_TTL_SECONDS = float(os.environ.get('SUI_STATE_CACHE_TTL_SECONDS', 10))
+SUI_STATE_CACHE_VERSION_TTL_SECONDS = float(os.environ.get('SUI_STATE_CACHE_VERSION_TTL_SECONDS', 3600))
+
+# Chain submission queue (see ajo/chain_queue.py)
+SUI_KEYSTORE_PATH = os.environ.get('SUI_KEYSTORE_PATH', '')
+SUI_CHAIN_QUEUE = os.environ.get('SUI_CHAIN_QUEUE', 'chain')
+SUI_CHAIN_RATE_LIMIT = os.environ.get('SUI_CHAIN_RATE_LIMIT', '10/s')  # Per chain worker node, not global
+SUI_CHAIN_MAX_RETRIES = int(os.environ.get('SUI_CHAIN_MAX_RETRIES', 5))
+SUI_CHAIN_SIGNER_WAIT_SECONDS = float(os.environ.get('SUI_CHAIN_SIGNER_WAIT_SECONDS', 5))
+SUI_CHAIN_SIGNER_RETRY_SECONDS = float(os.environ.get('SUI_CHAIN_SIGNER_RETRY_SECONDS', 2))
+SUI_CHAIN_SIGNER_LOCK_SECONDS = float(os.environ.get('SUI_CHAIN_SIGNER_LOCK_SECONDS', 120))
+
+# Transaction tracking (see ajo/transactions.py)
+SUI_TX_CHECK_BATCH_SIZE = int(os.environ.get('SUI_TX_CHECK_BATCH_SIZE', 50))
+SUI_TX_CHECK_INTERVAL_SECONDS = float(os.environ.get('SUI_TX_CHECK_INTERVAL_SECONDS', 5))
+SUI_TX_DROP_AFTER_SECONDS = float(os.environ.get('SUI_TX_DROP_AFTER_SECONDS', 600))
+
+# Its own Redis database: clearing the cache flushes the whole database
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['CACHE_REDIS_URL'],
+        'KEY_PREFIX': 'suifund',
+    }
+}
+
+# Server-push notification stream (see ajo/notification_stream.py)
+NOTIFICATION_REDIS_URL = os.environ.get('NOTIFICATION_REDIS_URL', CACHES['default']['LOCATION'])
+NOTIFICATION_CHANNEL_PREFIX = os.environ.get('NOTIFICATION_CHANNEL_PREFIX', 'suifund:notifications')
+NOTIFICATION_STREAM_KEEPALIVE_SECONDS = float(os.environ.get('NOTIFICATION_STREAM_KEEPALIVE_SECONDS', 15))
+NOTIFICATION_STREAM_RETRY_MS = int(os.environ.get('NOTIFICATION_STREAM_RETRY_MS', 5000))
+NOTIFICATION_STREAM_QUEUE_SIZE = int(os.environ.get('NOTIFICATION_STREAM_QUEUE_SIZE', 100))
+NOTIFICATION_STREAM_REPLAY_LIMIT = int(os.environ.get('NOTIFICATION_STREAM_REPLAY_LIMIT', 100))
+NOTIFICATION_STREAM_TICKET_SECONDS = int(os.environ.get('NOTIFICATION_STREAM_TICKET_SECONDS', 30))
+
+# Notification fan-out (see ajo/notifications.py)
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.environ.get('NOTIFICATION_FANOUT_CHUNK_SIZE', 500))
+NOTIFICATION_BULK_BATCH_SIZE = int(os.environ.get('NOTIFICATION_BULK_BATCH_SIZE', 250))
+NOTIFICATION_EMAIL_DIGESTS = int(os.environ.get('NOTIFICATION_EMAIL_DIGESTS', 0))
+NOTIFICATION_DIGEST_WINDOW_SECONDS = int(os.environ.get('NOTIFICATION_DIGEST_WINDOW_SECONDS', 900))
+NOTIFICATION_DIGEST_LIMIT = int(os.environ.get('NOTIFICATION_DIGEST_LIMIT', 20))
+
+CELERY_TASK_ROUTES = {
+    'ajo.tasks.submit_chain_transaction': {'queue': SUI_CHAIN_QUEUE},
+}
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+CELERY_BEAT_SCHEDULE = {
+    'index-chain-events': {
+        'task': 'ajo.tasks.index_chain_events',
+        'schedule': SUI_INDEXER_INTERVAL_SECONDS,
+    },
+    'check-chain-transactions': {
+        'task': 'ajo.tasks.check_chain_transactions',
+        'schedule': SUI_TX_CHECK_INTERVAL_SECONDS,
+    },
+}
+
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -273,7 +344,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'main.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 16
@@ -288,6 +359,27 @@ SPECTACULAR_SETTINGS = {
 }
 
 
+# Cached user snapshots for JWT authentication (see main/authentication.py)
+AUTH_USER_CACHE_ALIAS = os.environ.get('AUTH_USER_CACHE_ALIAS', 'default')
+AUTH_USER_CACHE_SECONDS = int(os.environ.get('AUTH_USER_CACHE_SECONDS', 300))
+AUTH_USER_LOCAL_CACHE_SIZE = int(os.environ.get('AUTH_USER_LOCAL_CACHE_SIZE', 1024))
+AUTH_USER_LOCAL_CACHE_SECONDS = float(os.environ.get('AUTH_USER_LOCAL_CACHE_SECONDS', 10))
+
+# Password hashing processes per web/worker process (see main/hashing.py); 0 hashes inline
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+# Background hashes (registrations, password resets) waiting per process before new ones get 503
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
+# How long a registration or password reset status can be polled (see main/registration.py)
+REGISTRATION_STATUS_SECONDS = int(os.environ.get('REGISTRATION_STATUS_SECONDS', 3600))
+# Pending longer than this means the worker holding it died; reported as failed
+REGISTRATION_PENDING_SECONDS = int(os.environ.get('REGISTRATION_PENDING_SECONDS', 300))
+
+# Bulk user provisioning (see main/provisioning.py)
+PROVISIONING_CHUNK_SIZE = int(os.environ.get('PROVISIONING_CHUNK_SIZE', 500))
+PROVISIONING_EMAIL_BATCH_SIZE = int(os.environ.get('PROVISIONING_EMAIL_BATCH_SIZE', 50))
+PROVISIONING_MAX_UPLOAD_BYTES = int(os.environ.get('PROVISIONING_MAX_UPLOAD_BYTES', 20 * 1024 * 1024))
+
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=3),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
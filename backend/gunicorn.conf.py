@@ -0,0 +1,16 @@
+# Gunicorn configuration, loaded by run.sh with `gunicorn -c gunicorn.conf.py`
+
+
+def post_worker_init(worker):
+    # The application (and Django settings) is loaded by the time this runs
+    from django.conf import settings
+    from ajo.sui_pool import init_client_pool
+    init_client_pool(size=settings.SUI_RPC_POOL_SIZE, keepalive=settings.SUI_RPC_KEEPALIVE_SECONDS)
+
+
+def worker_exit(server, worker):
+    from ajo.sui_pool import close_client_pool
+    from main import hashing
+    close_client_pool()
+    # Marks registrations and password resets still queued as failed
+    hashing.shutdown()
@@ -0,0 +1,190 @@
+"""
+JWT authentication without a database read per request.
+
+CachedJWTAuthentication verifies the token exactly like simplejwt's
+JWTAuthentication, but resolves the user from a compact snapshot instead of
+loading the whole row: the fields permission checks read, plus the profile
+fields views and serializers read on nearly every request (names, email,
+image). Snapshots live in Redis (AUTH_USER_CACHE_ALIAS,
+AUTH_USER_CACHE_SECONDS) and in a small per-process LRU
+(AUTH_USER_LOCAL_CACHE_SIZE entries, each trusted for
+AUTH_USER_LOCAL_CACHE_SECONDS).
+
+The user handed to views is a real User instance with only the snapshot
+fields loaded. Django fetches every other field with its own query the
+first time it is read, so a view that needs more of the row should load it
+once with User.objects.get(pk=request.user.pk). Saving or deleting a user
+drops its snapshot (see main/signals.py). Other processes' LRUs catch up
+once their entry expires. Code that changes users with QuerySet.update()
+must call invalidate_users() itself.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from logging import getLogger
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from main.models import User
+
+logger = getLogger(__name__)
+
+
+# Fields kept in a snapshot, in model field order
+SNAPSHOT_FIELDS = [
+    f.attname for f in User._meta.concrete_fields
+    if f.attname in {
+        'id', 'is_superuser', 'is_staff', 'is_active', 'confirmed', 'permission_bits',
+        'username', 'first_name', 'last_name', 'email', 'image',
+    }
+]
+
+
+def _cache():
+    return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+
+# Bump when SNAPSHOT_FIELDS changes so snapshots of the old shape are not read
+SNAPSHOT_VERSION = 2
+
+
+def _cache_key(user_id):
+    return f'auth:user:v{SNAPSHOT_VERSION}:{user_id}'
+
+
+class LocalUserCache:
+    """Thread-safe LRU of user snapshots with a per-entry lifetime"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def set(self, user_id, snapshot):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_ids: Iterable):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local = None
+
+
+def get_local_cache() -> LocalUserCache:
+    global _local
+    if _local is None:
+        _local = LocalUserCache(settings.AUTH_USER_LOCAL_CACHE_SIZE, settings.AUTH_USER_LOCAL_CACHE_SECONDS)
+    return _local
+
+
+def user_from_snapshot(snapshot) -> User:
+    """A User with the snapshot fields loaded and every other field deferred"""
+    return User.from_db(User.objects.db, SNAPSHOT_FIELDS, snapshot)
+
+
+def load_snapshot(user_id) -> Optional[tuple]:
+    """
+    The user's snapshot from the local LRU, then Redis, then the database.
+
+    Returns:
+        The snapshot, or None if the user does not exist
+    """
+    local = get_local_cache()
+    snapshot = local.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    cache = _cache()
+    key = _cache_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        row = User.objects.filter(pk=user_id).values_list(*SNAPSHOT_FIELDS).first()
+        if row is None:
+            return None
+        snapshot = tuple(row)
+        cache.set(key, snapshot, settings.AUTH_USER_CACHE_SECONDS)
+    local.set(user_id, snapshot)
+    return snapshot
+
+
+def invalidate_users(user_ids: Iterable):
+    """Drop cached snapshots now and again once the current transaction commits"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    def drop():
+        get_local_cache().discard(user_ids)
+        _cache().delete_many([_cache_key(user_id) for user_id in user_ids])
+
+    drop()
+    # A request reading the old row before the commit may have cached it again
+    transaction.on_commit(drop)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves users from cached snapshots.
+
+    The validated token's claims (e.g. user_type) are set on the request as
+    request.token_claims so permission classes can read them without
+    decoding the token again.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            request.token_claims = result[1].payload
+        return result
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            # Needs the password hash or another lookup field
+            return super().get_user(validated_token)
+
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        except (TypeError, ValueError):
+            raise InvalidToken('Token contained an invalid user identification')
+
+        snapshot = load_snapshot(user_id)
+        if snapshot is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+        user = user_from_snapshot(snapshot)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
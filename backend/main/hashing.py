@@ -0,0 +1,250 @@
+"""
+Password hashing off the calling thread.
+
+Password hashers are deliberately slow and CPU bound, so hashing in a web
+worker holds up every other request it serves. Hashes are computed in a
+process pool of PASSWORD_HASH_WORKERS processes, created on first use and
+kept for the life of the process (0 hashes inline). The pool is started
+with forkserver (spawn where that is unavailable): forking a multi-threaded
+uvicorn worker could hand a child a lock held by another thread.
+
+- hash_passwords / hash_password wait for the pool. The waiting thread
+  does not hold the GIL.
+- hash_in_background returns at once and calls back from a completion
+  thread. At most PASSWORD_HASH_MAX_PENDING hashes wait at a time; beyond
+  that it raises HashingBusy, so a signup burst is refused instead of
+  queueing without bound. Hashes still queued when the process shuts down
+  are cancelled and reported to their on_error as HashingInterrupted.
+
+Counters for throughput are kept in the default cache (see HashingMetrics).
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from logging import getLogger
+from typing import Callable, Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import close_old_connections
+
+logger = getLogger(__name__)
+
+
+def _init_worker(settings_module):
+    # Spawned workers start without Django; forked ones already have it
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        django.setup()
+
+
+def _hash(password: Optional[str]) -> str:
+    # None gives an unusable password
+    return make_password(password)
+
+
+class HashingBusy(Exception):
+    """Too many hashes are already waiting"""
+
+
+class HashingInterrupted(Exception):
+    """The process shut down before a background hash was computed"""
+
+
+class HashingMetrics:
+    """Hashing counters shared by every process, kept in the default cache"""
+
+    PREFIX = 'auth:hashing:metrics'
+    COUNTERS = ['completed', 'failed', 'rejected', 'hash_ms']
+
+    def _key(self, name):
+        return f'{self.PREFIX}:{name}'
+
+    def incr(self, name, amount=1):
+        key = self._key(name)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, None)
+
+    def record(self, count, started):
+        """Count hashes finished since started (a time.monotonic() value)"""
+        cache.add(self._key('since'), time.time(), None)
+        self.incr('completed', count)
+        self.incr('hash_ms', int((time.monotonic() - started) * 1000))
+
+    def snapshot(self) -> Dict[str, float]:
+        keys = [self._key(name) for name in self.COUNTERS + ['since']]
+        values = cache.get_many(keys)
+        snapshot = {name: int(values.get(self._key(name), 0)) for name in self.COUNTERS}
+        since = values.get(self._key('since'))
+        elapsed = time.time() - since if since else 0
+        snapshot['per_second'] = round(snapshot['completed'] / elapsed, 2) if elapsed > 0 else 0
+        snapshot['avg_ms'] = round(snapshot['hash_ms'] / snapshot['completed'], 1) if snapshot['completed'] else 0
+        return snapshot
+
+    def reset(self):
+        cache.delete_many([self._key(name) for name in self.COUNTERS + ['since']])
+
+
+metrics = HashingMetrics()
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_completions: Optional[ThreadPoolExecutor] = None
+_pending: Optional[threading.BoundedSemaphore] = None
+# on_error of background hashes that have not started, by job id
+_queued: Dict[int, Optional[Callable[[Exception], None]]] = {}
+_job_ids = itertools.count()
+_executor_lock = threading.Lock()
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def get_hash_executor() -> Optional[ProcessPoolExecutor]:
+    """The process pool, or None if hashing runs inline"""
+    global _executor
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=_mp_context(),
+                    initializer=_init_worker,
+                    initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings'),),
+                )
+                logger.info(f'Started {settings.PASSWORD_HASH_WORKERS} password hashing processes')
+    return _executor
+
+
+def _background():
+    global _completions, _pending
+    if _completions is None:
+        with _executor_lock:
+            if _completions is None:
+                _pending = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+                # Completion threads mostly wait on the pool; one per worker process keeps it busy
+                _completions = ThreadPoolExecutor(
+                    max_workers=max(1, settings.PASSWORD_HASH_WORKERS),
+                    thread_name_prefix='password-hash',
+                )
+    return _completions, _pending
+
+
+def shutdown():
+    """
+    Stop hashing. Hashes already running finish; queued ones are cancelled
+    and their on_error gets HashingInterrupted. Called from worker exit hooks.
+    """
+    global _executor, _completions, _pending
+    with _executor_lock:
+        executor, _executor = _executor, None
+        completions, _completions, _pending = _completions, None, None
+    if completions is not None:
+        completions.shutdown(wait=True, cancel_futures=True)
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    with _executor_lock:
+        interrupted = list(_queued.values())
+        _queued.clear()
+    if interrupted:
+        logger.warning(f'Cancelled {len(interrupted)} queued password hashes at shutdown')
+    for on_error in interrupted:
+        if on_error is not None:
+            try:
+                on_error(HashingInterrupted())
+            except Exception:
+                logger.exception('Could not report an interrupted password hash')
+
+
+def hash_passwords(passwords: Sequence[Optional[str]]) -> List[str]:
+    """Hash passwords in the pool, in order. None entries get an unusable password."""
+    started = time.monotonic()
+    executor = get_hash_executor()
+    try:
+        if executor is None:
+            hashes = [_hash(password) for password in passwords]
+        else:
+            chunksize = max(1, len(passwords) // (settings.PASSWORD_HASH_WORKERS * 4))
+            hashes = list(executor.map(_hash, passwords, chunksize=chunksize))
+    except Exception:
+        metrics.incr('failed', len(passwords))
+        raise
+    metrics.record(len(hashes), started)
+    return hashes
+
+
+def hash_password(password: Optional[str]) -> str:
+    """Hash one password in the pool and wait for it"""
+    return hash_passwords([password])[0]
+
+
+def hash_in_background(
+    password: Optional[str],
+    on_hashed: Callable[[str], None],
+    on_error: Optional[Callable[[Exception], None]] = None
+):
+    """
+    Hash a password without waiting and pass the hash to on_hashed.
+
+    on_hashed and on_error run on a completion thread (inline when
+    PASSWORD_HASH_WORKERS is 0) and may use the database.
+
+    Raises:
+        HashingBusy: PASSWORD_HASH_MAX_PENDING hashes are already waiting
+    """
+    if get_hash_executor() is None:
+        _complete(password, on_hashed, on_error)
+        return
+
+    completions, pending = _background()
+    if not pending.acquire(blocking=False):
+        metrics.incr('rejected')
+        raise HashingBusy()
+
+    job_id = next(_job_ids)
+    with _executor_lock:
+        _queued[job_id] = on_error
+
+    def run():
+        with _executor_lock:
+            _queued.pop(job_id, None)
+        try:
+            _complete(password, on_hashed, on_error)
+        finally:
+            pending.release()
+            close_old_connections()
+
+    try:
+        completions.submit(run)
+    except RuntimeError:
+        # Shutting down
+        with _executor_lock:
+            _queued.pop(job_id, None)
+        pending.release()
+        raise HashingBusy()
+
+
+def _complete(password, on_hashed, on_error):
+    try:
+        password_hash = hash_password(password)
+        on_hashed(password_hash)
+    except Exception as e:
+        logger.exception('Background password hashing failed')
+        if on_error is not None:
+            on_error(e)
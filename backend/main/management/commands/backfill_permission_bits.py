@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from main.models import Permission, User
+from main.permission_registry import registry
+
+
+class Command(BaseCommand):
+    help = 'Assign bits to permissions and convert the legacy permission name arrays into User.permission_bits'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users read per query')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for permission in Permission.objects.filter(bit__isnull=True).order_by('pk'):
+            permission.save()
+        registry.load()
+
+        updated = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                User.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'legacy_permissions')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            # One UPDATE per distinct set of permission names in the batch
+            users_by_names = defaultdict(list)
+            for pk, names in batch:
+                if names:
+                    users_by_names[tuple(names)].append(pk)
+            for names, pks in users_by_names.items():
+                known = [name for name in names if registry.bit(name) is not None]
+                if len(known) != len(names):
+                    self.stderr.write(f'Skipping unregistered permissions: {", ".join(set(names) - set(known))}')
+                # OR the bits in, so running the command again keeps later grants
+                updated += User.objects.filter(pk__in=pks).grant_permissions(known)
+
+        self.stdout.write(f'Converted permissions for {updated} users')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from main.hashing import metrics
+
+
+class Command(BaseCommand):
+    help = 'Show password hashing throughput counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        for name, value in metrics.snapshot().items():
+            self.stdout.write(f'{name}: {value}')
+        if options['reset']:
+            metrics.reset()
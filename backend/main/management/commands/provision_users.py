@@ -0,0 +1,45 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.provisioning import FORMATS, guess_format, provision, read_records
+
+
+class Command(BaseCommand):
+    help = 'Create users in bulk from a CSV or JSON Lines file (- reads stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON Lines file, or - for stdin')
+        parser.add_argument('--input', choices=FORMATS, help='Input format (guessed from the file name by default)')
+        parser.add_argument('--chunk-size', type=int, help='Users inserted per chunk')
+        parser.add_argument(
+            '--confirm-url',
+            help='Absolute URL of the email confirmation endpoint; confirmation emails are only sent when given',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['input'] or guess_format(path)
+        if input_format is None:
+            raise CommandError('Cannot tell the input format, pass --input')
+
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        created = skipped = errors = 0
+        try:
+            for result in provision(
+                read_records(stream, input_format),
+                confirm_link=options['confirm_url'],
+                chunk_size=options['chunk_size'],
+            ):
+                created += result.created
+                skipped += len(result.skipped)
+                errors += len(result.errors)
+                for item in result.skipped:
+                    self.stderr.write(f"line {item['line']}: skipped {item['email']} ({item['reason']})")
+                for item in result.errors:
+                    self.stderr.write(f"line {item['line']}: {item['error']}")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(f'Created {created} users, skipped {skipped}, {errors} errors')
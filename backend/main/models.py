@@ -1,5 +1,5 @@
 #user_models.py
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from itsdangerous import TimedJSONWebSignatureSerializer as Serializer
 from itsdangerous.exc import BadSignature
@@ -20,20 +20,48 @@ class ActiveManager(models.Manager):
     def active(self):
         return self.filter(active=True)
 
-class UserManager(BaseUserManager):
+class UserQuerySet(models.QuerySet):
+    """Permission edits for many users, each a single UPDATE"""
+
+    def _update_permission_bits(self, value):
+        from main.authentication import invalidate_users
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = User.objects.filter(pk__in=user_ids).update(permission_bits=value)
+        invalidate_users(user_ids)
+        return updated
+
+    def grant_permissions(self, perm_names):
+        from main.permission_registry import registry
+        return self._update_permission_bits(models.F('permission_bits').bitor(registry.mask(perm_names)))
+
+    def revoke_permissions(self, perm_names):
+        from main.permission_registry import registry
+        return self._update_permission_bits(models.F('permission_bits').bitand(~registry.mask(perm_names)))
+
+    def set_permissions(self, perm_names):
+        from main.permission_registry import registry
+        return self._update_permission_bits(registry.mask(perm_names))
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
 
-    def _create_user(self, username, email, password, **extra_fields):
+    def _create_user(self, username, email, password, password_hash=None, **extra_fields):
+        """password_hash: an already hashed password (see main/hashing.py), used instead of password"""
         if not email:
             raise ValueError('The email must be set')
         email = self.normalize_email(email)
         user = self.model(email=email, username=username, **extra_fields)
-        user.set_password(password)
+        if password_hash is not None:
+            user.password = password_hash
+        else:
+            user.set_password(password)
         user.save(using=self._db)
         return user
 
     def create_user(self, username, email, password=None, **extra_fields):
         if(email in settings.ADMIN_EMAIL.split(',')):
+            extra_fields.pop('confirmed', None)
             return self.create_superuser(username, email, password, confirmed=True, **extra_fields)
         else:
             extra_fields.setdefault("is_staff", False)
@@ -66,11 +94,15 @@ class User(AbstractUser):
     app_user_id = models.CharField(unique=True, max_length=225)
     account = models.CharField(max_length=100, default = 'customer', choices=[('customer','customer'),('staff','staff')])
     
-    # PostgreSQL optimized:
-    permissions = ArrayField(
+    # One bit per Permission.bit (see main/permission_registry.py)
+    permission_bits = models.BigIntegerField(default=0)
+    # Permission names as stored before permission_bits; converted by the
+    # backfill_permission_bits command and no longer read or written
+    legacy_permissions = ArrayField(
         models.CharField(max_length=50),
         default=list,
-        blank=True
+        blank=True,
+        db_column='permissions'
     )
     
 
@@ -98,27 +130,36 @@ class User(AbstractUser):
     
     
     
+    @property
+    def permissions(self):
+        """Names of the user's permissions"""
+        from main.permission_registry import registry
+        return registry.names(self.permission_bits)
+
     def has_permission(self, perm_name):
-        """Check if permission exists in user's permission list"""
-        return perm_name in self.permissions
+        """Check if the permission's bit is set"""
+        from main.permission_registry import registry
+        bit = registry.bit(perm_name)
+        return bit is not None and bool(self.permission_bits >> bit & 1)
 
     def add_permission(self, perm_name):
-        perm_exists = Permission.objects.filter(name = perm_name).exists()
-        if not perm_exists:
-            return False
-    
         """Add a permission if not already present"""
-        if perm_name not in self.permissions:
-            self.permissions.append(perm_name)
-            self.save()
-        
+        from main.permission_registry import registry
+        bit = registry.bit(perm_name)
+        if bit is None:
+            return False
+        if not self.permission_bits >> bit & 1:
+            self.permission_bits |= 1 << bit
+            self.save(update_fields=['permission_bits'])
         return True
 
     def remove_permission(self, perm_name):
         """Remove a permission if exists"""
-        if perm_name in self.permissions:
-            self.permissions.remove(perm_name)
-            self.save()
+        from main.permission_registry import registry
+        bit = registry.bit(perm_name)
+        if bit is not None and self.permission_bits >> bit & 1:
+            self.permission_bits &= ~(1 << bit)
+            self.save(update_fields=['permission_bits'])
 
     # Keep your existing token methods
     def generate_confirmation_token(self, expiration=3600):
@@ -137,6 +178,7 @@ class User(AbstractUser):
 
         return True
     
+    @staticmethod
     def create_dummy_users(count=10):
         """
         Create dummy users using the Faker library.
@@ -144,25 +186,23 @@ class User(AbstractUser):
         Args:
             count (int): Number of dummy users to create.
         """
+        from main.provisioning import provision
+
         fake = Faker()
-        users = []
-
-        for _ in range(count):
-            users.append(
-                User(
-                    first_name=fake.first_name(),
-                    last_name=fake.last_name(),
-                    username=fake.user_name(),
-                    email=fake.unique.email(),
-                    image=None,  # You can add logic to generate or upload images if needed
-                    confirmed=fake.boolean(),
-                    app_user_id=fake.uuid4(),
-                )
-            )
-
-        # Bulk create users in the database
-        User.objects.bulk_create(users)
-        print(f"{count} dummy users created successfully.")
+        rows = (
+            (i, {
+                'first_name': fake.first_name(),
+                'last_name': fake.last_name(),
+                'username': fake.user_name(),
+                'email': fake.unique.email(),
+            }, None)
+            for i in range(1, count + 1)
+        )
+
+        # Goes through the bulk provisioning path, which generates app_user_id
+        created = sum(result.created for result in provision(rows))
+        print(f"{created} dummy users created successfully.")
+        return created
 
     @classmethod
     def load_user(cls, token):
@@ -191,12 +231,45 @@ class Contact(models.Model):
 
 
 class Permission(models.Model):
+    # Highest bit a signed 64-bit permission_bits column can hold
+    MAX_BIT = 62
+
     name = models.CharField(max_length=50, unique=True)
     app_label = models.CharField(max_length=50)
+    # Position in User.permission_bits; assigned once and never reused
+    bit = models.PositiveSmallIntegerField(unique=True, null=True, blank=True)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if self.bit is not None:
+            return super().save(*args, **kwargs)
+
+        # Take the bit above the high-water mark, so the bit of a deleted
+        # permission (still set on its former holders) is never handed out again
+        for attempt in range(5):
+            try:
+                with transaction.atomic():
+                    mark, _ = PermissionBitMark.objects.select_for_update().get_or_create(pk=1)
+                    highest = Permission.objects.aggregate(highest=models.Max('bit'))['highest']
+                    bit = max(mark.next_bit, 0 if highest is None else highest + 1)
+                    if bit > self.MAX_BIT:
+                        raise ValueError(f'No permission bits left for {self.name}')
+                    mark.next_bit = bit + 1
+                    mark.save(update_fields=['next_bit'])
+                    self.bit = bit
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                self.bit = None
+                if attempt == 4 or Permission.objects.filter(name=self.name).exists():
+                    raise
+
+
+class PermissionBitMark(models.Model):
+    """Single row holding the next Permission.bit to assign; it only goes up"""
+    next_bit = models.PositiveSmallIntegerField(default=0)
+
 # Update signal in models.py
 def register_permissions(permissions, app_label):
     for perm in permissions:
@@ -1,6 +1,5 @@
 from django.core.exceptions import PermissionDenied
 from rest_framework import permissions, mixins
-from rest_framework_simplejwt.tokens import AccessToken
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -25,6 +24,7 @@ class AdminAuthenticated(permissions.BasePermission):
         if not request.user.confirmed:
             raise PermissionDenied('User is not confirmed.')
 
-        token = AccessToken(request.META.get('HTTP_AUTHORIZATION').split(' ')[1])
-        logger.debug(token.get('user_type'))
-        return token.get('user_type') == 'admin'
+        # Claims of the token CachedJWTAuthentication already verified
+        claims = getattr(request, 'token_claims', None) or {}
+        logger.debug(claims.get('user_type'))
+        return claims.get('user_type') == 'admin'
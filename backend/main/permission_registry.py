@@ -0,0 +1,93 @@
+"""
+Permission name <-> bit map.
+
+Every Permission row owns a stable bit (Permission.bit) and a user's
+permissions are the bits set in User.permission_bits. The map is read from
+the database once per process and reloaded when a Permission is saved or
+deleted in this one. A name or bit that is missing from the map (a
+permission registered by another process, or a retired bit still set on
+a user) triggers a reload at most once every MISS_RELOAD_SECONDS, so
+repeated misses do not query the database on every call.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+MISS_RELOAD_SECONDS = 30
+
+
+class _Maps(NamedTuple):
+    by_name: Dict[str, int]
+    by_bit: Dict[int, str]
+    loaded_at: float
+
+
+class UnknownPermission(ValueError):
+    """A permission name that is not registered"""
+
+
+class PermissionRegistry:
+
+    def __init__(self, miss_reload_seconds: float = MISS_RELOAD_SECONDS):
+        # Replaced as a whole, so readers never see a half-updated map
+        self._maps: Optional[_Maps] = None
+        self._lock = threading.Lock()
+        self.miss_reload_seconds = miss_reload_seconds
+
+    def load(self) -> _Maps:
+        from main.models import Permission
+
+        rows = Permission.objects.filter(bit__isnull=False).values_list('name', 'bit')
+        by_name = dict(rows)
+        maps = _Maps(by_name, {bit: name for name, bit in by_name.items()}, time.monotonic())
+        with self._lock:
+            self._maps = maps
+        return maps
+
+    def reset(self):
+        with self._lock:
+            self._maps = None
+
+    def _current(self) -> _Maps:
+        maps = self._maps
+        return maps if maps is not None else self.load()
+
+    def _reload_after_miss(self, maps: _Maps) -> _Maps:
+        """A fresher map, or the same one if it was loaded too recently to retry"""
+        if time.monotonic() - maps.loaded_at < self.miss_reload_seconds:
+            return maps
+        return self.load()
+
+    def bit(self, perm_name: str) -> Optional[int]:
+        """The permission's bit, or None if it is not registered"""
+        maps = self._current()
+        if perm_name not in maps.by_name:
+            maps = self._reload_after_miss(maps)
+        return maps.by_name.get(perm_name)
+
+    def mask(self, perm_names: Iterable[str]) -> int:
+        """Bitset of the given permissions. Raises UnknownPermission for unregistered names."""
+        mask = 0
+        unknown = []
+        for name in perm_names:
+            bit = self.bit(name)
+            if bit is None:
+                unknown.append(name)
+            else:
+                mask |= 1 << bit
+        if unknown:
+            raise UnknownPermission(', '.join(unknown))
+        return mask
+
+    def names(self, bits: int) -> List[str]:
+        """Names of the permissions set in a bitset, in bit order"""
+        maps = self._current()
+        set_bits = [bit for bit in range(bits.bit_length()) if bits >> bit & 1]
+        if any(bit not in maps.by_bit for bit in set_bits):
+            maps = self._reload_after_miss(maps)
+        return [maps.by_bit[bit] for bit in set_bits if bit in maps.by_bit]
+
+
+registry = PermissionRegistry()
@@ -0,0 +1,194 @@
+"""
+Bulk user provisioning from CSV or JSON Lines.
+
+Records are read one at a time and handled in chunks of
+PROVISIONING_CHUNK_SIZE: one query finds emails that are already
+registered, passwords are hashed in the process pool (main/hashing.py), the
+users are inserted with one bulk INSERT per chunk, and confirmation emails
+are queued PROVISIONING_EMAIL_BATCH_SIZE recipients per Celery task once
+the chunk commits.
+
+bulk_create skips the pre_save signal, so app_user_id is generated here
+with the same generator main/signals.py uses.
+"""
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from logging import getLogger
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from main.hashing import hash_passwords
+from main.models import User
+from main.signals import generate_unique_id
+
+logger = getLogger(__name__)
+
+
+FORMATS = ('csv', 'jsonl')
+FIELDS = ('email', 'username', 'first_name', 'last_name', 'password')
+
+# (line number, record, error); record is None when the line could not be read
+Row = Tuple[int, Optional[Dict[str, str]], Optional[str]]
+
+
+def guess_format(filename: str = '', content_type: str = '') -> Optional[str]:
+    filename = (filename or '').lower()
+    if filename.endswith('.csv') or 'csv' in (content_type or ''):
+        return 'csv'
+    if filename.endswith(('.jsonl', '.ndjson')) or 'ndjson' in (content_type or '') or 'jsonl' in (content_type or ''):
+        return 'jsonl'
+    return None
+
+
+def read_records(stream, input_format: str) -> Iterator[Row]:
+    """Read user records from a text or binary stream without loading it whole"""
+    if input_format not in FORMATS:
+        raise ValueError(f'Unsupported format: {input_format}')
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if input_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f'Invalid JSON: {e.msg}'
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, 'Expected a JSON object'
+            continue
+        yield line_number, record, None
+
+
+def clean_record(record: Dict) -> Dict[str, Optional[str]]:
+    """Normalize one record. Raises ValidationError if it cannot be used."""
+    email = User.objects.normalize_email(str(record.get('email') or '').strip())
+    if not email:
+        raise ValidationError('email is required')
+    validate_email(email)
+
+    cleaned = {name: str(record.get(name) or '').strip() for name in FIELDS}
+    cleaned['email'] = email
+    cleaned['username'] = cleaned['username'] or email.split('@')[0]
+    cleaned['password'] = cleaned['password'] or None
+    for name, max_length in (('username', 100), ('first_name', 100), ('last_name', 100)):
+        if len(cleaned[name]) > max_length:
+            raise ValidationError(f'{name} is longer than {max_length} characters')
+    return cleaned
+
+
+@dataclass
+class ChunkResult:
+    chunk: int
+    created: int = 0
+    skipped: List[Dict] = field(default_factory=list)
+    errors: List[Dict] = field(default_factory=list)
+
+    def as_dict(self):
+        return {
+            'chunk': self.chunk,
+            'created': self.created,
+            'skipped': self.skipped,
+            'errors': self.errors,
+        }
+
+
+def _batches(items: List, size: int) -> Iterator[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def provision_chunk(rows: List[Row], chunk: int = 1, confirm_link: Optional[str] = None) -> ChunkResult:
+    """Create the users of one chunk"""
+    result = ChunkResult(chunk=chunk)
+    records = {}
+    for line, record, error in rows:
+        if error is None:
+            try:
+                record = clean_record(record)
+            except ValidationError as e:
+                error = '; '.join(e.messages)
+        if error is not None:
+            result.errors.append({'line': line, 'error': error})
+        elif record['email'] in records:
+            result.skipped.append({'line': line, 'email': record['email'], 'reason': 'duplicate in upload'})
+        else:
+            records[record['email']] = (line, record)
+
+    existing = set(User.objects.filter(email__in=list(records)).values_list('email', flat=True))
+    for email in existing:
+        line, _ = records.pop(email)
+        result.skipped.append({'line': line, 'email': email, 'reason': 'already registered'})
+    if not records:
+        return result
+
+    hashes = hash_passwords([record['password'] for _, record in records.values()])
+    users = [
+        User(
+            email=record['email'],
+            username=record['username'],
+            first_name=record['first_name'],
+            last_name=record['last_name'],
+            password=password_hash,
+            app_user_id=generate_unique_id(),
+            confirmed=False,
+        )
+        for (_, record), password_hash in zip(records.values(), hashes)
+    ]
+
+    with transaction.atomic():
+        # Conflicts are users registered since the lookup above
+        User.objects.bulk_create(users, ignore_conflicts=True)
+        created = dict(
+            User.objects.filter(app_user_id__in=[user.app_user_id for user in users])
+            .values_list('email', 'app_user_id')
+        )
+        if confirm_link and created:
+            from main.tasks import celery_send_confirmation_emails
+            for batch in _batches(list(created.items()), settings.PROVISIONING_EMAIL_BATCH_SIZE):
+                transaction.on_commit(
+                    lambda batch=batch: celery_send_confirmation_emails.delay(batch, confirm_link)
+                )
+
+    result.created = len(created)
+    for email, (line, _) in records.items():
+        if email not in created:
+            result.skipped.append({'line': line, 'email': email, 'reason': 'already registered'})
+    return result
+
+
+def provision(
+    rows: Iterable[Row],
+    confirm_link: Optional[str] = None,
+    chunk_size: Optional[int] = None
+) -> Iterator[ChunkResult]:
+    """Provision users chunk by chunk, yielding each chunk's result as it commits"""
+    chunk_size = chunk_size or settings.PROVISIONING_CHUNK_SIZE
+    rows = iter(rows)
+    chunk = 0
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            return
+        chunk += 1
+        result = provision_chunk(batch, chunk, confirm_link)
+        logger.info(
+            f'Provisioning chunk {chunk}: {result.created} created, '
+            f'{len(result.skipped)} skipped, {len(result.errors)} errors'
+        )
+        yield result
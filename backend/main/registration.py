@@ -0,0 +1,167 @@
+"""
+Registration and password reset that complete in the background.
+
+The request validates the payload, checks the email and hands the password
+to the hashing pool (main/hashing.py); the view answers 202 with an id
+straight away. Once the hash is ready the user is created and the
+confirmation email is queued (or, for a reset, the new password is saved)
+on a completion thread. Progress is kept in the default cache for
+REGISTRATION_STATUS_SECONDS so clients can poll it
+(GET /auth/register/<id>/, GET /auth/password/reset/<id>/).
+
+Queued work lives in the web worker's memory. Work cancelled at shutdown
+is marked failed; if the worker dies without shutting down, a status still
+pending after REGISTRATION_PENDING_SECONDS reads as failed, so clients are
+told to try again instead of polling forever.
+"""
+
+import time
+import uuid
+from logging import getLogger
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.template.loader import render_to_string
+
+from main.hashing import HashingInterrupted, hash_in_background
+from main.models import User
+from main.tasks import celery_send_email
+
+logger = getLogger(__name__)
+
+
+PENDING = 'pending'
+CREATED = 'created'
+UPDATED = 'updated'
+FAILED = 'failed'
+
+REGISTRATION = 'registration'
+PASSWORD_RESET = 'password-reset'
+
+
+def _status_key(registration_id, kind=REGISTRATION):
+    return f'auth:{kind}:{registration_id}'
+
+
+def _set_status(registration_id, status, message='', kind=REGISTRATION):
+    progress = {'status': status, 'message': message}
+    if status == PENDING:
+        progress['deadline'] = time.time() + settings.REGISTRATION_PENDING_SECONDS
+    cache.set(_status_key(registration_id, kind), progress, settings.REGISTRATION_STATUS_SECONDS)
+
+
+def _get_status(registration_id, kind) -> Optional[Dict[str, str]]:
+    progress = cache.get(_status_key(registration_id, kind))
+    if progress is None:
+        return None
+    if progress['status'] == PENDING and progress.get('deadline', 0) < time.time():
+        # The worker that held it is gone
+        return {'status': FAILED, 'message': 'Request was interrupted, please try again'}
+    return {'status': progress['status'], 'message': progress['message']}
+
+
+def _failure_message(e, message):
+    if isinstance(e, HashingInterrupted):
+        return 'Request was interrupted, please try again'
+    return message
+
+
+def registration_status(registration_id) -> Optional[Dict[str, str]]:
+    """The registration's status, or None if it is unknown or expired"""
+    return _get_status(registration_id, REGISTRATION)
+
+
+def password_reset_status(reset_id) -> Optional[Dict[str, str]]:
+    """The password reset's status (pending, updated or failed), or None if it is unknown or expired"""
+    return _get_status(reset_id, PASSWORD_RESET)
+
+
+def send_confirmation(email, link):
+    logger.info(f'Sending confirmation email to user {email}')
+    message = render_to_string('mail/confirmation.html', {'email': email, 'link': link})
+    try:
+        celery_send_email.delay(
+            subject='Email Confirmation',
+            message=link,
+            from_email=settings.EMAIL_DEFAULT_SENDER,
+            recipient_list=[email,],
+            fail_silently=False,
+            html_message=message,
+        )
+    except Exception:
+        logger.exception('Sending exception ...')
+
+
+def start_registration(data: Dict, link: str) -> str:
+    """
+    Queue a registration and return its id.
+
+    Raises:
+        HashingBusy: too many registrations are already waiting
+    """
+    registration_id = uuid.uuid4().hex
+    _set_status(registration_id, PENDING)
+    try:
+        hash_in_background(
+            data['password'],
+            lambda password_hash: complete_registration(registration_id, data, link, password_hash),
+            lambda e: _set_status(
+                registration_id, FAILED, _failure_message(e, 'Registration failed, please try again')
+            ),
+        )
+    except Exception:
+        cache.delete(_status_key(registration_id))
+        raise
+    return registration_id
+
+
+def complete_registration(registration_id, data: Dict, link: str, password_hash: str):
+    try:
+        user = User.objects.create_user(
+            email=data['email'],
+            username=data['username'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            password_hash=password_hash,
+            confirmed=True,
+        )
+    except IntegrityError:
+        # Registered by another request since the view checked
+        logger.debug('User email is already in use.')
+        _set_status(registration_id, FAILED, 'User email already in use')
+        return
+
+    logger.info('Registered a new user')
+    _set_status(registration_id, CREATED)
+    send_confirmation(user.email, f'{link}?token={user.generate_confirmation_token()}')
+
+
+def start_password_reset(user: User, password: str) -> str:
+    """
+    Queue a new password for the user and return the reset id.
+
+    Raises:
+        HashingBusy: too many hashes are already waiting
+    """
+    reset_id = uuid.uuid4().hex
+    _set_status(reset_id, PENDING, kind=PASSWORD_RESET)
+    try:
+        hash_in_background(
+            password,
+            lambda password_hash: complete_password_reset(reset_id, user.pk, password_hash),
+            lambda e: _set_status(
+                reset_id, FAILED, _failure_message(e, 'Password reset failed, please try again'), PASSWORD_RESET
+            ),
+        )
+    except Exception:
+        cache.delete(_status_key(reset_id, PASSWORD_RESET))
+        raise
+    return reset_id
+
+
+def complete_password_reset(reset_id, user_id, password_hash: str):
+    User.objects.filter(pk=user_id).update(password=password_hash)
+    logger.info('Password updated')
+    _set_status(reset_id, UPDATED, kind=PASSWORD_RESET)
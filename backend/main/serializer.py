@@ -3,10 +3,9 @@ from rest_framework import serializers
 from main import models
 import logging
 from decimal import Decimal, InvalidOperation
-from main.tasks import celery_send_email
-from django.template.loader import render_to_string
 from django.conf import settings
-from main.models import Permission
+from main.permission_registry import UnknownPermission, registry
+from main.registration import start_registration
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 
@@ -47,60 +46,38 @@ class AdminUserSerializer(serializers.ModelSerializer):
         """
         Validate that all provided permissions exist in the system
         """
-        if not value:  # If permissions list is empty, that's fine
-            return value
-
-        # Get all registered permission names
-        registered_permissions = set(Permission.objects.values_list('name', flat=True))
-        
-        # Check each permission
-        invalid_permissions = [perm for perm in value if perm not in registered_permissions]
-        if invalid_permissions:
+        try:
+            registry.mask(value)
+        except UnknownPermission as e:
             raise serializers.ValidationError(
-                f"The following permissions are not valid: {', '.join(invalid_permissions)}"
+                f"The following permissions are not valid: {e}"
             )
         
         return value
 
     def create(self, validated_data):
         """
-        Create a new user and add specified permissions
+        Create a new user with the specified permissions
         """
-        # Extract permissions from validated data if they exist
         permissions = validated_data.pop('permissions', [])
         
         logger.debug(permissions)
-        # Create the user instance
-        user = super().create(validated_data)
-        
-        
-        # Add valid permissions to the user
-        for permission in permissions:
-            user.add_permission(permission)
-            
-        return user
+        validated_data['permission_bits'] = registry.mask(permissions)
+        return super().create(validated_data)
 
     def update(self, instance, validated_data):
         """
-        Update user instance, including permissions if provided
+        Update user instance, replacing its permissions if provided
         """
         permissions = validated_data.pop('permissions', None)
         
         logger.debug(permissions)
         
-        # Update the user instance with remaining fields
-        instance = super().update(instance, validated_data)
-        
-        # If permissions were provided, update them
+        # Saved together with the other fields
         if permissions is not None:
-            # Clear existing permissions and add new ones
-            instance.permissions.clear()
-            for permission in permissions:
-                instance.add_permission(permission)
+            validated_data['permission_bits'] = registry.mask(permissions)
         
- 
-                
-        return instance
+        return super().update(instance, validated_data)
         
 class PasswordSerializer(serializers.Serializer):
     password = serializers.CharField(min_length = 8)
@@ -136,6 +113,11 @@ class RegistrationSerializer(serializers.Serializer):
 
 
     def create(self, validated_data):
+        """
+        Returns:
+            The registration id (see main/registration.py), or False if
+            the email is already registered
+        """
         email = validated_data['email']
 
         #checking if email is already registered
@@ -144,32 +126,6 @@ class RegistrationSerializer(serializers.Serializer):
             logger.debug('User email is already in use.')
             return False
 
-        user = models.User.objects.create_user(email = email,
-            username = validated_data['username'],
-            first_name = validated_data['first_name'],
-            last_name = validated_data['last_name'],
-            password = validated_data['password'],
-            confirmed = True
-            )
-            
-
-
-        logger.info('Registered a new user')
-        self.send_mail(user.email, f'{validated_data["link"]}?token={user.generate_confirmation_token()}')
-
-        return True
-
-    def send_mail(self, email, link):
-        logger.info(f'Sending forgot password email to user {email}')
-        message = render_to_string('mail/confirmation.html', {'email': email, 'link': link})
-        try:
-            celery_send_email.delay(
-            subject='Email Confirmation',
-             message=link, 
-             from_email=settings.EMAIL_DEFAULT_SENDER, 
-             recipient_list=[email,],
-             fail_silently = False, 
-             html_message = message)
-        except:
-            logger.exception('Sending exception ...')
+        link = validated_data.pop('link')
+        return start_registration(validated_data, link)
     
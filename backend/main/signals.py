@@ -1,5 +1,5 @@
 import logging
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from main import models
 from django.utils.timezone import now
@@ -20,4 +20,18 @@ def register_permissions(permissions, app_label):
 @receiver(pre_save, sender = models.User)
 def user_id_generator(sender, instance, **kwargs):
     if not instance.app_user_id:
-        instance.app_user_id = generate_unique_id()
\ No newline at end of file
+        instance.app_user_id = generate_unique_id()
+
+
+@receiver(post_save, sender = models.User)
+@receiver(post_delete, sender = models.User)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    from main.authentication import invalidate_users
+    invalidate_users([instance.pk])
+
+
+@receiver(post_save, sender = models.Permission)
+@receiver(post_delete, sender = models.Permission)
+def reset_permission_registry(sender, instance, **kwargs):
+    from main.permission_registry import registry
+    registry.reset()
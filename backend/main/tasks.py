@@ -5,7 +5,6 @@ import time
 from main.mailer import SesMailSender
 from celery.utils.log import get_task_logger
 from django.core.files.base import ContentFile
-import asyncio
 
 
 logger = get_task_logger(__name__)
@@ -43,7 +42,36 @@ def celery_send_email(subject,
 
 
 @shared_task
-def call_sui_contract_task():
-    from ajo.sui_tools import call_sui_smart_contract  # adjust path
-    asyncio.run(call_sui_smart_contract())
-    return True
+def call_sui_contract_task(operation, signer_alias, idempotency_key=None, **kwargs):
+    # Chain writes run on the dedicated chain queue (see ajo/chain_queue.py)
+    from ajo.chain_queue import enqueue_chain_transaction
+    return enqueue_chain_transaction(operation, signer_alias, idempotency_key, **kwargs).id
+
+
+@shared_task
+def celery_send_confirmation_emails(recipients, link):
+    """
+    Send account confirmation emails to a batch of users with one SES client.
+
+    recipients is a list of (email, app_user_id) pairs.
+    """
+    from django.conf import settings
+    from django.template.loader import render_to_string
+
+    mailer = SesMailSender()
+    sent = 0
+    for email, app_user_id in recipients:
+        confirm_link = f'{link}?token={models.User(app_user_id=app_user_id).generate_confirmation_token()}'
+        try:
+            mailer.send_email(
+                source=settings.EMAIL_DEFAULT_SENDER,
+                destination=[email],
+                subject='Email Confirmation',
+                text=confirm_link,
+                html=render_to_string('mail/confirmation.html', {'email': email, 'link': confirm_link}),
+            )
+            sent += 1
+        except Exception:
+            logger.exception(f'Failed to send confirmation email to {email}')
+    logger.debug(f'Sent {sent} of {len(recipients)} confirmation emails')
+    return sent
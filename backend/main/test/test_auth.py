@@ -12,6 +12,7 @@ from django.apps import apps
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from django.test import tag
+import time
 
 
 
@@ -42,11 +43,19 @@ class AuthTest(TestCase):
         user.save()
 
         return user
-    
-    
+
+    def _assert_registered(self, response):
+        # Registration completes in the background; poll until it is done
+        url = reverse('registration-detail', args = [response.json()['registration_id']])
+        for _ in range(50):
+            status = self.client.get(url).json()['status']
+            if status != 'pending':
+                break
+            time.sleep(0.1)
+        self.assertEqual(status, 'created')
   
 
-    @override_settings(EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend')
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', PASSWORD_HASH_WORKERS=0)
     def test_create_user(self):
         
         product_config = apps.get_app_config('main')
@@ -65,7 +74,8 @@ class AuthTest(TestCase):
         
         response = self.client.post(reverse('registration-list'), payload, format = 'json')
         logger.debug(response.json())
-        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.status_code == 202)
+        self._assert_registered(response)
         
         adminuser = models.User.objects.filter(email = payload['email']).first()
         self.assertTrue(adminuser.is_superuser)
@@ -78,7 +88,8 @@ class AuthTest(TestCase):
 
         response = self.client.post(reverse('registration-list'), payload, format = 'json')
         logger.debug(response.json())
-        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.status_code == 202)
+        self._assert_registered(response)
 
         user = models.User.objects.filter(email = 'sethdad224@proton.me').first()
         self.assertFalse(user.confirmed)
@@ -103,7 +114,16 @@ class AuthTest(TestCase):
 
         response = self.client.post(reverse('password-new'), {'token': ttoken, 'password': 'MangoMan'}, format = 'json')
         logger.debug(response.json())
-        self.assertTrue(response.status_code == 200)
+        self.assertTrue(response.status_code == 202)
+
+        # The new password is hashed in the background; poll until it is saved
+        url = reverse('password-detail', args = [response.json()['reset_id']])
+        for _ in range(50):
+            status = self.client.get(url).json()['status']
+            if status != 'pending':
+                break
+            time.sleep(0.1)
+        self.assertEqual(status, 'updated')
 
 
         # login with reset password
@@ -0,0 +1,105 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from main import models
+from main.authentication import (
+    CachedJWTAuthentication,
+    get_local_cache,
+    invalidate_users,
+    load_snapshot,
+    user_from_snapshot,
+)
+from main.perm import AdminAuthenticated
+from main.serializer import AdminTokenObtainPairSerializer, ClientTokenObtainPairSerializer
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedJWTAuthenticationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_local_cache().clear()
+        self.user = models.User.objects.create(email='cached@example.com', username='cached', confirmed=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = reverse('notification-unread-count')
+
+    def test_user_is_loaded_once(self):
+        with self.assertNumQueries(2):
+            # Snapshot lookup, then the count
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+        # A cold process still skips the database while Redis has the snapshot
+        get_local_cache().clear()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_deferred_fields_load_on_access(self):
+        self.client.get(self.url)
+
+        user = user_from_snapshot(load_snapshot(self.user.id))
+        self.assertTrue(user.confirmed)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.account, 'customer')
+        with self.assertNumQueries(0):
+            self.assertEqual(user.permission_bits, 0)
+            self.assertEqual(user.email, 'cached@example.com')
+
+    def test_profile_is_served_from_snapshot(self):
+        url = reverse('user-list')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.json()['email'], 'cached@example.com')
+        self.assertEqual(response.json()['username'], 'cached')
+
+    def test_save_and_update_invalidate(self):
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        models.User.objects.filter(pk=self.user.pk).update(is_active=True)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        invalidate_users([self.user.pk])
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deleted_user(self):
+        self.client.get(self.url)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AdminAuthenticatedTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_local_cache().clear()
+        self.user = models.User.objects.create(email='admin@example.com', username='admin', confirmed=True)
+
+    def _check(self, token):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        view = APIView(authentication_classes=[CachedJWTAuthentication])
+        request = view.initialize_request(request)
+        request.user  # Runs authentication
+        with mock.patch.object(AccessToken, '__init__', side_effect=AssertionError('token decoded twice')):
+            return AdminAuthenticated().has_permission(request, view)
+
+    def test_admin_claim(self):
+        admin_token = AdminTokenObtainPairSerializer().get_token(self.user).access_token
+        client_token = ClientTokenObtainPairSerializer().get_token(self.user).access_token
+
+        self.assertTrue(self._check(admin_token))
+        self.assertFalse(self._check(client_token))
@@ -3,6 +3,9 @@ from django.test import TestCase
 from logging import getLogger
 from main import models
 from django.apps import apps # Import the app config
+from django.core.management import call_command
+from io import StringIO
+from main.serializer import AdminUserSerializer
 
 logger = getLogger(__name__)
 
@@ -17,4 +20,86 @@ class ProductPermTests(TestCase):
         count = models.Permission.objects.filter(app_label='main').count()
         logger.debug(f'Found {count} permissions')
         self.assertEqual(count, 1)
-        logger.debug('ended')
\ No newline at end of file
+        logger.debug('ended')
+
+class PermissionBitsTests(TestCase):
+    def setUp(self):
+        self.perms = [models.Permission.objects.create(name=f'main.perm{i}', app_label='main') for i in range(3)]
+        self.users = [models.User.objects.create(email=f'bits{i}@example.com') for i in range(3)]
+
+    def test_bits_are_stable(self):
+        self.assertEqual([p.bit for p in self.perms], [0, 1, 2])
+        self.perms[0].delete()
+        # Freed bits are never handed out again
+        self.assertEqual(models.Permission.objects.create(name='main.perm3', app_label='main').bit, 3)
+
+    def test_highest_bit_is_not_reused(self):
+        holder = self.users[0]
+        holder.add_permission('main.perm2')
+        self.perms[2].delete()
+
+        new = models.Permission.objects.create(name='main.perm3', app_label='main')
+        self.assertEqual(new.bit, 3)
+        holder.refresh_from_db()
+        self.assertFalse(holder.has_permission('main.perm3'))
+
+    def test_add_and_remove(self):
+        user = self.users[0]
+        self.assertTrue(user.add_permission('main.perm2'))
+        self.assertFalse(user.add_permission('main.missing'))
+        user.refresh_from_db()
+        self.assertEqual(user.permission_bits, 0b100)
+        self.assertTrue(user.has_permission('main.perm2'))
+        self.assertFalse(user.has_permission('main.perm1'))
+        self.assertEqual(user.permissions, ['main.perm2'])
+
+        user.remove_permission('main.perm2')
+        user.refresh_from_db()
+        self.assertEqual(user.permissions, [])
+
+    def test_bulk_grant_and_revoke_are_single_updates(self):
+        users = models.User.objects.filter(pk__in=[u.pk for u in self.users])
+        with self.assertNumQueries(3):
+            # Map load, user ids, UPDATE
+            users.grant_permissions(['main.perm0', 'main.perm1'])
+        with self.assertNumQueries(2):
+            users.revoke_permissions(['main.perm0'])
+
+        for user in users:
+            self.assertEqual(user.permissions, ['main.perm1'])
+
+        users.filter(pk=self.users[0].pk).set_permissions(['main.perm2'])
+        self.assertEqual(models.User.objects.get(pk=self.users[0].pk).permissions, ['main.perm2'])
+
+    def test_admin_serializer_writes_permissions_once(self):
+        serializer = AdminUserSerializer(self.users[0], data={'permissions': ['main.perm0', 'main.perm2']}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        user = serializer.save()
+        self.assertEqual(models.User.objects.get(pk=user.pk).permission_bits, 0b101)
+        self.assertEqual(serializer.data['permissions'], ['main.perm0', 'main.perm2'])
+
+        serializer = AdminUserSerializer(self.users[0], data={'permissions': ['main.nope']}, partial=True)
+        self.assertFalse(serializer.is_valid())
+
+    def test_backfill_command(self):
+        models.User.objects.filter(pk=self.users[1].pk).update(legacy_permissions=['main.perm1', 'main.perm2'])
+        call_command('backfill_permission_bits', stdout=StringIO())
+        self.assertEqual(models.User.objects.get(pk=self.users[1].pk).permissions, ['main.perm1', 'main.perm2'])
+        self.assertEqual(models.User.objects.get(pk=self.users[0].pk).permission_bits, 0)
+
+    def test_misses_do_not_reload_every_call(self):
+        from main.permission_registry import registry
+        registry.load()
+        self.assertIsNone(registry.bit('main.missing'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(registry.bit('main.missing'))
+            # Bit 5 belongs to no permission, like a deleted one still set on a user
+            self.assertEqual(registry.names(0b100101), ['main.perm0', 'main.perm2'])
+
+    def test_miss_reloads_once_the_map_is_old(self):
+        from main.permission_registry import PermissionRegistry
+        registry = PermissionRegistry(miss_reload_seconds=0)
+        registry.load()
+        # Registered without the post_save hook, as by another process
+        models.Permission.objects.filter(pk=self.perms[0].pk).update(name='main.renamed')
+        self.assertEqual(registry.bit('main.renamed'), 0)
@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from main import models
+from main.authentication import get_local_cache
+from main.hashing import hash_passwords, shutdown
+from main.provisioning import provision, read_records
+from main.serializer import AdminTokenObtainPairSerializer, ClientTokenObtainPairSerializer
+
+
+CSV = (
+    'email,username,first_name,last_name,password\n'
+    'ada@example.com,ada,Ada,Lovelace,secret-1\n'
+    'grace@example.com,,Grace,Hopper,\n'
+    'not-an-email,x,,,\n'
+    'ada@example.com,ada2,,,\n'
+)
+
+
+@override_settings(PASSWORD_HASH_WORKERS=0)
+class ProvisioningTest(TestCase):
+
+    def test_csv_chunks(self):
+        models.User.objects.create(email='taken@example.com', app_user_id='taken')
+        rows = list(read_records(io.StringIO(CSV + 'taken@example.com,,,,\n'), 'csv'))
+
+        with mock.patch('main.tasks.celery_send_confirmation_emails.delay') as send:
+            with self.settings(PROVISIONING_EMAIL_BATCH_SIZE=1):
+                with self.captureOnCommitCallbacks(execute=True):
+                    results = list(provision(rows, confirm_link='http://testserver/confirm/', chunk_size=4))
+
+        self.assertEqual([r.created for r in results], [2, 0])
+        self.assertEqual(results[0].errors, [{'line': 4, 'error': 'Enter a valid email address.'}])
+        self.assertEqual(
+            sorted((s['email'], s['reason']) for r in results for s in r.skipped),
+            [('ada@example.com', 'duplicate in upload'), ('taken@example.com', 'already registered')],
+        )
+
+        ada = models.User.objects.get(email='ada@example.com')
+        grace = models.User.objects.get(email='grace@example.com')
+        self.assertTrue(check_password('secret-1', ada.password))
+        self.assertFalse(grace.has_usable_password())
+        self.assertEqual(grace.username, 'grace')
+        self.assertTrue(ada.app_user_id and grace.app_user_id != ada.app_user_id)
+
+        # One task per email batch
+        self.assertEqual(send.call_count, 2)
+        self.assertEqual(
+            sorted(call.args for call in send.call_args_list),
+            [
+                ([('ada@example.com', ada.app_user_id)], 'http://testserver/confirm/'),
+                ([('grace@example.com', grace.app_user_id)], 'http://testserver/confirm/'),
+            ],
+        )
+
+    def test_jsonl_errors(self):
+        stream = io.BytesIO(b'{"email": "lin@example.com"}\n\nnot json\n[1]\n')
+        results = list(provision(read_records(stream, 'jsonl')))
+
+        self.assertEqual(results[0].created, 1)
+        self.assertEqual([e['line'] for e in results[0].errors], [3, 4])
+
+    def test_command(self):
+        path = self._write_file('members.jsonl', '{"email": "cmd@example.com", "password": "pw"}\n')
+        out = io.StringIO()
+        call_command('provision_users', path, stdout=out, stderr=io.StringIO())
+
+        self.assertIn('Created 1 users', out.getvalue())
+        self.assertTrue(models.User.objects.filter(email='cmd@example.com').exists())
+
+    def test_dummy_users_get_app_user_ids(self):
+        self.assertEqual(models.User.create_dummy_users(3), 3)
+        self.assertFalse(models.User.objects.filter(app_user_id='').exists())
+
+    def _write_file(self, name, content):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+
+@override_settings(
+    PASSWORD_HASH_WORKERS=0,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ProvisioningViewTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        get_local_cache().clear()
+        self.admin = models.User.objects.create(email='admin@example.com', confirmed=True)
+        self.client = APIClient()
+        self.url = reverse('provision-list')
+
+    def _authenticate(self, serializer_class):
+        token = serializer_class().get_token(self.admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    @staticmethod
+    async def _read(response):
+        return b''.join([part async for part in response.streaming_content])
+
+    def test_streams_chunk_results(self):
+        self._authenticate(AdminTokenObtainPairSerializer)
+        upload = SimpleUploadedFile('members.csv', CSV.encode(), content_type='text/csv')
+
+        with mock.patch('main.tasks.celery_send_confirmation_emails.delay'):
+            response = self.client.post(f'{self.url}?send_email=false', {'file': upload}, format='multipart')
+            self.assertTrue(response.is_async)
+            lines = [json.loads(line) for line in async_to_sync(self._read)(response).splitlines()]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(lines[-1], {'done': True, 'created': 2, 'skipped': 1, 'errors': 1})
+
+    def test_requires_admin_token(self):
+        self._authenticate(ClientTokenObtainPairSerializer)
+        upload = SimpleUploadedFile('members.csv', CSV.encode(), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 403)
+
+
+class HashingPoolTest(TestCase):
+
+    @override_settings(PASSWORD_HASH_WORKERS=2)
+    def test_hashes_in_pool(self):
+        self.addCleanup(shutdown)
+        hashes = hash_passwords(['a', 'b', None])
+        self.assertTrue(check_password('a', hashes[0]))
+        self.assertTrue(check_password('b', hashes[1]))
+        self.assertFalse(hashes[2].startswith('md5'))
@@ -0,0 +1,167 @@
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from main import models
+from main.hashing import HashingBusy, HashingInterrupted, hash_in_background, hash_password, metrics, shutdown
+from main.registration import PENDING, _set_status, complete_registration, registration_status
+
+
+PAYLOAD = {
+    'first_name': 'Ada',
+    'last_name': 'Lovelace',
+    'username': 'ada',
+    'email': 'ada@example.com',
+    'password': 'secret-pass-1',
+}
+
+
+@override_settings(
+    PASSWORD_HASH_WORKERS=0,
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class RegistrationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_register_returns_accepted(self):
+        with mock.patch('main.registration.celery_send_email.delay') as send:
+            res = self.client.post(reverse('registration-list'), PAYLOAD, format='json')
+
+        self.assertEqual(res.status_code, 202)
+        registration_id = res.json()['registration_id']
+        user = models.User.objects.get(email='ada@example.com')
+        self.assertTrue(user.check_password('secret-pass-1'))
+        self.assertTrue(user.confirmed)
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(send.call_args.kwargs['recipient_list'], ['ada@example.com'])
+
+        res = self.client.get(reverse('registration-detail', args=[registration_id]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()['status'], 'created')
+
+    def test_admin_email(self):
+        with self.settings(ADMIN_EMAIL='ada@example.com'):
+            with mock.patch('main.registration.celery_send_email.delay'):
+                res = self.client.post(reverse('registration-list'), PAYLOAD, format='json')
+
+        res = self.client.get(reverse('registration-detail', args=[res.json()['registration_id']]))
+        self.assertEqual(res.json()['status'], 'created')
+        user = models.User.objects.get(email='ada@example.com')
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.confirmed)
+
+    def test_email_in_use(self):
+        models.User.objects.create(email='ada@example.com', app_user_id='taken')
+        res = self.client.post(reverse('registration-list'), PAYLOAD, format='json')
+        self.assertEqual(res.status_code, 406)
+
+    def test_busy(self):
+        with mock.patch('main.registration.hash_in_background', side_effect=HashingBusy):
+            res = self.client.post(reverse('registration-list'), PAYLOAD, format='json')
+        self.assertEqual(res.status_code, 503)
+        self.assertFalse(models.User.objects.filter(email='ada@example.com').exists())
+
+    def test_unknown_registration(self):
+        res = self.client.get(reverse('registration-detail', args=['missing']))
+        self.assertEqual(res.status_code, 404)
+
+    def test_email_taken_while_hashing(self):
+        models.User.objects.create(email='ada@example.com', app_user_id='taken')
+        data = {key: value for key, value in PAYLOAD.items() if key != 'password'}
+        complete_registration('race', data, 'http://testserver/confirm', hash_password('secret-pass-1'))
+        self.assertEqual(registration_status('race')['status'], 'failed')
+
+    @override_settings(REGISTRATION_PENDING_SECONDS=-1)
+    def test_orphaned_registration_fails(self):
+        # Left pending by a worker that died
+        _set_status('orphan', PENDING)
+        self.assertEqual(registration_status('orphan')['status'], 'failed')
+
+    def test_password_reset(self):
+        user = models.User.objects.create(email='ada@example.com', app_user_id='reset-me')
+        res = self.client.post(
+            reverse('password-new'),
+            {'token': user.generate_confirmation_token(), 'password': 'a-New-passw0rd'},
+            format='json',
+        )
+        self.assertEqual(res.status_code, 202)
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('a-New-passw0rd'))
+
+        res = self.client.get(reverse('password-detail', args=[res.json()['reset_id']]))
+        self.assertEqual(res.json()['status'], 'updated')
+
+    def test_password_reset_busy(self):
+        user = models.User.objects.create(email='ada@example.com', app_user_id='reset-me')
+        with mock.patch('main.registration.hash_in_background', side_effect=HashingBusy):
+            res = self.client.post(
+                reverse('password-new'),
+                {'token': user.generate_confirmation_token(), 'password': 'a-New-passw0rd'},
+                format='json',
+            )
+        self.assertEqual(res.status_code, 503)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BackgroundHashingTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(shutdown)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1)
+    def test_bounded(self):
+        release = threading.Event()
+        done = threading.Event()
+        hashes = []
+
+        def on_hashed(password_hash):
+            hashes.append(password_hash)
+            release.wait(10)
+            done.set()
+
+        hash_in_background('first', on_hashed)
+        with self.assertRaises(HashingBusy):
+            hash_in_background('second', on_hashed)
+        release.set()
+        self.assertTrue(done.wait(30))
+
+        self.assertTrue(models.User(password=hashes[0]).check_password('first'))
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['completed'], 1)
+        self.assertEqual(snapshot['rejected'], 1)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=2)
+    def test_shutdown_interrupts_queued(self):
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def on_hashed(password_hash):
+            started.set()
+            release.wait(10)
+
+        hash_in_background('first', on_hashed)
+        self.assertTrue(started.wait(30))
+        hash_in_background('second', lambda password_hash: None, errors.append)
+
+        # The running hash finishes once shutdown has cancelled the queue
+        threading.Timer(0.5, release.set).start()
+        shutdown()
+
+        self.assertEqual([type(e) for e in errors], [HashingInterrupted])
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_errors_reported(self):
+        errors = []
+        with mock.patch('main.hashing._hash', side_effect=RuntimeError('boom')):
+            hash_in_background('secret', lambda password_hash: None, errors.append)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(metrics.snapshot()['failed'], 1)
@@ -1,5 +1,5 @@
 from rest_framework import routers
-from main.views import auth, permviews
+from main.views import auth, permviews, provisioning
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
@@ -12,6 +12,7 @@ router.register(r'user', auth.User, basename='user')
 router.register(r'confirm', auth.ConfirmEmailView, basename='confirm')
 router.register(r'password/reset', auth.PasswordResetView, basename='password')
 router.register(r'perms', permviews.PermViewset, basename='perms')
+router.register(r'users/provision', provisioning.ProvisioningView, basename='provision')
 
 urlpatterns = [
     path('', include(router.urls)),
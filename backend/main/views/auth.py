@@ -21,6 +21,8 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from main.models import Permission
 from rest_framework_simplejwt.views import TokenViewBase
 from main.serializer import ClientTokenObtainPairSerializer, AdminTokenObtainPairSerializer
+from main.hashing import HashingBusy
+from main.registration import password_reset_status, registration_status, start_password_reset
 
 
 logger = getLogger(__name__)
@@ -46,11 +48,25 @@ class RegistrationView(viewsets.GenericViewSet):
         if not sr.is_valid():
             return response.Response({'message': sr.errors}, status = 400)
 
-        success = sr.save(link = request.build_absolute_uri(reverse("confirm-list")))
-        if not success:
+        try:
+            registration_id = sr.save(link = request.build_absolute_uri(reverse("confirm-list")))
+        except HashingBusy:
+            return response.Response(
+                {'message': 'Too many registrations right now, please try again shortly'},
+                status = 503, headers = {'Retry-After': '5'})
+        if not registration_id:
             return response.Response({'message': 'User email already in use'}, status = 406)
-        
-        return response.Response({'message': "A confirmation email has been sent to your mailbox."})
+
+        return response.Response(
+            {'message': "A confirmation email will be sent to your mailbox.", 'registration_id': registration_id},
+            status = 202)
+
+    def retrieve(self, request, pk = None):
+        """Status of a registration started by create: pending, created or failed"""
+        progress = registration_status(pk)
+        if progress is None:
+            return response.Response({'message': 'Unknown registration'}, status = 404)
+        return response.Response(progress)
 
 class ConfirmEmailView(viewsets.ViewSet):
     permission_classes = [permissions.AllowAny,]
@@ -167,16 +183,27 @@ class PasswordResetView(viewsets.ViewSet):
 
                     return response.Response({'message': error_messages}, status = 406)
 
-                #continue with password update
-                user.set_password(sr.validated_data['password'])
-                user.save()
-                return response.Response({'message': 'Password updated!'})
+                #continue with password update, hashed in the background
+                try:
+                    reset_id = start_password_reset(user, sr.validated_data['password'])
+                except HashingBusy:
+                    return response.Response(
+                        {'message': 'Too many password changes right now, please try again shortly'},
+                        status = 503, headers = {'Retry-After': '5'})
+                return response.Response({'message': 'Password update accepted', 'reset_id': reset_id}, status = 202)
             else:
                 logger.info('User was not found in database')
                 return response.Response('User not Found in Database', status = 400)
         else:
             return response.Response('No user id', status = 400)
 
+    def retrieve(self, request, pk = None):
+        """Status of a password change started by new: pending, updated or failed"""
+        progress = password_reset_status(pk)
+        if progress is None:
+            return response.Response({'message': 'Unknown password reset'}, status = 404)
+        return response.Response(progress)
+
 
 
 class User(viewsets.GenericViewSet):
@@ -0,0 +1,60 @@
+import json
+from logging import getLogger
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from rest_framework import response, viewsets
+from rest_framework.parsers import MultiPartParser
+
+from main.perm import AdminAuthenticated
+from main.provisioning import FORMATS, guess_format, provision, read_records
+
+
+logger = getLogger(__name__)
+
+
+class ProvisioningView(viewsets.ViewSet):
+    """
+    Create many users from an uploaded CSV or JSON Lines file ("file").
+    Columns/keys: email, username, first_name, last_name, password (all but
+    email optional). Pass ?input=csv|jsonl if the file name does not tell.
+
+    The response is streamed as JSON Lines: one line per chunk as it is
+    committed, then a summary line. The body is an async generator so the
+    ASGI server sends each line as it is produced (Django would buffer a
+    sync iterator in full); each chunk is provisioned in the request's sync
+    thread.
+    """
+    permission_classes = [AdminAuthenticated,]
+    parser_classes = [MultiPartParser,]
+
+    def create(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return response.Response({'message': 'Upload a CSV or JSON Lines file as "file"'}, status = 400)
+        if upload.size > settings.PROVISIONING_MAX_UPLOAD_BYTES:
+            return response.Response({'message': 'The file is too large'}, status = 413)
+
+        input_format = request.query_params.get('input') or guess_format(upload.name, upload.content_type)
+        if input_format not in FORMATS:
+            return response.Response({'message': f'Unknown input format, use one of: {", ".join(FORMATS)}'}, status = 400)
+
+        send_email = request.query_params.get('send_email', 'true').lower() != 'false'
+        confirm_link = request.build_absolute_uri(reverse('confirm-list')) if send_email else None
+        logger.info(f'Provisioning users from {upload.name} ({upload.size} bytes)')
+
+        results = provision(read_records(upload.file, input_format), confirm_link)
+        next_result = sync_to_async(lambda: next(results, None))
+
+        async def lines():
+            totals = {'created': 0, 'skipped': 0, 'errors': 0}
+            while (result := await next_result()) is not None:
+                totals['created'] += result.created
+                totals['skipped'] += len(result.skipped)
+                totals['errors'] += len(result.errors)
+                yield json.dumps(result.as_dict()) + '\n'
+            yield json.dumps({'done': True, **totals}) + '\n'
+
+        return StreamingHttpResponse(lines(), content_type = 'application/x-ndjson')
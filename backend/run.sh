@@ -1,6 +1,8 @@
 ./manage.py makemigrations;
 ./manage.py migrate;
 ./manage.py test --exclude-tag=excluded --no-input;
-celery -A backend worker -D -l ERROR
-gunicorn --workers 2 backend.wsgi:application --bind 0.0.0.0:8000 
+celery -A backend worker -Q celery -D -l ERROR
+celery -A backend worker -Q ${SUI_CHAIN_QUEUE:-chain} -n chain@%h -c ${SUI_CHAIN_WORKER_CONCURRENCY:-2} --pidfile=chain-worker.pid --logfile=chain-worker.log -D -l ERROR
+celery -A backend beat -D -l ERROR
+gunicorn -c gunicorn.conf.py --workers 2 -k uvicorn.workers.UvicornWorker backend.asgi:application --bind 0.0.0.0:8000 
 
@@ -14,8 +14,20 @@ interface Notification {
     message: string;
 }
 
+interface StreamTicket {
+    ticket: string;
+    expires_in: number;
+}
+
+interface NotificationPage {
+    next: string | null;
+    previous: string | null;
+    results: Notification[];
+}
+
 export default function Notifications() {
     const [notifications, setNotifications] = useState<Notification[]>([]);
+    const [nextPage, setNextPage] = useState<string | null>(null);
     const router = useRouter();
 
 
@@ -33,14 +45,73 @@ export default function Notifications() {
             return;
         }
 
-        makeRequest(process.env.NEXT_PUBLIC_URL + '/ajonotifications').then(response => {
+        loadPage(process.env.NEXT_PUBLIC_URL + '/ajonotifications/');
+
+        // New notifications are pushed by the server instead of polled. The
+        // stream is opened with a single-use ticket, never the access token,
+        // so every reconnect asks for a new one.
+        let stream: EventSource | null = null;
+        let retry: ReturnType<typeof setTimeout> | undefined;
+        let closed = false;
+        let lastEventId: number | null = null;
+
+        const connect = () => {
+            makeRequest<StreamTicket>(process.env.NEXT_PUBLIC_URL + '/ajonotifications/stream-ticket/', { method: 'POST' }, true).then(response => {
+                if (closed || !response.payload) {
+                    return;
+                }
+                let url = process.env.NEXT_PUBLIC_URL + '/ajonotifications/stream/?ticket=' + encodeURIComponent(response.payload.ticket);
+                if (lastEventId !== null) {
+                    url += '&last_event_id=' + lastEventId;
+                }
+                stream = new EventSource(url);
+                stream.addEventListener('notification', (event) => {
+                    const notification: Notification = JSON.parse((event as MessageEvent).data);
+                    lastEventId = notification.id;
+                    setNotifications(current =>
+                        current.some(n => n.id === notification.id) ? current : [notification, ...current]
+                    );
+                });
+                stream.onerror = () => {
+                    stream?.close();
+                    if (!closed) {
+                        retry = setTimeout(connect, 5000);
+                    }
+                };
+            }).catch(error => {
+                console.error(error);
+                if (!closed) {
+                    retry = setTimeout(connect, 5000);
+                }
+            })
+        };
+        connect();
+
+        return () => {
+            closed = true;
+            clearTimeout(retry);
+            stream?.close();
+        };
+
+    }, [router]);
+
+    // The inbox is cursor-paginated, newest first; older pages are appended
+    const loadPage = (url: string) => {
+        makeRequest<NotificationPage>(url, {}, true).then(response => {
             console.log(response);
-            setNotifications(response.payload);
+            const page = response.payload;
+            if (!page) {
+                return;
+            }
+            setNotifications(current => [
+                ...current,
+                ...page.results.filter(n => !current.some(c => c.id === n.id)),
+            ]);
+            setNextPage(page.next);
         }).catch(error => {
             console.error(error);
         })
-
-    }, [router]);
+    };
 
     const handleLogout = () => {
         clearTokens();
@@ -98,6 +169,15 @@ export default function Notifications() {
                             </div>
                         ))}
                     </div>
+
+                    {nextPage && (
+                        <button
+                            onClick={() => loadPage(nextPage)}
+                            className="mt-6 text-blue-600 font-medium hover:underline"
+                        >
+                            Load more
+                        </button>
+                    )}
                 </div>
             </div>
         </>